@@ -0,0 +1,204 @@
+import math
+from functools import lru_cache
+from typing import List, TypeVar, Callable, Any, Dict
+
+from algorithms.autotuning import cpython_minrun
+from algorithms.commons import find_runs, sort_by_key, Run
+from algorithms.merge_sort import _merge_sort
+from algorithms.natural_merge_sort import _natural_merge_sort
+from algorithms.powersort import _powersort, node_power
+from algorithms.timsort import _timsort
+from config import ADAPTIVE_SORT_MIN_LENGTH, MIN_RUN
+
+# Generic type of elements in the input list
+T = TypeVar('T')
+
+# Names of the algorithms the dispatcher chooses from
+BUILTIN = 'sorted'
+MERGE_SORT = 'merge_sort'
+NATURAL_MERGE_SORT = 'natural_merge_sort'
+TIMSORT = 'timsort'
+POWERSORT = 'powersort'
+
+
+def adaptive_sort(arr: List[T], key: Callable[[T], Any] | None = None, reverse: bool = False) -> List[T]:
+    """
+    Sorts the input list using the algorithm that is expected to need the fewest comparisons for it.
+
+    Inputs shorter than `ADAPTIVE_SORT_MIN_LENGTH` are sorted by the builtin sort right away, as measuring them
+    would not pay off. Otherwise, the natural runs of the input are found in a single pass (N-1 comparisons),
+    and the number of comparisons still needed by each algorithm is estimated from the run profile
+    (see `estimate_comparisons`). The measurement is not wasted: Powersort and Natural Merge Sort continue
+    with the runs already found, and a sorted (or strictly descending) input is finished by the measurement itself.
+    Powersort gallops if the average run length is at least `MIN_RUN`. The builtin sort is one of the candidates
+    as well (it is preferred on ties with the other algorithms).
+
+    :param arr: Input sequence to sort
+    :param key: (optional) Function extracting the comparison key from an element, called once per element
+    :param reverse: (optional) Whether to sort in decreasing order (stability is preserved); Default: false
+    :return: Sorted sequence (increasing)
+    """
+
+    if len(arr) < ADAPTIVE_SORT_MIN_LENGTH:
+        arr.sort(key=key, reverse=reverse)
+        return arr
+
+    def sort_func(keys: List, values: List | None) -> None:
+        # The strictly descending runs are reversed in-place, so the runs stay valid for the chosen algorithm
+        runs = find_runs(keys, values=values)
+        if len(runs) == 1:
+            return
+        profile = [len(run) for run in runs]
+        algorithm = choose_algorithm(profile)
+        if algorithm == BUILTIN:
+            _builtin_sort(keys, values)
+        elif algorithm == MERGE_SORT:
+            _merge_sort(keys, values)
+        elif algorithm == NATURAL_MERGE_SORT:
+            _natural_merge_sort(keys, values, runs=runs)
+        elif algorithm == TIMSORT:
+            _timsort(keys, values)
+        else:
+            galloping_enabled = len(keys) >= MIN_RUN * len(runs)
+            _powersort(keys, None, galloping_enabled, False, False, values, runs=runs)
+
+    return sort_by_key(arr, key, reverse, sort_func)
+
+
+def _builtin_sort(keys: List, values: List | None) -> None:
+    """
+    Sorts the keys by the builtin sort, permuting the values (if any) alongside them.
+    """
+
+    if values is None:
+        keys.sort()
+        return
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    keys[:] = [keys[i] for i in order]
+    values[:] = [values[i] for i in order]
+
+
+def choose_algorithm(profile: List[int]) -> str:
+    """
+    Chooses the algorithm for the input with the given run profile (see `adaptive_sort`).
+
+    :param profile: Run profile of the input (see `run_profile` in presortedness.py)
+    :return: Name of the algorithm with the fewest estimated comparisons
+    """
+
+    if sum(profile) < ADAPTIVE_SORT_MIN_LENGTH:
+        return BUILTIN
+    estimates = estimate_comparisons(profile)
+    return min(estimates, key=estimates.get)
+
+
+def estimate_comparisons(profile: List[int]) -> Dict[str, float]:
+    """
+    Estimates the number of comparisons still needed by the algorithms to sort the input,
+    once its run profile is known (i.e., its runs have been found, see `adaptive_sort`).
+
+    The merge policy of each algorithm is simulated on the run lengths (in O(K log K) time for K runs).
+    Merging two runs of lengths a and b is assumed to take a + b - a/(b+1) - b/(a+1) comparisons,
+    which is the expected number of comparisons for randomly interleaved runs (galloping is not considered).
+    Timsort needs to find its runs again (N-1 comparisons), as it extends them to `MIN_RUN` by the binary
+    insertion sort, which it also pays for. The builtin sort is CPython's Timsort, so it is estimated the same way,
+    only with CPython's minimal run length (see `cpython_minrun`). Merge sort is not run-adaptive, its estimate
+    is the one for random input.
+
+    :param profile: Run profile of the input (see `run_profile` in presortedness.py)
+    :return: {algorithm name: estimated number of comparisons}, in the order of preference on ties
+    """
+
+    n = sum(profile)
+    return {
+        BUILTIN: n - 1 + _timsort_cost(profile, cpython_minrun(n)),
+        POWERSORT: _powersort_cost(profile),
+        NATURAL_MERGE_SORT: _natural_merge_sort_cost(profile),
+        TIMSORT: n - 1 + _timsort_cost(profile),
+        MERGE_SORT: _merge_sort_cost(n),
+    }
+
+
+def _merge_cost(a: int, b: int) -> float:
+    return a + b - a / (b + 1) - b / (a + 1)
+
+
+def _powersort_cost(profile: List[int]) -> float:
+    n = sum(profile)
+    cost = 0.
+    X = []
+    P = []
+    r1 = Run(0, profile[0] - 1)
+    for length in profile[1:]:
+        r2 = Run(r1.end + 1, r1.end + length)
+        p = node_power(r1, r2, n)
+        while P and P[-1] > p:
+            P.pop()
+            r0 = X.pop()
+            cost += _merge_cost(len(r0), len(r1))
+            r1 = Run(r0.start, r1.end)
+        X.append(r1)
+        P.append(p)
+        r1 = r2
+    while X:
+        r0 = X.pop()
+        cost += _merge_cost(len(r0), len(r1))
+        r1 = Run(r0.start, r1.end)
+    return cost
+
+
+def _timsort_cost(profile: List[int], min_run_length: int = MIN_RUN) -> float:
+    cost = 0.
+    # Extend the runs shorter than min_run_length by the following elements (binary insertion sort)
+    lengths = []
+    profile = profile[::-1]
+    while profile:
+        length = profile.pop()
+        if length < min_run_length:
+            while profile and length < min_run_length:
+                taken = min(min_run_length - length, profile[-1])
+                # Inserting the i-th element costs about log2(i) comparisons
+                cost += sum(math.log2(i) for i in range(length + 1, length + taken + 1))
+                length += taken
+                profile[-1] -= taken
+                if not profile[-1]:
+                    profile.pop()
+        lengths.append(length)
+
+    S = []
+    for length in lengths:
+        S.append(length)
+        while True:
+            h = len(S)
+            if h >= 3 and S[-1] >= S[-3]:
+                cost += _merge_cost(S[-3], S[-2])
+                S[-3:] = [S[-3] + S[-2], S[-1]]
+            elif (h >= 2 and S[-1] >= S[-2] or h >= 3 and S[-1] + S[-2] >= S[-3]
+                  or h >= 4 and S[-2] + S[-3] >= S[-4]):
+                cost += _merge_cost(S[-2], S[-1])
+                S[-2:] = [S[-2] + S[-1]]
+            else:
+                break
+    while len(S) > 1:
+        cost += _merge_cost(S[-2], S[-1])
+        S[-2:] = [S[-2] + S[-1]]
+    return cost
+
+
+def _natural_merge_sort_cost(profile: List[int]) -> float:
+    cost = 0.
+    while len(profile) > 1:
+        merged = [a + b for a, b in zip(profile[::2], profile[1::2])]
+        cost += sum(_merge_cost(a, b) for a, b in zip(profile[::2], profile[1::2]))
+        if len(profile) % 2:
+            merged.append(profile[-1])
+        profile = merged
+    return cost
+
+
+@lru_cache(maxsize=None)
+def _merge_sort_cost(n: int) -> float:
+    if n <= 1:
+        return 0.
+    a = n // 2
+    return _merge_sort_cost(a) + _merge_sort_cost(n - a) + _merge_cost(a, n - a)
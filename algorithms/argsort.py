@@ -0,0 +1,220 @@
+from array import array
+from typing import List, Sequence, Any, Tuple
+
+import numpy as np
+
+from algorithms.commons import to_numeric_array
+from algorithms.powersort import powersort
+from algorithms.typed_sort import _typed_powersort
+from config import MIN_RUN
+
+# Number of bits available for a packed key (the key columns followed by the index), so that it fits into int64
+PACKED_KEY_BITS = 63
+
+
+def powersort_argsort(keys: Sequence[Any], min_run_length: int | None = None) -> np.ndarray:
+    """
+    Returns the permutation (array of indices) that sorts the keys stably, using Powersort (powersort.py).
+    The keys themselves are not modified. Same as `np.argsort(keys, kind='stable')`, NaNs are ordered last.
+
+    1. Integer keys (of a small enough range): each key is packed together with its index into a single int64
+       (the key in the high bits, the index in the low bits), so that the packed keys are unique and a single
+       comparison settles the ties. The packed keys are sorted by the typed engine (see `typed_powersort`)
+       and the indices are extracted from the low bits.
+    2. Other numeric keys: a copy of the keys is sorted by the typed engine, along with the array of indices.
+    3. Other keys (Python objects): the list of indices is sorted by `powersort`, with the keys extracted
+       once into a parallel list (no per-row tuples are built).
+
+    :param keys: Key column (list, array.array, or one-dimensional ndarray)
+    :param min_run_length: (optional) Minimal length of runs to enforce (see `powersort`)
+    :return: Sorting permutation (ndarray of indices)
+    """
+
+    n = len(keys)
+    column = _as_column(keys)
+    if column is None:
+        return np.array(powersort(list(range(n)), min_run_length, key=keys.__getitem__), dtype=np.intp)
+    packed = _pack([column])
+    if packed is not None:
+        return _argsort_packed(packed, min_run_length)
+    a = column.copy()
+    indices = np.arange(n)
+    if n > 1:
+        _typed_powersort(a, min_run_length, indices)
+    return indices
+
+
+def powersort_lexsort(columns: Sequence[Sequence[Any]], min_run_length: int | None = None) -> np.ndarray:
+    """
+    Returns the permutation (array of indices) that sorts the rows of a table stably by multiple key columns,
+    using Powersort (powersort.py). The rows are ordered by the first column, the ties by the second column, etc.
+    Note that this is the order of the columns in an ORDER BY clause, the reverse of the order used by `np.lexsort`
+    (`powersort_lexsort([a, b])` is the same as `np.lexsort([b, a])`).
+
+    If all the columns are integers (of small enough ranges), they are packed together with the index into
+    a single int64 key (see `powersort_argsort`), so that a single comparison orders two rows.
+    Otherwise, the rows are sorted by the first column (see `powersort_argsort`), then each group of rows
+    with equal keys in all the previous columns is sorted by the next column (unless it is already sorted by it).
+    The groups are sorted by the typed engine (see `typed_powersort`), except for the groups shorter than `MIN_RUN`,
+    which are sorted by binary insertion sort, same as the short runs (see `powersort`).
+
+    :param columns: Key columns (lists, array.arrays, or one-dimensional ndarrays) of the same length
+    :param min_run_length: (optional) Minimal length of runs to enforce (see `powersort`)
+    :return: Sorting permutation (ndarray of indices)
+    """
+
+    if not columns:
+        raise ValueError("At least one key column is required")
+    n = len(columns[0])
+    if any(len(column) != n for column in columns):
+        raise ValueError("All key columns must have the same length")
+    numeric_columns = [_as_column(column) for column in columns]
+    if all(column is not None for column in numeric_columns):
+        packed = _pack(numeric_columns)
+        if packed is not None:
+            return _argsort_packed(packed, min_run_length)
+
+    order = powersort_argsort(columns[0], min_run_length)
+    # Whether each row has the same keys as the next one (in the sorted order) in all the columns sorted so far
+    ties, _ = _compare_neighbors(columns[0], numeric_columns[0], order)
+    for column, numeric_column in zip(columns[1:], numeric_columns[1:]):
+        starts = np.flatnonzero(np.append(True, ~ties))
+        bounds = np.append(starts, n)
+        # Only the groups of ties that are not yet sorted by the next column need to be sorted
+        _, descents = _compare_neighbors(column, numeric_column, order)
+        unsorted = np.unique(np.searchsorted(starts, np.flatnonzero(descents & ties), side='right') - 1)
+        if numeric_column is not None:
+            # The short groups are sorted by binary insertion sort, the same way as Powersort sorts the short runs,
+            # all of them at once (see `_insertion_sort_groups`)
+            short = bounds[unsorted + 1] - bounds[unsorted] < MIN_RUN
+            _insertion_sort_groups(order, numeric_column, bounds[unsorted[short]], bounds[unsorted[short] + 1])
+            unsorted = unsorted[~short]
+        for start, end in zip(bounds[unsorted].tolist(), bounds[unsorted + 1].tolist()):
+            group = order[start:end]
+            group_keys = numeric_column[group] if numeric_column is not None else [column[i] for i in group]
+            order[start:end] = group[powersort_argsort(group_keys, min_run_length)]
+        equal, _ = _compare_neighbors(column, numeric_column, order)
+        ties &= equal
+    return order
+
+
+def _as_column(keys: Sequence[Any]) -> np.ndarray | None:
+    """
+    Returns a NumPy view (or copy) of the key column, if it can be sorted by the typed engine (see `to_numeric_array`).
+    Unlike lists, numeric ndarrays may contain NaNs, as NumPy orders them consistently.
+    """
+
+    if isinstance(keys, np.ndarray):
+        return keys if keys.ndim == 1 and keys.dtype.kind in 'biuf' else None
+    if isinstance(keys, array):
+        return np.asarray(keys) if keys.typecode in 'bBhHiIlLqQfd' else None
+    if isinstance(keys, list):
+        return to_numeric_array(keys)
+    return None
+
+
+def _pack(columns: List[np.ndarray]) -> np.ndarray | None:
+    """
+    Packs the integer key columns and the index of each row into a single int64 key
+    (offsets of the keys from the minimum of their column, followed by the index), if it fits into PACKED_KEY_BITS.
+
+    :return: Packed keys, or None if the columns cannot be packed
+    """
+
+    n = len(columns[0])
+    if not n or any(column.dtype.kind not in 'biu' for column in columns):
+        return None
+    index_bits = (n - 1).bit_length()
+    fields = []
+    bits = index_bits
+    for column in columns:
+        low = int(column.min())
+        width = (int(column.max()) - low).bit_length()
+        fields.append((column, low, width))
+        bits += width
+    if bits > PACKED_KEY_BITS:
+        return None
+
+    packed = np.arange(n, dtype=np.int64)
+    shift = index_bits
+    for column, low, width in reversed(fields):
+        if column.dtype == np.uint64:
+            # Values above the range of int64 are subtracted in uint64
+            offsets = (column - np.uint64(low)).astype(np.int64)
+        else:
+            offsets = column.astype(np.int64) - low
+        packed |= offsets << shift
+        shift += width
+    return packed
+
+
+def _argsort_packed(packed: np.ndarray, min_run_length: int | None) -> np.ndarray:
+    """
+    Sorts the packed keys (see `_pack`) in-place and extracts the indices from them.
+    """
+
+    if len(packed) > 1:
+        _typed_powersort(packed, min_run_length)
+    return (packed & ((1 << (len(packed) - 1).bit_length()) - 1)).astype(np.intp)
+
+
+def _insertion_sort_groups(order: np.ndarray, numeric_column: np.ndarray, starts: np.ndarray,
+                           ends: np.ndarray) -> None:
+    """
+    Sorts each group of rows order[start:end] stably by the numeric key column, by binary insertion sort.
+    The groups are sorted in lockstep: the t-th row of every group (long enough) is inserted into the sorted
+    first t rows of its group at once, its position being found by a binary search vectorized over the groups,
+    and the greater rows are shifted by one by fancy indexing. Therefore, the number of NumPy operations
+    depends on the length of the longest group, not on the number of the groups.
+    NaNs are ordered last, as in NumPy.
+    """
+
+    if not len(starts):
+        return
+    lengths = ends - starts
+    for t in range(1, int(lengths.max())):
+        group_starts = starts[lengths > t]
+        row = order[group_starts + t]
+        key = numeric_column[row]
+        lo = np.zeros(len(group_starts), dtype=np.intp)
+        hi = np.full(len(group_starts), t, dtype=np.intp)
+        # Position after the last prefix key not greater than the key (stability)
+        for _ in range(t.bit_length()):
+            mid = (lo + hi) // 2
+            mid_key = numeric_column[order[group_starts + np.minimum(mid, t - 1)]]
+            greater = mid_key > key
+            if numeric_column.dtype.kind == 'f':
+                greater |= np.isnan(mid_key) & ~np.isnan(key)
+            searching = lo < hi
+            hi = np.where(searching & greater, mid, hi)
+            lo = np.where(searching & ~greater, mid + 1, lo)
+        counts = t - lo
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        shifted = np.repeat(group_starts + lo, counts) + offsets
+        order[shifted + 1] = order[shifted]
+        order[group_starts + lo] = row
+
+
+def _compare_neighbors(column: Sequence[Any], numeric_column: np.ndarray | None,
+                       order: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compares the key of each row with the key of the next row, in the given order of the rows.
+    NaNs are equal to each other and greater than any other key here, as NumPy orders them last.
+
+    :return: (Whether the keys are equal, whether the next key is smaller); Boolean arrays of length N-1
+    """
+
+    if numeric_column is None:
+        keys = [column[i] for i in order]
+        count = max(0, len(keys) - 1)
+        equal = np.fromiter((x == y for x, y in zip(keys, keys[1:])), dtype=bool, count=count)
+        descending = np.fromiter((y < x for x, y in zip(keys, keys[1:])), dtype=bool, count=count)
+        return equal, descending
+    keys = numeric_column[order]
+    equal = keys[1:] == keys[:-1]
+    descending = keys[1:] < keys[:-1]
+    if keys.dtype.kind == 'f':
+        nans = np.isnan(keys)
+        equal |= nans[1:] & nans[:-1]
+        descending |= nans[:-1] & ~nans[1:]
+    return equal, descending
@@ -0,0 +1,280 @@
+import asyncio
+from typing import List, TypeVar, Callable, Any, Tuple, Iterator, NamedTuple
+
+from algorithms.commons import get_kernel, MergeBuffer, Run, Kernel, co_rank, _merge_lo_from_buffer, \
+    _merge_hi_from_buffer
+from algorithms.powersort import powersort_merges
+from algorithms.timsort import timsort_merges
+from config import MIN_RUN, INITIAL_GALLOPING_THRESHOLD, ASYNC_SORT_MOVES_PER_STEP
+
+# Generic type of elements in the input list
+T = TypeVar('T')
+
+
+class SortProgress:
+    """
+    Progress of an asynchronous sort (see `powersort_async`), updated by the sort as it runs.
+    The total number of elements to merge is known once all the runs are found, as the merge policy depends
+    only on the run lengths; Until then, it is 0.
+    """
+
+    __slots__ = ('merged', 'total', 'finished')
+
+    def __init__(self) -> None:
+        self.merged = 0  # number of elements merged so far (an element is counted once in each merge it is part of)
+        self.total = 0  # total number of elements to merge (the sum of the lengths of all merged runs)
+        self.finished = False
+
+    @property
+    def fraction(self) -> float:
+        """
+        Fraction of the merging done so far (elements merged / total), between 0 and 1.
+        """
+
+        if self.finished:
+            return 1.
+        return self.merged / self.total if self.total else 0.
+
+
+class _Stepper:
+    """
+    Yields control to the event loop once the sort performs `moves_per_step` element moves (or comparisons).
+    """
+
+    __slots__ = ('moves_per_step', 'moves')
+
+    def __init__(self, moves_per_step: int) -> None:
+        self.moves_per_step = moves_per_step
+        self.moves = 0
+
+    async def advance(self, moves: int) -> None:
+        self.moves += moves
+        if self.moves >= self.moves_per_step:
+            self.moves = 0
+            await asyncio.sleep(0)
+
+
+class _MergeOptions(NamedTuple):
+    """
+    Options of the merges of an asynchronous sort (same as the parameters of `merge`).
+    """
+
+    galloping_enabled: bool = False
+    galloping_dynamic_threshold_enabled: bool = False
+    trimming_enabled: bool = False
+    galloping_threshold: int = INITIAL_GALLOPING_THRESHOLD
+
+
+async def powersort_async(arr: List[T], min_run_length: int | None = None, galloping_enabled: bool = False,
+                          galloping_dynamic_threshold_enabled: bool = False, trimming_enabled: bool = False,
+                          key: Callable[[T], Any] | None = None, reverse: bool = False, kernel: str = 'reference',
+                          galloping_threshold: int = INITIAL_GALLOPING_THRESHOLD,
+                          moves_per_step: int = ASYNC_SORT_MOVES_PER_STEP,
+                          progress: SortProgress | None = None) -> List[T]:
+    """
+    Sorts the input list in-place using Powersort algorithm (see `powersort`), cooperatively with the asyncio event
+    loop: the sort yields control to the loop every `moves_per_step` element moves, so that other coroutines
+    are not blocked for the whole duration of a long sort (only for a single step).
+
+    The sort is a resumable state machine with the same merge policy as `powersort`:
+    1. The runs are found (scanning at most `moves_per_step` elements per step, see `_find_runs_async`).
+    2. The merges are scheduled by the node powers of the runs (see `powersort_merges`), which determines
+       the total number of elements to merge (see `SortProgress`).
+    3. Each merge is split into parts of `moves_per_step` output elements using the merge path partitioning
+       (see `co_rank`), the parts are merged in-place one by one, the same way as by `merge` (see `_merge_async`).
+    The key function is also applied in steps.
+
+    :param arr: Input sequence to sort
+    :param min_run_length: (optional) Minimal length of runs to enforce (see `powersort`)
+    :param galloping_enabled: (optional) Whether entering the galloping mode is enabled or not; Default: false
+    :param galloping_dynamic_threshold_enabled: (optional) Whether dynamic tuning of the galloping threshold
+        is enabled or not (see `powersort`); Default: false
+    :param trimming_enabled: (optional) Whether the parts of the runs are trimmed using galloping before each merge
+        (see `merge`); Default: false
+    :param key: (optional) Function extracting the comparison key from an element, called once per element
+    :param reverse: (optional) Whether to sort in decreasing order (stability is preserved); Default: false
+    :param kernel: (optional) Name of the kernel of the primitive operations, 'reference' or 'fast' (see `Kernel`);
+        Default: 'reference'
+    :param galloping_threshold: (optional) Initial threshold to trigger the galloping mode;
+        Default: INITIAL_GALLOPING_THRESHOLD
+    :param moves_per_step: (optional) Number of element moves (or comparisons) after which the sort yields
+        to the event loop; Default: ASYNC_SORT_MOVES_PER_STEP
+    :param progress: (optional) Progress of the sort, updated as it runs
+    :return: Sorted sequence (increasing)
+    """
+
+    options = _MergeOptions(galloping_enabled, galloping_dynamic_threshold_enabled, trimming_enabled,
+                            galloping_threshold)
+    return await _sort_async(arr, key, reverse, min_run_length, get_kernel(kernel), powersort_merges, options,
+                             moves_per_step, progress)
+
+
+async def timsort_async(arr: List[T], key: Callable[[T], Any] | None = None, reverse: bool = False,
+                        kernel: str = 'reference', min_run_length: int | None = MIN_RUN,
+                        galloping_threshold: int = INITIAL_GALLOPING_THRESHOLD,
+                        moves_per_step: int = ASYNC_SORT_MOVES_PER_STEP,
+                        progress: SortProgress | None = None) -> List[T]:
+    """
+    Sorts the input list in-place using Timsort algorithm (see `timsort`), cooperatively with the asyncio event loop.
+    The merges are scheduled by the run stack invariants of Timsort (see `timsort_merges`),
+    otherwise the sort works the same way as `powersort_async`.
+
+    :param arr: Input sequence to sort
+    :param key: (optional) Function extracting the comparison key from an element, called once per element
+    :param reverse: (optional) Whether to sort in decreasing order (stability is preserved); Default: false
+    :param kernel: (optional) Name of the kernel of the primitive operations, 'reference' or 'fast' (see `Kernel`);
+        Default: 'reference'
+    :param min_run_length: (optional) Minimal length of runs to enforce; Default: MIN_RUN
+    :param galloping_threshold: (optional) Initial threshold to trigger the galloping mode;
+        Default: INITIAL_GALLOPING_THRESHOLD
+    :param moves_per_step: (optional) Number of element moves (or comparisons) after which the sort yields
+        to the event loop; Default: ASYNC_SORT_MOVES_PER_STEP
+    :param progress: (optional) Progress of the sort, updated as it runs
+    :return: Sorted sequence (increasing)
+    """
+
+    options = _MergeOptions(galloping_enabled=True, galloping_threshold=galloping_threshold)
+    return await _sort_async(arr, key, reverse, min_run_length, get_kernel(kernel),
+                             lambda runs, n: timsort_merges(runs), options, moves_per_step, progress)
+
+
+async def _sort_async(arr: List[T], key: Callable[[T], Any] | None, reverse: bool, min_run_length: int | None,
+                      kernel: Kernel, schedule: Callable[[List[Run], int], Iterator[Tuple[int, int, int]]],
+                      options: _MergeOptions, moves_per_step: int, progress: SortProgress | None) -> List[T]:
+    """
+    Common part of the asynchronous sorts: applies the `key` and `reverse` semantics (same as `sort_by_key`),
+    finds the runs, and performs the merges scheduled by the merge policy.
+    """
+
+    if progress is None:
+        progress = SortProgress()
+    stepper = _Stepper(moves_per_step)
+    if reverse:
+        arr.reverse()
+    if key is None:
+        keys, values = arr, None
+    else:
+        keys, values = [], arr
+        for start in range(0, len(arr), moves_per_step):
+            keys.extend(map(key, arr[start:start+moves_per_step]))
+            await stepper.advance(moves_per_step)
+
+    if keys:
+        runs = await _find_runs_async(keys, min_run_length, values, kernel, stepper)
+        merges = []
+        for l, m, r in schedule(runs, len(keys)):
+            merges.append((l, m, r))
+            progress.total += r - l + 1
+            await stepper.advance(1)
+        buffer = MergeBuffer()
+        for l, m, r in merges:
+            await _merge_async(keys, l, m, r, values, buffer, kernel, options, stepper, progress)
+
+    if reverse:
+        arr.reverse()
+    progress.finished = True
+    return arr
+
+
+async def _find_runs_async(arr: List[T], min_run_length: int | None, values: List | None, kernel: Kernel,
+                           stepper: _Stepper) -> List[Run]:
+    """
+    Finds the run decomposition of the input sequence (see `find_runs`), comparing at most `moves_per_step`
+    pairs of elements per step, even within a single long run.
+    """
+
+    n = len(arr)
+    runs = []
+    start = 0
+    while start < n:
+        i = start
+        if i < n - 1:
+            i += 1
+            descending = arr[i] < arr[i-1]
+            while True:
+                limit = min(n - 1, i + stepper.moves_per_step)
+                scanned_from = i
+                if descending:
+                    while i < limit and arr[i+1] < arr[i]:
+                        i += 1
+                else:
+                    while i < limit and arr[i] <= arr[i+1]:
+                        i += 1
+                await stepper.advance(i - scanned_from + 1)
+                if i < limit or limit == n - 1:
+                    break
+            if descending:
+                kernel.reverse(arr, start, i, values)
+        end = i
+        if min_run_length and end - start + 1 < min_run_length:
+            end = min(start + min_run_length - 1, n - 1)
+            kernel.binary_insertion_sort(arr, start, end, i, values)
+            await stepper.advance(end - i)
+        runs.append(Run(start, end))
+        start = end + 1
+    return runs
+
+
+async def _merge_async(arr: List[T], l: int, m: int, r: int, values: List | None, buffer: MergeBuffer,
+                       kernel: Kernel, options: _MergeOptions, stepper: _Stepper, progress: SortProgress) -> None:
+    """
+    Merges two adjacent runs of the input sequence in-place (see `merge`), in parts of at most `moves_per_step`
+    output elements. Same as by `merge`, only the shorter run is copied into the scratch buffer (in parts as well),
+    and the output is written from left to right if it is the first run (same as `_merge_lo`), otherwise
+    from right to left (same as `_merge_hi`), so that it never overwrites the elements of the longer run
+    not merged yet. The next part of the output consists of the next elements of both runs found by the merge path
+    partitioning (see `co_rank`), which are merged directly from the buffer and the longer run, in-place.
+    """
+
+    merged = r - l + 1
+    if options.trimming_enabled:
+        # Same as in `merge`, the elements already in their final place are neither copied nor compared again
+        l, _ = kernel.gallop(arr, l, arr[m+1], True, m+1)
+        if l > m:
+            progress.merged += merged
+            return
+        r, _ = kernel.gallop_reversed(arr, m+1, r, arr[m], True)
+        r -= 1
+        progress.merged += merged - (r - l + 1)
+    threshold = options.galloping_threshold
+    step = stepper.moves_per_step
+    lo = m - l + 1 <= r - m
+    start, end = (l, m) if lo else (m + 1, r)
+    for offset in range(0, end - start + 1, step):
+        buffer.fill(arr, start + offset, min(start + offset + step - 1, end), values, offset)
+        await stepper.advance(min(step, end - start + 1 - offset))
+
+    if lo:
+        na = m - l + 1
+        i = 0  # next element of the first run (in the buffer)
+        j = m + 1  # next element of the second run
+        while i < na:
+            t = min(step, na - i + r + 1 - j)
+            ta = co_rank(t, buffer.keys, arr, i, na, j, r + 1)
+            threshold = _merge_lo_from_buffer(arr, l + i + j - m - 1, i, i + ta, j, j + t - ta - 1,
+                                              options.galloping_enabled,
+                                              options.galloping_dynamic_threshold_enabled, values, buffer, kernel,
+                                              threshold)
+            i += ta
+            j += t - ta
+            progress.merged += t
+            await stepper.advance(t)
+        # The rest of the second run is already in place
+        progress.merged += r + 1 - j
+    else:
+        i = m  # next element of the first run (from the right)
+        j = r - m - 1  # next element of the second run (in the buffer, from the right)
+        while j >= 0:
+            t = min(step, i - l + 1 + j + 1)
+            # The part consists of the last t elements of the merge, i.e., of the elements after the first `front`
+            front = i - l + 1 + j + 1 - t
+            fa = co_rank(front, arr, buffer.keys, l, i + 1, 0, j + 1)
+            threshold = _merge_hi_from_buffer(arr, i + j + 1, l + fa, i, front - fa, j, options.galloping_enabled,
+                                              options.galloping_dynamic_threshold_enabled, values, buffer, kernel,
+                                              threshold)
+            i = l + fa - 1
+            j = front - fa - 1
+            progress.merged += t
+            await stepper.advance(t)
+        # The rest of the first run is already in place
+        progress.merged += i - l + 1
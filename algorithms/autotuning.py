@@ -0,0 +1,129 @@
+import json
+import math
+import os
+from typing import List, TypeVar, Tuple, Dict, Any
+
+from algorithms.commons import iter_runs
+from config import AUTOTUNING_PROFILE_PATH
+
+# Generic type of elements in the input list
+T = TypeVar('T')
+
+# Candidate value of `min_run_length` standing for the minimal run length computed from N the same way as in CPython
+CPYTHON_MINRUN = 'cpython'
+
+"""
+Type alias for a tuned profile
+{algorithm name: [{'n': array size, 'avg_run_length': average length of the natural runs,
+                   'min_run_length': best min_run_length (None, int, or CPYTHON_MINRUN),
+                   'galloping_threshold': best initial galloping threshold,
+                   'comparisons': average # of comparisons, 'time_ms': average wall time [ms]}, ...]}
+Each entry holds the best parameters found for a single workload (array size and presortedness).
+"""
+TProfile = Dict[str, List[Dict[str, Any]]]
+
+# Loaded profiles: {path: profile}
+_profiles = {}
+
+
+def cpython_minrun(n: int) -> int:
+    """
+    Computes the minimal run length for the input of length N, the same way as CPython's listsort does.
+    The result is in the range [32, 64], such that N / minrun is a power of two, or close to (but less than) one,
+    so that the merges at the end are balanced.
+
+    :param n: Length of the input
+    :return: Minimal run length
+    """
+
+    r = 0
+    while n >= 64:
+        r |= n & 1
+        n >>= 1
+    return n + r
+
+
+def resolve_min_run_length(min_run_length: int | str | None, n: int) -> int | None:
+    """
+    Resolves the candidate value of `min_run_length` (possibly CPYTHON_MINRUN) for the input of length N.
+
+    :param min_run_length: Candidate value
+    :param n: Length of the input
+    :return: Minimal run length to enforce (None for no minimal run length)
+    """
+
+    if min_run_length == CPYTHON_MINRUN:
+        return cpython_minrun(n)
+    return min_run_length
+
+
+def measure_average_run_length(arr: List[T]) -> float:
+    """
+    Measures the presortedness of the input as the average length of its natural runs (N / number of runs).
+    The runs are found on a copy of the input, so that the input itself is not modified.
+
+    :param arr: Input sequence
+    :return: Average length of the natural runs
+    """
+
+    if not len(arr):
+        return 0.
+    return len(arr) / sum(1 for _ in iter_runs(arr.copy()))
+
+
+def save_profile(profile: TProfile, path: str = AUTOTUNING_PROFILE_PATH) -> None:
+    """
+    Saves the tuned profile as a JSON file.
+
+    :param profile: Tuned profile
+    :param path: (optional) Path to the profile file; Default: AUTOTUNING_PROFILE_PATH
+    :return: None; Side effect: JSON file with the profile
+    """
+
+    with open(path, mode='w') as file:
+        json.dump(profile, file, indent=2)
+    _profiles[path] = profile
+
+
+def load_profile(path: str = AUTOTUNING_PROFILE_PATH) -> TProfile | None:
+    """
+    Loads the tuned profile from a JSON file. The profile is loaded only once, then it is cached.
+
+    :param path: (optional) Path to the profile file; Default: AUTOTUNING_PROFILE_PATH
+    :return: Tuned profile, or None if the file does not exist
+    """
+
+    if path not in _profiles:
+        if not os.path.exists(path):
+            return None
+        with open(path) as file:
+            _profiles[path] = json.load(file)
+    return _profiles[path]
+
+
+def select_parameters(arr: List[T], algorithm: str, min_run_length: int | None, galloping_threshold: int,
+                      path: str = AUTOTUNING_PROFILE_PATH) -> Tuple[int | None, int]:
+    """
+    Selects the tuned `min_run_length` and initial galloping threshold for the input from the tuned profile.
+    The entry of the profile whose workload is the closest to the input is used, measured by the distance
+    of the (logarithms of the) array sizes and of the average run lengths (see `measure_average_run_length`).
+
+    :param arr: Input sequence
+    :param algorithm: Name of the algorithm ('powersort' or 'timsort')
+    :param min_run_length: Minimal run length to use if there is no profile for the algorithm
+    :param galloping_threshold: Initial galloping threshold to use if there is no profile for the algorithm
+    :param path: (optional) Path to the profile file; Default: AUTOTUNING_PROFILE_PATH
+    :return: Minimal run length (None for no minimal run length) and initial galloping threshold to use
+    """
+
+    profile = load_profile(path)
+    if not profile or not profile.get(algorithm) or len(arr) < 2:
+        return min_run_length, galloping_threshold
+    n = len(arr)
+    avg_run_length = measure_average_run_length(arr)
+
+    def distance(entry: Dict[str, Any]) -> float:
+        return abs(math.log2(n / entry['n'])) + abs(math.log2(avg_run_length / entry['avg_run_length']))
+
+    best = min(profile[algorithm], key=distance)
+    return resolve_min_run_length(best['min_run_length'], n), best['galloping_threshold']
@@ -0,0 +1,100 @@
+from itertools import compress
+from operator import not_
+from typing import List, TypeVar, Callable, Any, Iterable, Sequence
+
+from algorithms.commons import merge, get_kernel
+from algorithms.powersort import _powersort
+
+# Generic type of elements in the input list
+T = TypeVar('T')
+
+
+class _KeyView:
+    """
+    Read-only view of the keys of a list, calling the key function only on the elements actually accessed
+    (e.g., the ones probed by galloping), so that the keys of the whole list are never computed.
+    """
+
+    __slots__ = ('arr', 'key')
+
+    def __init__(self, arr: List[T], key: Callable[[T], Any]) -> None:
+        self.arr = arr
+        self.key = key
+
+    def __len__(self) -> int:
+        return len(self.arr)
+
+    def __getitem__(self, i: int) -> Any:
+        return self.key(self.arr[i])
+
+
+def insert_sorted(sorted_list: List[T], batch: Iterable[T], key: Callable[[T], Any] | None = None,
+                  delete: Sequence[bool] | None = None, kernel: str = 'reference') -> List[T]:
+    """
+    Inserts a batch of elements into the sorted list in-place (and optionally deletes elements from it),
+    keeping the list sorted. The inserted elements are placed after the equal elements already in the list (stability).
+
+    The batch is sorted by Powersort first (see `powersort`), then merged into the list:
+    - Without a key function and deletions, the batch is appended and merged using `merge` with galloping and trimming:
+      the elements of the list before the first inserted element are not touched at all, and the long stretches
+      of the list between the inserted elements are galloped over.
+    - Otherwise, the position of each inserted element is found by galloping from the position of the previous one,
+      and the list is rebuilt by copying its slices between these positions, skipping the deleted elements.
+      The key function is called only on the probed elements of the list (and once per inserted element).
+    Either way, the number of comparisons is O(b log(n/b)) for a batch of b elements inserted into a list
+    of n elements (proportional to the batch size, if the batch lands in a few gaps), while the elements
+    of the list are moved by slices (not one by one, like `bisect.insort`, which moves O(n) elements per insertion).
+
+    :param sorted_list: Sorted list to update
+    :param batch: Elements to insert (in any order)
+    :param key: (optional) Function extracting the comparison key from an element; The list must be sorted by it
+    :param delete: (optional) Mask of the elements of the list to delete (true for the deleted ones);
+        Deleted in the same pass as the batch is inserted
+    :param kernel: (optional) Name of the kernel of the primitive operations, 'reference' or 'fast' (see `Kernel`);
+        Default: 'reference'
+    :return: Updated sorted list (the same object)
+    """
+
+    primitives = get_kernel(kernel)
+    batch = list(batch)
+    if key is None:
+        batch_keys = batch
+        values = None
+    else:
+        batch_keys = [key(x) for x in batch]
+        values = batch
+    if len(batch) > 1:
+        _powersort(batch_keys, None, True, False, True, values, primitives)
+
+    n = len(sorted_list)
+    if key is None and delete is None:
+        sorted_list.extend(batch)
+        if n and batch:
+            merge(sorted_list, 0, n - 1, len(sorted_list) - 1, True, False, None, None, True, primitives)
+        return sorted_list
+
+    if delete is not None and len(delete) != n:
+        raise ValueError("The deletion mask must have the same length as the sorted list")
+    keys = sorted_list if key is None else _KeyView(sorted_list, key)
+    result = []
+    pos = 0
+    for x, k in zip(batch, batch_keys):
+        # Inserted elements landing in the same gap cost a single comparison each
+        idx, _ = primitives.gallop(keys, pos, k, True)
+        _copy_slice(sorted_list, pos, idx, delete, result)
+        result.append(x)
+        pos = idx
+    _copy_slice(sorted_list, pos, n, delete, result)
+    sorted_list[:] = result
+    return sorted_list
+
+
+def _copy_slice(arr: List[T], start: int, end: int, delete: Sequence[bool] | None, result: List[T]) -> None:
+    """
+    Appends the elements arr[start:end] not marked as deleted to the result.
+    """
+
+    if delete is None:
+        result.extend(arr[start:end])
+    else:
+        result.extend(compress(arr[start:end], map(not_, delete[start:end])))
@@ -1,6 +1,11 @@
-from typing import TypeVar, List, Tuple
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import TypeVar, List, Tuple, Callable, Any, Iterator
 
-from config import INITIAL_GALLOPING_THRESHOLD
+import numpy as np
+
+from config import INITIAL_GALLOPING_THRESHOLD, VECTORIZED_RUN_DETECTION_THRESHOLD, \
+    VECTORIZED_RUN_DETECTION_MIN_AVG_LENGTH
 
 # Generic type of elements in the input list
 T = TypeVar('T')
@@ -12,6 +17,8 @@ class Run:
     It is defined by its start and end indices in the array.
     """
 
+    __slots__ = ('start', 'end')
+
     def __init__(self, start: int, end: int) -> None:
         """
         Constructor creating the representation of the run [start, end].
@@ -29,7 +36,73 @@ class Run:
         return f"({self.start}, {self.end})"
 
 
-def find_runs(arr: List[T], min_run_length: int | None = None) -> List[Run]:
+class Kernel:
+    """
+    Set of the primitive operations the sorting algorithms are built from: binary search, binary insertion sort,
+    galloping (in both directions) and reversal of a (descending) run.
+
+    Two kernels are available (see `get_kernel`):
+    - 'reference': pure Python implementations, whose comparisons are exactly the ones counted by the benchmarks
+    - 'fast': the same operations using the C builtins (`bisect` with `lo`/`hi`, slice moves)
+    Both kernels produce identical results.
+    """
+
+    __slots__ = ('name', 'binary_search', 'binary_insertion_sort', 'gallop', 'gallop_reversed', 'reverse')
+
+    def __init__(self, name: str, binary_search: Callable[..., int], binary_insertion_sort: Callable[..., None],
+                 gallop: Callable[..., Tuple[int, int]], gallop_reversed: Callable[..., Tuple[int, int]],
+                 reverse: Callable[..., None]) -> None:
+        """
+        :param name: Name of the kernel
+        :param binary_search: Implementation of `binary_search`
+        :param binary_insertion_sort: Implementation of `binary_insertion_sort`
+        :param gallop: Implementation of `_gallop`
+        :param gallop_reversed: Implementation of `_gallop_reversed`
+        :param reverse: Implementation of `_reverse`
+        """
+        self.name = name
+        self.binary_search = binary_search
+        self.binary_insertion_sort = binary_insertion_sort
+        self.gallop = gallop
+        self.gallop_reversed = gallop_reversed
+        self.reverse = reverse
+
+    def __str__(self) -> str:
+        return self.name
+
+
+def sort_by_key(arr: List[T], key: Callable[[T], Any] | None, reverse: bool,
+                sort_func: Callable[[List[Any], List[T] | None], Any]) -> List[T]:
+    """
+    Applies the `key` and `reverse` semantics of the builtin `sorted()` to a stable sorting function.
+
+    The key function is called exactly once per element. The keys are stored in a separate list, which is
+    the one actually being sorted (compared), while the original elements are permuted alongside it.
+    Reverse order is achieved by reversing the input before and after the (stable) sort, which keeps
+    the elements with equal keys in their original order, the same way as CPython does.
+
+    :param arr: Input sequence to sort
+    :param key: (optional) Function extracting the comparison key from an element; Default: the element itself
+    :param reverse: Whether to sort in decreasing order
+    :param sort_func: Sorting function taking the list to compare (keys) and the optional list of values
+        to permute alongside it
+    :return: Sorted sequence
+    """
+
+    if reverse:
+        arr.reverse()
+    if key is None:
+        sort_func(arr, None)
+    else:
+        keys = [key(x) for x in arr]
+        sort_func(keys, arr)
+    if reverse:
+        arr.reverse()
+    return arr
+
+
+def find_runs(arr: List[T], min_run_length: int | None = None, values: List | None = None,
+              kernel: Kernel | None = None) -> List[Run]:
     """
     Finds the run decomposition of the input sequence.
     Supports detecting both ascending and descending runs.
@@ -38,19 +111,121 @@ def find_runs(arr: List[T], min_run_length: int | None = None) -> List[Run]:
 
     :param arr: Input sequence
     :param min_run_length: (optional) Minimal length of runs to enforce
+    :param values: (optional) Sequence permuted alongside `arr` (e.g., the elements belonging to the keys in `arr`)
+    :param kernel: (optional) Kernel of the primitive operations (see `Kernel`); Default: the reference kernel
     :return: List of runs
     """
 
-    runs = []
+    return list(iter_runs(arr, min_run_length, values, kernel))
+
+
+def iter_runs(arr: List[T], min_run_length: int | None = None, values: List | None = None,
+              kernel: Kernel | None = None, max_scratch: int | None = None) -> Iterator[Run]:
+    """
+    Lazy version of `find_runs`, discovering the runs one by one, as they are consumed.
+    This way, the caller (e.g., the merging loop of Powersort or Timsort) does not need to hold all runs at once.
+
+    For numeric inputs, all descents are located at once in a vectorized way (see `_find_descents`),
+    so that each run is then found in a single step, instead of a step per element.
+    This needs a numeric copy of the whole input (released as soon as the descents are found), so it is skipped
+    if the extra memory is capped by `max_scratch`: the runs are then found element by element, in O(1) extra memory.
+
+    :param arr: Input sequence
+    :param min_run_length: (optional) Minimal length of runs to enforce
+    :param values: (optional) Sequence permuted alongside `arr`
+    :param kernel: (optional) Kernel of the primitive operations (see `Kernel`); Default: the reference kernel
+    :param max_scratch: (optional) Cap of the extra memory of the sort (see `merge`); Default: unlimited
+    :return: Generator yielding the runs from left to right
+    """
+
+    keys = _as_numeric_array(arr) if max_scratch is None else None
+    descents = _find_descents(keys) if keys is not None else None
+    # The numeric copy would otherwise stay alive (in this frame) until the last run is consumed
+    del keys
     start = 0
     while start < len(arr):
-        run = find_next_run(arr, start, min_run_length)
-        runs.append(run)
+        run = find_next_run(arr, start, min_run_length, values, descents, kernel)
+        yield run
         start = run.end + 1
-    return runs
 
 
-def find_next_run(arr: List[T], start: int, min_run_length: int | None = None) -> Run:
+def _as_numeric_array(arr: List[T]) -> np.ndarray | None:
+    """
+    Returns a NumPy view (for ndarrays) or copy (for lists) of the input sequence, if its run decomposition
+    can be found in a vectorized way with exactly the same result as element-by-element comparisons
+    (see `to_numeric_array`), and if it is long enough for the vectorized run detection to pay off.
+
+    :param arr: Input sequence
+    :return: Numeric array with the same elements, or None if the vectorized run detection cannot be used
+    """
+
+    if len(arr) < VECTORIZED_RUN_DETECTION_THRESHOLD:
+        return None
+    return to_numeric_array(arr)
+
+
+def to_numeric_array(arr: List[T]) -> np.ndarray | None:
+    """
+    Returns a NumPy view (for ndarrays) or copy (for lists) of the input sequence, if the comparisons
+    of its elements give exactly the same results in NumPy as in Python.
+    This is the case for one-dimensional numeric ndarrays, and for lists consisting either of ints (and bools)
+    fitting into int64, or of floats. Lists mixing ints and floats are excluded, as ints larger than 2^53 would
+    lose precision when converted to floats. Inputs containing NaN are excluded as well.
+
+    :param arr: Input sequence
+    :return: Numeric array with the same elements, or None if the input is not such a sequence
+    """
+
+    if isinstance(arr, np.ndarray):
+        keys = arr if arr.ndim == 1 and arr.dtype.kind in 'biuf' else None
+    elif isinstance(arr, list):
+        types = set(map(type, arr))
+        if types <= {int, bool}:
+            try:
+                keys = np.fromiter(arr, dtype=np.int64, count=len(arr))
+            except OverflowError:
+                keys = None
+        elif types == {float}:
+            keys = np.fromiter(arr, dtype=np.float64, count=len(arr))
+        else:
+            keys = None
+    else:
+        keys = None
+    if keys is not None and keys.dtype.kind == 'f' and np.isnan(keys).any():
+        return None
+    return keys
+
+
+def _find_descents(keys: np.ndarray) -> Tuple[array, array] | None:
+    """
+    Finds all descents of the numeric input in a vectorized way, which is used to find the natural runs
+    in a single step per run (see `_find_next_natural_run`).
+    All pairs of adjacent elements are compared at once (i.e., the signs of their differences are computed).
+    An ascending run ends on the first descent after its start, and a descending run ends right after the last descent
+    in the streak of consecutive descents beginning on its start.
+    The descents are stored in compact arrays of machine integers, not as Python objects.
+
+    :param keys: Numeric array (see `_as_numeric_array`)
+    :return: Indices i for which keys[i] > keys[i+1] (followed by the last index as a sentinel), and for each of them,
+        the last descent of the streak of consecutive descents it belongs to. None if the natural runs are too
+        short on average for the vectorized detection to pay off.
+    """
+
+    n = len(keys)
+    descents = np.flatnonzero(keys[1:] < keys[:-1])
+    if len(descents) * VECTORIZED_RUN_DETECTION_MIN_AVG_LENGTH > n and len(descents) != n-1:
+        return None
+    if not len(descents):
+        # Already sorted
+        return array('q', [n-1]), array('q')
+    streak_ends = np.flatnonzero(np.append(np.diff(descents) != 1, True))
+    last_descents = descents[streak_ends][np.searchsorted(streak_ends, np.arange(len(descents)))]
+    descents = np.append(descents, n-1)
+    return array('q', descents.astype(np.int64).tobytes()), array('q', last_descents.astype(np.int64).tobytes())
+
+
+def find_next_run(arr: List[T], start: int, min_run_length: int | None = None, values: List | None = None,
+                  descents: Tuple[array, array] | None = None, kernel: Kernel | None = None) -> Run:
     """
     Finds the end of the run (ascending or descending) starting on the specified index.
     Additionally, the function optionally enforces the minimal run length policy, extending
@@ -59,42 +234,85 @@ def find_next_run(arr: List[T], start: int, min_run_length: int | None = None) -
     :param arr: Input sequence
     :param start: Index on which the run begins
     :param min_run_length: (optional) Minimal length of runs to enforce
+    :param values: (optional) Sequence permuted alongside `arr`
+    :param descents: (optional) Precomputed descents of `arr` (see `_find_descents`)
+    :param kernel: (optional) Kernel of the primitive operations (see `Kernel`); Default: the reference kernel
     :return: Representation of the found run
     """
 
-    end = _find_next_natural_run(arr, start)
+    if kernel is None:
+        kernel = REFERENCE_KERNEL
+    end = _find_next_natural_run(arr, start, values, descents, kernel)
     run_size = end - start + 1
     if min_run_length and run_size < min_run_length:
         natural_end = end
         end = min(start + min_run_length - 1, len(arr) - 1)
-        binary_insertion_sort(arr, start, end, natural_end)
+        kernel.binary_insertion_sort(arr, start, end, natural_end, values)
     return Run(start, end)
 
 
-def _find_next_natural_run(arr: List[T], start: int) -> int:
+def _find_next_natural_run(arr: List[T], start: int, values: List | None = None,
+                           descents: Tuple[array, array] | None = None, kernel: Kernel | None = None) -> int:
     """
     Finds the end of the natural run (ascending or descending) starting on the specified index.
     The descending runs are reversed in-place, in order to work exclusively with ascending
-    runs for simplicity.
+    runs for simplicity. Only strictly descending runs are detected, so that reversing them
+    can never change the order of equal elements (stability).
 
     :param arr: Input sequence
     :param start: Index on which the run begins
+    :param values: (optional) Sequence permuted alongside `arr`
+    :param descents: (optional) Precomputed descents of `arr` (see `_find_descents`); If specified,
+        the run is found without comparing any elements
+    :param kernel: (optional) Kernel of the primitive operations (see `Kernel`); Default: the reference kernel
     :return: Index on which the run ends (inclusive)
     """
 
-    i = start
-    while i < len(arr)-1 and arr[i] <= arr[i+1]:
+    reverse = _reverse if kernel is None else kernel.reverse
+    if descents is not None:
+        descents, last_descents = descents
+        p = bisect_left(descents, start)
+        if descents[p] == start < len(arr)-1:
+            # Descending run
+            end = last_descents[p] + 1
+            reverse(arr, start, end, values)
+            return end
         # Ascending run
-        i += 1
-    if arr[start] == arr[i]:
-        while i < len(arr)-1 and arr[i] >= arr[i+1]:
+        return descents[p]
+
+    i = start
+    if i == len(arr)-1:
+        return i
+    i += 1
+    if arr[i] < arr[i-1]:
+        while i < len(arr)-1 and arr[i+1] < arr[i]:
             # Descending run
             i += 1
-        arr[start:i+1] = reversed(arr[start:i+1])
+        reverse(arr, start, i, values)
+    else:
+        while i < len(arr)-1 and arr[i] <= arr[i+1]:
+            # Ascending run
+            i += 1
     return i
 
 
-def binary_insertion_sort(arr: List[T], left: int, right: int, m: int) -> None:
+def _reverse(arr: List[T], start: int, end: int, values: List | None = None) -> None:
+    """
+    Reverses the specified subarray in-place.
+
+    :param arr: Input sequence (list or ndarray)
+    :param start: Start index of the subarray to reverse
+    :param end: End index of the subarray to reverse (inclusive)
+    :param values: (optional) Sequence permuted alongside `arr`
+    :return: None
+    """
+
+    arr[start:end+1] = arr[start:end+1][::-1]
+    if values is not None:
+        values[start:end+1] = values[start:end+1][::-1]
+
+
+def binary_insertion_sort(arr: List[T], left: int, right: int, m: int, values: List | None = None) -> None:
     """
     Sorts the specified subarray using Binary Insertion Sort algorithm.
     This function assumes that the [left, m] part of the subarray is already sorted.
@@ -103,6 +321,7 @@ def binary_insertion_sort(arr: List[T], left: int, right: int, m: int) -> None:
     :param left: Start index of the subarray to sort
     :param right: End index of the subarray to sort
     :param m: Last index of the sorted part of the subarray
+    :param values: (optional) Sequence permuted alongside `arr`
     :return: None
     """
 
@@ -112,12 +331,17 @@ def binary_insertion_sort(arr: List[T], left: int, right: int, m: int) -> None:
         j = binary_search(arr, val, left, i)
         arr[j+1:i+1] = arr[j:i]
         arr[j] = val
+        if values is not None:
+            v = values[i]
+            values[j+1:i+1] = values[j:i]
+            values[j] = v
 
 
 def binary_search(arr: List[T], val: T, start: int, end: int) -> int:
     """
     Finds the correct position in the subarray for the specified value using binary search.
     Note that the element does not have to exist in the array.
+    If there are elements equal to `val`, the returned position is to the right of them (stability).
 
     :param arr: Input sequence
     :param val: Value to find the correct position for
@@ -128,19 +352,76 @@ def binary_search(arr: List[T], val: T, start: int, end: int) -> int:
 
     while start < end:
         mid = (start+end) // 2
-        if arr[mid] < val:
-            start = mid+1
-        else:
+        if val < arr[mid]:
             end = mid
+        else:
+            start = mid+1
     return start
 
 
+class MergeBuffer:
+    """
+    Scratch space for merging, allocated once per sort and reused by all of its merges.
+    In binary merges, only the shorter of the two merged runs is ever copied into it (see `merge`), therefore
+    it never grows beyond n/2 elements (plus n/2 values, if a sequence of values is permuted alongside the keys).
+    This is the bound on the peak extra memory used for merging by Powersort, Timsort and the other binary
+    merge sorts. The k-way merges (see `multiway_merge`) copy all runs of a group except for the last one,
+    so in the 4-way mode, the buffer grows up to the length of the group without its last run: about 3n/4
+    for the final merge of 4 runs of similar lengths, and up to n-1 if the last run is very short.
+    With `max_scratch`, it never grows beyond `max_scratch` elements (see `_sym_merge`).
+    """
+
+    def __init__(self) -> None:
+        self.keys = []
+        self.values = []
+
+    def fill(self, arr: List[T], start: int, end: int, values: List | None = None, offset: int = 0) -> None:
+        """
+        Copies the specified subarray into the beginning of the buffer, growing the buffer if needed.
+
+        :param arr: Input sequence
+        :param start: Start index of the subarray to copy
+        :param end: End index of the subarray to copy (inclusive)
+        :param values: (optional) Sequence permuted alongside `arr`; Its subarray is copied as well
+        :param offset: (optional) Index of the buffer to copy the subarray to, when a run is copied in parts;
+            Default: 0 (the beginning)
+        :return: None
+        """
+
+        size = end - start + 1
+        if len(self.keys) < offset + size:
+            self.keys.extend([None] * (offset + size - len(self.keys)))
+        keys = self.keys
+        for t in range(size):
+            keys[offset+t] = arr[start+t]
+        if values is not None:
+            if len(self.values) < offset + size:
+                self.values.extend([None] * (offset + size - len(self.values)))
+            buffered_values = self.values
+            for t in range(size):
+                buffered_values[offset+t] = values[start+t]
+
+
 def merge(arr: List[T], l: int, m: int, r: int, galloping_enabled: bool = False,
-          galloping_dynamic_threshold_enabled: bool = False) -> Run:
+          galloping_dynamic_threshold_enabled: bool = False, values: List | None = None,
+          buffer: MergeBuffer | None = None, trimming_enabled: bool = False, kernel: Kernel | None = None,
+          galloping_threshold: int = INITIAL_GALLOPING_THRESHOLD, max_scratch: int | None = None) -> Run:
     """
     Merges two adjacent runs of the input sequence in-place.
     Analogous to the linear-time merge operation of the traditional Merge Sort.
 
+    Same as in CPython's listsort, only the shorter run is copied into the scratch buffer. If it is the first run,
+    the runs are merged from left to right (`_merge_lo`), otherwise from right to left (`_merge_hi`), so that
+    the longer run is merged in-place. Therefore, the extra memory needed is min(len(first), len(second)).
+
+    Optionally, the runs are trimmed before merging, same as in CPython's listsort: galloping finds where
+    the first element of the second run belongs in the first run, and where the last element of the first run
+    belongs in the second run. The elements before/after these positions are already in their final place,
+    so they are neither copied nor compared again.
+
+    Optionally, the extra memory is capped: if the shorter run is longer than `max_scratch` elements, the runs are
+    merged by `_sym_merge` instead (in-place, using rotations), which splits them until the shorter run fits.
+
     :param arr: Input sequence
     :param l: (left) Starting index of the first run (inclusive)
     :param m: (middle) Ending index of the first run (inclusive), starting index of the second run (exclusive)
@@ -149,22 +430,79 @@ def merge(arr: List[T], l: int, m: int, r: int, galloping_enabled: bool = False,
     :param galloping_dynamic_threshold_enabled: (optional) Whether dynamic tuning of the galloping threshold
         is enabled or not; If true, the threshold decreases with every successful gallop, and decreases with every
         unsuccessful one. If false, the threshold stays always the same. Default: false
+    :param values: (optional) Sequence permuted alongside `arr`; Only `arr` is compared
+    :param buffer: (optional) Scratch buffer to reuse; Should be shared by all the merges of a single sort.
+        If not specified, a new one is allocated.
+    :param trimming_enabled: (optional) Whether the runs are trimmed using galloping before merging; Default: false
+    :param kernel: (optional) Kernel of the primitive operations (see `Kernel`); Default: the reference kernel
+    :param galloping_threshold: (optional) Initial threshold to trigger the galloping mode;
+        Default: INITIAL_GALLOPING_THRESHOLD
+    :param max_scratch: (optional) Maximal number of elements of the scratch buffer (see `_sym_merge`);
+        Default: unlimited
     :return: New merged run: [left, right]
     """
 
-    left = arr[l:m+1]     # first run
-    right = arr[m+1:r+1]  # second run
-    k = l  # index in the original array
-    i = 0  # index in the first run
-    j = 0  # index in the second run
+    if kernel is None:
+        kernel = REFERENCE_KERNEL
+    run = Run(l, r)
+    if trimming_enabled:
+        # Elements of the first run not greater than the first element of the second run are already in place
+        l, _ = kernel.gallop(arr, l, arr[m+1], True, m+1)
+        if l > m:
+            return run
+        # Elements of the second run not less than the last element of the first run are already in place
+        r, _ = kernel.gallop_reversed(arr, m+1, r, arr[m], True)
+        r -= 1
+    if buffer is None:
+        buffer = MergeBuffer()
+    if max_scratch is not None and min(m - l + 1, r - m) > max_scratch:
+        _sym_merge(arr, l, m + 1, r + 1, values, buffer, kernel, max_scratch)
+    elif m - l + 1 <= r - m:
+        _merge_lo(arr, l, m, r, galloping_enabled, galloping_dynamic_threshold_enabled, values, buffer, kernel,
+                  galloping_threshold)
+    else:
+        _merge_hi(arr, l, m, r, galloping_enabled, galloping_dynamic_threshold_enabled, values, buffer, kernel,
+                  galloping_threshold)
+    return run
+
+
+def _merge_lo(arr: List[T], l: int, m: int, r: int, galloping_enabled: bool,
+              galloping_dynamic_threshold_enabled: bool, values: List | None, buffer: MergeBuffer,
+              kernel: Kernel, galloping_threshold: int) -> None:
+    """
+    Merges two adjacent runs from left to right, copying only the first run into the scratch buffer.
+    The parameters are the same as in `merge`.
+    """
+
+    buffer.fill(arr, l, m, values)
+    _merge_lo_from_buffer(arr, l, 0, m - l + 1, m + 1, r, galloping_enabled, galloping_dynamic_threshold_enabled,
+                          values, buffer, kernel, galloping_threshold)
+
+
+def _merge_lo_from_buffer(arr: List[T], k: int, i: int, na: int, j: int, r: int, galloping_enabled: bool,
+                          galloping_dynamic_threshold_enabled: bool, values: List | None, buffer: MergeBuffer,
+                          kernel: Kernel, galloping_threshold: int) -> int:
+    """
+    Merges the elements [i, na) of the scratch buffer (copied from the first run) with the elements [j, r]
+    of the input sequence from left to right, writing the output to the input sequence starting on the index k.
+    The output never overwrites the elements not merged yet, since k <= j (the elements of the buffer not merged
+    yet come from the part of the input before j). The rest of the parameters are the same as in `merge`.
+    Used by `_merge_lo` for a whole merge, and by `_merge_async` for its parts.
+
+    :return: Galloping threshold after the merge (see `galloping_dynamic_threshold_enabled` of `merge`)
+    """
+
+    left = buffer.keys  # first run
+    left_values = buffer.values
 
-    galloping_threshold = INITIAL_GALLOPING_THRESHOLD  # initial threshold to trigger the galloping mode
     win_count = 0  # how many times consecutively was the element picked from the same run (winning run)
     left_winning = True  # whether it was the left or the right run
 
-    while i < len(left) and j < len(right):
-        if left[i] <= right[j]:
+    while i < na and j <= r:
+        if left[i] <= arr[j]:
             arr[k] = left[i]
+            if values is not None:
+                values[k] = left_values[i]
             i += 1
             if left_winning:
                 win_count += 1
@@ -172,7 +510,9 @@ def merge(arr: List[T], l: int, m: int, r: int, galloping_enabled: bool = False,
                 win_count = 1
                 left_winning = True
         else:
-            arr[k] = right[j]
+            arr[k] = arr[j]
+            if values is not None:
+                values[k] = values[j]
             j += 1
             if left_winning:
                 win_count = 1
@@ -182,27 +522,28 @@ def merge(arr: List[T], l: int, m: int, r: int, galloping_enabled: bool = False,
         k += 1
 
         # Do not start galloping if one of the runs is already exhausted
-        if i >= len(left) or j >= len(right):
+        if i >= na or j > r:
             break
 
         # Trigger galloping mode?
         if galloping_enabled and win_count >= galloping_threshold:
             if left_winning:
                 # Gallop in left run
-                idx, comparisons = _gallop(left, i, right[j], True)
+                idx, comparisons = kernel.gallop(left, i, arr[j], True, na)
                 galloped = idx - i
-                while i < idx:
-                    arr[k] = left[i]
-                    i += 1
-                    k += 1
+                arr[k:k+galloped] = left[i:idx]
+                if values is not None:
+                    values[k:k+galloped] = left_values[i:idx]
+                i = idx
             else:
                 # Gallop in right run
-                idx, comparisons = _gallop(right, j, left[i], False)
+                idx, comparisons = kernel.gallop(arr, j, left[i], False, r+1)
                 galloped = idx - j
-                while j < idx:
-                    arr[k] = right[j]
-                    j += 1
-                    k += 1
+                arr[k:k+galloped] = arr[j:idx]
+                if values is not None:
+                    values[k:k+galloped] = values[j:idx]
+                j = idx
+            k += galloped
             win_count = 0
 
             # Adaptive tuning of the galloping threshold (based on the number of galloped items)
@@ -212,19 +553,227 @@ def merge(arr: List[T], l: int, m: int, r: int, galloping_enabled: bool = False,
                 else:
                     galloping_threshold += 1
 
-    # Final copying
-    while i < len(left):
-        arr[k] = left[i]
-        i += 1
-        k += 1
-    while j < len(right):
-        arr[k] = right[j]
-        j += 1
-        k += 1
-    return Run(l, r)
+    # Final copying (the rest of the second run is already in place, unless only a part of the runs is merged)
+    arr[k:k+na-i] = left[i:na]
+    if values is not None:
+        values[k:k+na-i] = left_values[i:na]
+    if k < j <= r:
+        arr[k:k+r+1-j] = arr[j:r+1]
+        if values is not None:
+            values[k:k+r+1-j] = values[j:r+1]
+    return galloping_threshold
+
+
+def _merge_hi(arr: List[T], l: int, m: int, r: int, galloping_enabled: bool,
+              galloping_dynamic_threshold_enabled: bool, values: List | None, buffer: MergeBuffer,
+              kernel: Kernel, galloping_threshold: int) -> None:
+    """
+    Merges two adjacent runs from right to left, copying only the second run into the scratch buffer.
+    The parameters are the same as in `merge`.
+    """
+
+    buffer.fill(arr, m+1, r, values)
+    _merge_hi_from_buffer(arr, r, l, m, 0, r - m - 1, galloping_enabled, galloping_dynamic_threshold_enabled,
+                          values, buffer, kernel, galloping_threshold)
+
+
+def _merge_hi_from_buffer(arr: List[T], k: int, l: int, i: int, lo: int, j: int, galloping_enabled: bool,
+                          galloping_dynamic_threshold_enabled: bool, values: List | None, buffer: MergeBuffer,
+                          kernel: Kernel, galloping_threshold: int) -> int:
+    """
+    Merges the elements [l, i] of the input sequence with the elements [lo, j] of the scratch buffer (copied from
+    the second run) from right to left, writing the output to the input sequence ending on the index k.
+    The output never overwrites the elements not merged yet, since k >= i (the elements of the buffer not merged
+    yet come from the part of the input after i). The rest of the parameters are the same as in `merge`.
+    Used by `_merge_hi` for a whole merge, and by `_merge_async` for its parts.
+
+    :return: Galloping threshold after the merge (see `galloping_dynamic_threshold_enabled` of `merge`)
+    """
+
+    right = buffer.keys  # second run
+    right_values = buffer.values
+
+    win_count = 0  # how many times consecutively was the element picked from the same run (winning run)
+    left_winning = True  # whether it was the left or the right run
+
+    while i >= l and j >= lo:
+        if arr[i] <= right[j]:
+            # Elements of the second run go after the equal elements of the first run (stability)
+            arr[k] = right[j]
+            if values is not None:
+                values[k] = right_values[j]
+            j -= 1
+            if left_winning:
+                win_count = 1
+                left_winning = False
+            else:
+                win_count += 1
+        else:
+            arr[k] = arr[i]
+            if values is not None:
+                values[k] = values[i]
+            i -= 1
+            if left_winning:
+                win_count += 1
+            else:
+                win_count = 1
+                left_winning = True
+        k -= 1
+
+        # Do not start galloping if one of the runs is already exhausted
+        if i < l or j < lo:
+            break
+
+        # Trigger galloping mode?
+        if galloping_enabled and win_count >= galloping_threshold:
+            if left_winning:
+                # Gallop in left run
+                idx, comparisons = kernel.gallop_reversed(arr, l, i, right[j], False)
+                galloped = i + 1 - idx
+                arr[k+1-galloped:k+1] = arr[idx:i+1]
+                if values is not None:
+                    values[k+1-galloped:k+1] = values[idx:i+1]
+                i = idx - 1
+            else:
+                # Gallop in right run
+                idx, comparisons = kernel.gallop_reversed(right, lo, j, arr[i], True)
+                galloped = j + 1 - idx
+                arr[k+1-galloped:k+1] = right[idx:j+1]
+                if values is not None:
+                    values[k+1-galloped:k+1] = right_values[idx:j+1]
+                j = idx - 1
+            k -= galloped
+            win_count = 0
+
+            # Adaptive tuning of the galloping threshold (based on the number of galloped items)
+            if galloping_dynamic_threshold_enabled:
+                if galloped >= comparisons:
+                    galloping_threshold = max(1, galloping_threshold - 1)
+                else:
+                    galloping_threshold += 1
+
+    # Final copying (the rest of the first run is already in place, unless only a part of the runs is merged)
+    arr[k-j+lo:k+1] = right[lo:j+1]
+    if values is not None:
+        values[k-j+lo:k+1] = right_values[lo:j+1]
+    if l <= i < k:
+        arr[k-i+l:k+1] = arr[l:i+1]
+        if values is not None:
+            values[k-i+l:k+1] = values[l:i+1]
+    return galloping_threshold
+
+
+def co_rank(t: int, a: List[T] | np.ndarray, b: List[T] | np.ndarray, a_start: int = 0, a_end: int | None = None,
+            b_start: int = 0, b_end: int | None = None) -> int:
+    """
+    Finds how many elements of the first sequence are among the first t elements of the stable merge
+    of the two sorted sequences (elements of the first sequence go before the equal elements of the second one).
+    This is the merge path partitioning, which splits a merge into independent parts, using binary search.
+
+    :param t: Number of the first elements of the merged sequence
+    :param a: First sorted sequence
+    :param b: Second sorted sequence
+    :param a_start: (optional) Start index of the merged part of `a`; Default: 0
+    :param a_end: (optional) End index of the merged part of `a` (exclusive); Default: len(a)
+    :param b_start: (optional) Start index of the merged part of `b`; Default: 0
+    :param b_end: (optional) End index of the merged part of `b` (exclusive); Default: len(b)
+    :return: Number of elements of `a` among the first t elements of the merge; The rest (t - result) is from `b`
+    """
+
+    a_end = len(a) if a_end is None else a_end
+    b_end = len(b) if b_end is None else b_end
+    lo = max(0, t - (b_end - b_start))
+    hi = min(t, a_end - a_start)
+    while lo < hi:
+        i = (lo + hi) // 2
+        j = t - i
+        if a[a_start+i] <= b[b_start+j-1]:
+            # a[i] belongs before b[j-1], so more elements of `a` are needed
+            lo = i + 1
+        else:
+            hi = i
+    return lo
 
 
-def _gallop(run: List[T], start: int, val: T, incl_eq: bool) -> Tuple[int, int]:
+def _sym_merge(arr: List[T], a: int, m: int, b: int, values: List | None, buffer: MergeBuffer, kernel: Kernel,
+               max_scratch: int) -> None:
+    """
+    Merges two adjacent runs [a, m) and [m, b) using at most `max_scratch` elements of extra memory
+    (SymMerge by Kim & Kutzner, 2004, as in Go's sort.Stable, with the buffered merge as the base case).
+
+    The split point is found by binary search, so that the elements of the first run after it belong after
+    the elements of the second run before its mirror position around the middle of the whole range; These two
+    blocks are swapped by a rotation (see `_rotate`), and both halves are merged recursively.
+    Once the shorter of the two runs fits into the buffer, they are merged by `_merge_lo` or `_merge_hi`,
+    without galloping (which would copy slices of the longer run). The merge stays stable; It takes
+    O(n log(n / max_scratch)) moves and O(n + m log(n / m)) comparisons, where m is the length of the shorter run.
+
+    :param arr: Input sequence
+    :param a: Starting index of the first run (inclusive)
+    :param m: Ending index of the first run (exclusive), starting index of the second run (inclusive)
+    :param b: Ending index of the second run (exclusive)
+    :param values: (optional) Sequence permuted alongside `arr`
+    :param buffer: Scratch buffer; Never filled with more than `max_scratch` elements
+    :param kernel: Kernel of the primitive operations
+    :param max_scratch: Maximal number of elements of the scratch buffer
+    :return: None
+    """
+
+    if a == m or m == b:
+        return
+    if m - a <= max_scratch:
+        _merge_lo(arr, a, m - 1, b - 1, False, False, values, buffer, kernel, INITIAL_GALLOPING_THRESHOLD)
+        return
+    if b - m <= max_scratch:
+        _merge_hi(arr, a, m - 1, b - 1, False, False, values, buffer, kernel, INITIAL_GALLOPING_THRESHOLD)
+        return
+    mid = (a + b) // 2
+    n = mid + m
+    if m > mid:
+        start = n - b
+        r = mid
+    else:
+        start = a
+        r = m
+    p = n - 1
+    while start < r:
+        c = (start + r) // 2
+        if arr[p - c] < arr[c]:
+            r = c
+        else:
+            start = c + 1
+    end = n - start
+    if start < m < end:
+        _rotate(arr, start, m, end, values, max(1, max_scratch))
+    if a < start < mid:
+        _sym_merge(arr, a, start, mid, values, buffer, kernel, max_scratch)
+    if mid < end < b:
+        _sym_merge(arr, mid, end, b, values, buffer, kernel, max_scratch)
+
+
+def _rotate(arr: List[T], start: int, m: int, end: int, values: List | None, chunk: int) -> None:
+    """
+    Swaps the adjacent blocks [start, m) and [m, end) in-place, by reversing both of them and then the whole range.
+    Each reversal swaps chunks of at most `chunk` elements from both ends, so that no slice longer than 2*chunk
+    is ever copied (unlike `_reverse`).
+    """
+
+    for seq in (arr, values):
+        if seq is not None:
+            for lo, hi in ((start, m), (m, end), (start, end)):
+                while hi - lo >= 2 * chunk:
+                    head = seq[lo:lo+chunk]
+                    tail = seq[hi-chunk:hi]
+                    head.reverse()
+                    tail.reverse()
+                    seq[lo:lo+chunk] = tail
+                    seq[hi-chunk:hi] = head
+                    lo += chunk
+                    hi -= chunk
+                seq[lo:hi] = seq[lo:hi][::-1]
+
+
+def _gallop(run: List[T], start: int, val: T, incl_eq: bool, end: int | None = None) -> Tuple[int, int]:
     """
     Enters galloping mode and finds the correct position for a given element, using two-step search.
     First, exponential search is used to find the correct interval of size 2^x. Next, binary search
@@ -235,10 +784,11 @@ def _gallop(run: List[T], start: int, val: T, incl_eq: bool) -> Tuple[int, int]:
     :param val: Value to find the correct position for in the run
     :param incl_eq: Whether elements equal to `val` should be also galloped over or not. If true,
         then `val` will be placed to the right of these elements. If false, then to the left.
+    :param end: (optional) Index on which the run ends (exclusive); Default: the end of `run`
     :return: The correct position index for `val`, along with the number of performed comparisons
     """
     l = start
-    r = len(run)
+    r = len(run) if end is None else end
     if l == r:
         return l, 0
     if (incl_eq and run[l] > val) or (not incl_eq and run[l] >= val):
@@ -263,3 +813,378 @@ def _gallop(run: List[T], start: int, val: T, incl_eq: bool) -> Tuple[int, int]:
         else:
             r = mid
     return r, comparisons
+
+
+def _gallop_reversed(run: List[T], start: int, end: int, val: T, incl_eq: bool) -> Tuple[int, int]:
+    """
+    Mirrored version of `_gallop`, galloping from the end of the run towards its start.
+    Finds the position in the run, from which all elements should be placed to the right of `val`.
+
+    :param run: Run to gallop in
+    :param start: Starting index in the run to gallop in
+    :param end: Ending index in the run to gallop in (inclusive); The galloping starts here
+    :param val: Value to find the correct position for in the run
+    :param incl_eq: Whether elements equal to `val` should be also galloped over or not. If true,
+        then `val` will be placed to the left of these elements. If false, then to the right.
+    :return: Index of the first element to be placed to the right of `val`,
+        along with the number of performed comparisons
+    """
+    if end < start:
+        return start, 0
+    if (incl_eq and run[end] < val) or (not incl_eq and run[end] <= val):
+        return end+1, 1
+
+    comparisons = 1
+    # Exponential search
+    size = 1
+    while end-size >= start and ((incl_eq and run[end-size] >= val) or (not incl_eq and run[end-size] > val)):
+        size *= 2
+        comparisons += 1
+    comparisons += 1
+    l = max(end-size+1, start)
+    r = end - size//2
+
+    # Binary search
+    while l < r:
+        mid = (l+r) // 2
+        comparisons += 1
+        if (incl_eq and run[mid] >= val) or (not incl_eq and run[mid] > val):
+            r = mid
+        else:
+            l = mid + 1
+    return l, comparisons
+
+
+def multiway_merge(arr: List[T], runs: List[Run], galloping_enabled: bool = False,
+                   galloping_dynamic_threshold_enabled: bool = False, values: List | None = None,
+                   buffer: MergeBuffer | None = None, kernel: Kernel | None = None,
+                   galloping_threshold: int = INITIAL_GALLOPING_THRESHOLD) -> Run:
+    """
+    Merges several (typically up to 4) adjacent runs of the input sequence in-place at once,
+    using a tournament tree (loser tree) to pick the smallest of the heads of the runs.
+    Ties are resolved in favour of the run that comes first in the array (stability).
+
+    All runs except for the last one are copied into the scratch buffer, the last one is merged in-place.
+    Two runs are merged using the binary `merge`.
+
+    Galloping works the same way as in `merge`: once a run wins `galloping_threshold` times in a row, its elements
+    not greater than the head of the best of the other runs (the runner-up) are found by galloping
+    and moved at once.
+
+    :param arr: Input sequence
+    :param runs: Adjacent runs to merge (ordered from left to right)
+    :param galloping_enabled: (optional) Whether entering the galloping mode is enabled or not; Default: false
+    :param galloping_dynamic_threshold_enabled: (optional) Whether dynamic tuning of the galloping threshold
+        is enabled or not; See `merge`. Default: false
+    :param values: (optional) Sequence permuted alongside `arr`; Only `arr` is compared
+    :param buffer: (optional) Scratch buffer to reuse; If not specified, a new one is allocated.
+    :param kernel: (optional) Kernel of the primitive operations (see `Kernel`); Default: the reference kernel
+    :param galloping_threshold: (optional) Initial threshold to trigger the galloping mode;
+        Default: INITIAL_GALLOPING_THRESHOLD
+    :return: New merged run: [first run start, last run end]
+    """
+
+    if kernel is None:
+        kernel = REFERENCE_KERNEL
+    k = len(runs)
+    if k == 1:
+        return runs[0]
+    l = runs[0].start
+    r = runs[-1].end
+    if k == 2:
+        return merge(arr, l, runs[0].end, r, galloping_enabled, galloping_dynamic_threshold_enabled, values, buffer,
+                     kernel=kernel, galloping_threshold=galloping_threshold)
+    if buffer is None:
+        buffer = MergeBuffer()
+
+    last = k - 1
+    buffer.fill(arr, l, runs[last].start - 1, values)
+    sources = [buffer.keys] * last + [arr]  # where the elements of each run are read from
+    value_sources = [buffer.values] * last + [values]
+    heads = [run.start - l for run in runs[:last]] + [runs[last].start]  # index of the head of each run
+    ends = [run.end - l + 1 for run in runs[:last]] + [runs[last].end + 1]  # end of each run (exclusive)
+
+    def beats(i: int, j: int) -> bool:
+        # Whether the head of the run i should be placed before the head of the run j
+        if heads[j] >= ends[j]:
+            return True
+        if heads[i] >= ends[i]:
+            return False
+        if i < j:
+            return sources[i][heads[i]] <= sources[j][heads[j]]
+        return sources[i][heads[i]] < sources[j][heads[j]]
+
+    # Loser tree: leaves (runs) are on positions k..2k-1, tree[pos] is the loser of the match in the node pos
+    tree = [0] * k
+
+    def play(pos: int) -> int:
+        if pos >= k:
+            return pos - k
+        a = play(2*pos)
+        b = play(2*pos + 1)
+        if beats(a, b):
+            tree[pos] = b
+            return a
+        tree[pos] = a
+        return b
+
+    winner = play(1)
+    win_count = 0  # how many times consecutively was the element picked from the same run (winning run)
+    last_winner = -1
+
+    out = l  # index in the original array
+    while out <= r:
+        src = sources[winner]
+        h = heads[winner]
+        arr[out] = src[h]
+        if values is not None:
+            values[out] = value_sources[winner][h]
+        heads[winner] = h + 1
+        out += 1
+        if winner == last_winner:
+            win_count += 1
+        else:
+            win_count = 1
+            last_winner = winner
+
+        # Trigger galloping mode? (Not if the winning run is already exhausted)
+        if galloping_enabled and win_count >= galloping_threshold and heads[winner] < ends[winner]:
+            runner_up = -1
+            for i in range(k):
+                if i != winner and heads[i] < ends[i] and (runner_up == -1 or beats(i, runner_up)):
+                    runner_up = i
+            if runner_up != -1:
+                h = heads[winner]
+                idx, comparisons = kernel.gallop(src, h, sources[runner_up][heads[runner_up]], winner < runner_up,
+                                                 ends[winner])
+                galloped = idx - h
+                arr[out:out+galloped] = src[h:idx]
+                if values is not None:
+                    values[out:out+galloped] = value_sources[winner][h:idx]
+                heads[winner] = idx
+                out += galloped
+
+                # Adaptive tuning of the galloping threshold (based on the number of galloped items)
+                if galloping_dynamic_threshold_enabled:
+                    if galloped >= comparisons:
+                        galloping_threshold = max(1, galloping_threshold - 1)
+                    else:
+                        galloping_threshold += 1
+            win_count = 0
+
+        # Replay the matches on the path from the winner's leaf to the root
+        pos = (winner + k) // 2
+        while pos >= 1:
+            if beats(tree[pos], winner):
+                tree[pos], winner = winner, tree[pos]
+            pos //= 2
+    return Run(l, r)
+
+
+class Plateau:
+    """
+    Maximal group of adjacent elements with equal keys, treated as a single unit by the duplicate-heavy mode
+    (see `find_next_plateau_run`, `merge_plateaus`). The elements are not moved during the merges, a plateau only
+    keeps the segments of the input it consists of, in their stable order; They are moved once, at the end of the sort.
+    """
+
+    __slots__ = ('key', 'segments')
+
+    def __init__(self, key: Any, segments: List[Tuple[int, int]]) -> None:
+        self.key = key
+        self.segments = segments  # ranges [lo, hi) of the input
+
+
+def find_next_plateau_run(arr: List[T], start: int) -> Tuple[Run, List[Plateau]]:
+    """
+    Finds the run (ascending or descending) starting on the specified index, consisting of plateaus
+    (see `Plateau`) instead of single elements. Adjacent elements are first compared for equality, so that
+    a plateau of m equal elements costs m-1 comparisons; Only the boundaries of the plateaus need another
+    comparison to find the direction of the run.
+
+    Unlike in `find_next_run`, equal elements do not end a descending run: the plateaus of a descending run
+    have distinct keys, so reversing their order (but not the order within them) keeps the sort stable.
+    The input is not modified.
+
+    :param arr: Input sequence
+    :param start: Index on which the run begins
+    :return: Representation of the found run, along with its plateaus in ascending order
+    """
+
+    n = len(arr)
+    plateaus = []
+    direction = 0  # 1 for an ascending run, -1 for a descending run, 0 if not known yet
+    i = start
+    while True:
+        j = i + 1
+        while j < n and arr[j] == arr[i]:
+            j += 1
+        plateaus.append(Plateau(arr[i], [(i, j)]))
+        if j == n:
+            break
+        step = 1 if arr[i] < arr[j] else -1
+        if direction and step != direction:
+            break
+        direction = step
+        i = j
+    if direction == -1:
+        plateaus.reverse()
+    return Run(start, j - 1), plateaus
+
+
+def merge_plateaus(a: List[Plateau], b: List[Plateau]) -> List[Plateau]:
+    """
+    Merges two adjacent runs of plateaus (see `find_next_plateau_run`), the first one coming first in the input.
+    The plateaus of each run are found by galloping (see `_gallop_plateaus`), each gallop is followed
+    by a single comparison, which completes a three-way comparison with the head of the other run: if the keys
+    are equal, the two plateaus are joined into one (the segments of the first run first, to keep the sort stable),
+    without comparing their elements. Runs of few unique keys are thus merged in a few comparisons, regardless
+    of their lengths.
+
+    :param a: Plateaus of the first run
+    :param b: Plateaus of the second run
+    :return: Plateaus of the merged run
+    """
+
+    merged = []
+    i = j = 0
+    while i < len(a) and j < len(b):
+        # Plateaus of the first run with keys less than the head of the second run
+        idx = _gallop_plateaus(a, i, b[j].key)
+        merged.extend(a[i:idx])
+        i = idx
+        if i == len(a):
+            break
+        if not b[j].key < a[i].key:
+            merged.append(Plateau(a[i].key, a[i].segments + b[j].segments))
+            i += 1
+            j += 1
+            continue
+        # Plateaus of the second run with keys less than the head of the first run
+        idx = _gallop_plateaus(b, j, a[i].key)
+        merged.extend(b[j:idx])
+        j = idx
+        if j == len(b):
+            break
+        if not a[i].key < b[j].key:
+            merged.append(Plateau(a[i].key, a[i].segments + b[j].segments))
+            i += 1
+            j += 1
+    merged.extend(a[i:])
+    merged.extend(b[j:])
+    return merged
+
+
+def _gallop_plateaus(plateaus: List[Plateau], start: int, key: Any) -> int:
+    """
+    Finds the first plateau (from `start` on) with a key not less than the given key, using two-step search
+    (see `_gallop`).
+
+    :param plateaus: Plateaus of a run
+    :param start: Starting index to gallop from
+    :param key: Key to find the position for
+    :return: Index of the first plateau with a key not less than `key`
+    """
+
+    n = len(plateaus)
+    if start == n or not plateaus[start].key < key:
+        return start
+    # Exponential search
+    last_less = start
+    size = 1
+    while start + size < n and plateaus[start+size].key < key:
+        last_less = start + size
+        size *= 2
+    # Binary search
+    l = last_less + 1
+    r = min(start + size, n)
+    while l < r:
+        mid = (l+r) // 2
+        if plateaus[mid].key < key:
+            l = mid + 1
+        else:
+            r = mid
+    return l
+
+
+def _fast_binary_search(arr: List[T], val: T, start: int, end: int) -> int:
+    """
+    Same as `binary_search`, using the C implementation of `bisect`.
+    """
+
+    return bisect_right(arr, val, start, end)
+
+
+def _fast_binary_insertion_sort(arr: List[T], left: int, right: int, m: int, values: List | None = None) -> None:
+    """
+    Same as `binary_insertion_sort`, using the C implementation of `bisect`.
+    """
+
+    for i in range(m+1, right+1):
+        val = arr[i]
+        j = bisect_right(arr, val, left, i)
+        arr[j+1:i+1] = arr[j:i]
+        arr[j] = val
+        if values is not None:
+            v = values[i]
+            values[j+1:i+1] = values[j:i]
+            values[j] = v
+
+
+def _fast_gallop(run: List[T], start: int, val: T, incl_eq: bool, end: int | None = None) -> Tuple[int, int]:
+    """
+    Same as `_gallop`, using a binary search by the C implementation of `bisect` instead of the galloping.
+    The returned number of comparisons is the one the galloping would perform (approximately), so that the dynamic
+    tuning of the galloping threshold behaves the same way.
+    """
+
+    if end is None:
+        end = len(run)
+    if incl_eq:
+        idx = bisect_right(run, val, start, end)
+    else:
+        idx = bisect_left(run, val, start, end)
+    return idx, _galloping_comparisons(idx - start, end - start)
+
+
+def _fast_gallop_reversed(run: List[T], start: int, end: int, val: T, incl_eq: bool) -> Tuple[int, int]:
+    """
+    Same as `_gallop_reversed`, using a binary search by the C implementation of `bisect`; See `_fast_gallop`.
+    """
+
+    if incl_eq:
+        idx = bisect_left(run, val, start, end+1)
+    else:
+        idx = bisect_right(run, val, start, end+1)
+    return idx, _galloping_comparisons(end + 1 - idx, end + 1 - start)
+
+
+def _galloping_comparisons(galloped: int, size: int) -> int:
+    """
+    Approximates the number of comparisons of the galloping over `galloped` elements of a run of length `size`:
+    about log2(galloped) in the exponential search and log2(galloped) in the binary search.
+    """
+
+    if not size:
+        return 0
+    return 2 * galloped.bit_length() + 1
+
+
+# The reversal is a slice operation (implemented in C) in both kernels
+REFERENCE_KERNEL = Kernel('reference', binary_search, binary_insertion_sort, _gallop, _gallop_reversed, _reverse)
+FAST_KERNEL = Kernel('fast', _fast_binary_search, _fast_binary_insertion_sort, _fast_gallop, _fast_gallop_reversed,
+                     _reverse)
+KERNELS = {kernel.name: kernel for kernel in (REFERENCE_KERNEL, FAST_KERNEL)}
+
+
+def get_kernel(name: str) -> Kernel:
+    """
+    Returns the kernel of the primitive operations with the given name (see `Kernel`).
+
+    :param name: Name of the kernel ('reference' or 'fast')
+    :return: The kernel
+    """
+
+    if name not in KERNELS:
+        raise ValueError(f"Unknown kernel: '{name}'; Available kernels: {', '.join(KERNELS)}")
+    return KERNELS[name]
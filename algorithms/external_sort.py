@@ -0,0 +1,182 @@
+import heapq
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from itertools import count, islice
+from typing import List, Callable, Any, Iterator, Iterable, Tuple
+
+from algorithms.commons import iter_runs
+from algorithms.powersort import powersort
+from config import EXTERNAL_SORT_MEMORY_BUDGET
+
+# Estimated memory (in bytes) taken by a record held in memory, on top of its own size
+# (the bytes object header, the slots in the lists of records and keys, the key object itself)
+RECORD_OVERHEAD = 128
+
+# Minimal size (in bytes) of the I/O buffer of a single file in the merging phase;
+# The number of run files merged at once is limited, so that each of them gets at least this buffer.
+MIN_IO_BUFFER_SIZE = 64 * 2**10
+
+
+def external_sort(input_path: str, output_path: str, record_size: int, key: Callable[[bytes], Any] | None = None,
+                  memory_budget: int = EXTERNAL_SORT_MEMORY_BUDGET, tmp_dir: str | None = None,
+                  min_run_length: int | None = None, galloping_enabled: bool = False,
+                  galloping_dynamic_threshold_enabled: bool = False) -> None:
+    """
+    Sorts a binary file of fixed-width records, which does not need to fit in memory (external-memory sort).
+
+    1. Run generation: The input file is memory-mapped (`mmap`) and processed in chunks that fit in the memory budget.
+       Chunks that are already sorted (a single natural run, see `iter_runs`) are passed through without sorting,
+       other chunks are sorted using Powersort. A sorted chunk is appended to the previous run file if it continues
+       its last record (e.g., on presorted inputs), otherwise it is spilled to disk as a new run file.
+    2. Merging: The run files are merged by a streaming k-way merge into the output file, using large buffered
+       reads and writes. If there are too many run files to give each of them a reasonable buffer
+       (see `MIN_IO_BUFFER_SIZE`), they are first merged in several passes.
+
+    The sort is stable, records with equal keys keep their original order.
+
+    :param input_path: Path to the input file; Its size must be a multiple of `record_size`
+    :param output_path: Path to the output file (may be the same as `input_path`)
+    :param record_size: Size of a single record in bytes
+    :param key: (optional) Function extracting the comparison key from a record (bytes), e.g., `struct_key`;
+        Default: records are compared as bytes (lexicographically)
+    :param memory_budget: (optional) Approximate amount of memory (in bytes) to use for the chunks and the buffers
+    :param tmp_dir: (optional) Directory for the temporary run files; Default: system temporary directory
+    :param min_run_length: (optional) Minimal length of runs to enforce when sorting the chunks (see `powersort`)
+    :param galloping_enabled: (optional) Whether entering the galloping mode is enabled when sorting the chunks
+    :param galloping_dynamic_threshold_enabled: (optional) Whether dynamic tuning of the galloping threshold
+        is enabled when sorting the chunks (see `powersort`)
+    """
+
+    chunk_length = max(1, memory_budget // (record_size + RECORD_OVERHEAD))
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as tmp:
+        names = (os.path.join(tmp, f'run{i}') for i in count())
+        paths = _generate_runs(input_path, record_size, key, chunk_length, names, min_run_length,
+                               galloping_enabled, galloping_dynamic_threshold_enabled)
+        fan_in = max(2, memory_budget // MIN_IO_BUFFER_SIZE - 1)
+        while len(paths) > fan_in:
+            merged = []
+            for i in range(0, len(paths), fan_in):
+                group = paths[i:i+fan_in]
+                if len(group) > 1:
+                    merged.append(next(names))
+                    _merge_files(group, merged[-1], record_size, key, memory_budget)
+                    for path in group:
+                        os.remove(path)
+                else:
+                    merged.append(group[0])
+            paths = merged
+        if len(paths) == 1:
+            shutil.move(paths[0], output_path)
+        else:
+            # Also creates an empty output for an empty input
+            _merge_files(paths, output_path, record_size, key, memory_budget)
+
+
+def struct_key(fmt: str, offset: int = 0) -> Callable[[bytes], Any]:
+    """
+    Creates a key function for `external_sort`, extracting the field(s) of the given struct format from a record.
+
+    :param fmt: Format of the key field(s) (see `struct`), e.g., '<q' for a little-endian 64-bit integer
+    :param offset: (optional) Offset of the key field(s) in the record (in bytes)
+    :return: Key function returning the field (or a tuple of the fields, if there are more of them)
+    """
+
+    s = struct.Struct(fmt)
+    if len(s.unpack(bytes(s.size))) == 1:
+        return lambda record: s.unpack_from(record, offset)[0]
+    return lambda record: s.unpack_from(record, offset)
+
+
+def _generate_runs(input_path: str, record_size: int, key: Callable[[bytes], Any] | None, chunk_length: int,
+                   names: Iterator[str], min_run_length: int | None, galloping_enabled: bool,
+                   galloping_dynamic_threshold_enabled: bool) -> List[str]:
+    """
+    First phase of the external sort: splits the input file into sorted run files.
+
+    :return: Paths to the run files, in the order of the input
+    """
+
+    paths = []
+    with open(input_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size % record_size:
+            raise ValueError(f"File size ({size}) is not a multiple of the record size ({record_size})")
+        if not size:
+            return paths
+        step = chunk_length * record_size
+        run_file = None
+        last_key = None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            try:
+                for start in range(0, size, step):
+                    chunk = mm[start:start+step]
+                    records = [chunk[i:i+record_size] for i in range(0, len(chunk), record_size)]
+                    records, keys = _sort_chunk(records, key, min_run_length, galloping_enabled,
+                                                galloping_dynamic_threshold_enabled)
+                    if run_file is None or keys[0] < last_key:
+                        if run_file is not None:
+                            run_file.close()
+                        paths.append(next(names))
+                        run_file = open(paths[-1], 'wb')
+                    run_file.write(b''.join(records))
+                    last_key = keys[-1]
+            finally:
+                if run_file is not None:
+                    run_file.close()
+    return paths
+
+
+def _sort_chunk(records: List[bytes], key: Callable[[bytes], Any] | None, min_run_length: int | None,
+                galloping_enabled: bool, galloping_dynamic_threshold_enabled: bool) -> Tuple[List[bytes], List]:
+    """
+    Sorts the records of a chunk, unless they are already sorted.
+
+    :return: Sorted records and their keys
+    """
+
+    keys = records if key is None else [key(record) for record in records]
+    # A single natural run (a strictly descending one is reversed in-place by the run detection) is already sorted
+    if next(iter_runs(keys, values=None if key is None else records)).end == len(keys) - 1:
+        return records, keys
+    order = powersort(list(range(len(keys))), min_run_length, galloping_enabled, galloping_dynamic_threshold_enabled,
+                      key=keys.__getitem__)
+    return [records[i] for i in order], [keys[i] for i in order]
+
+
+def _merge_files(paths: List[str], output_path: str, record_size: int, key: Callable[[bytes], Any] | None,
+                 memory_budget: int) -> None:
+    """
+    Merges the sorted run files into the output file using a streaming k-way merge.
+    The memory budget is split equally between the buffers of the input files and the output file.
+    """
+
+    buffer_size = max(record_size, memory_budget // (len(paths) + 1) // record_size * record_size)
+    streams = [_read_records(path, record_size, buffer_size) for path in paths]
+    # heapq.merge is stable: equal records are taken from the earlier run first
+    merged = heapq.merge(*streams, key=key)
+    with open(output_path, 'wb', buffering=buffer_size) as out:
+        for batch in _batches(merged, buffer_size // record_size):
+            out.write(b''.join(batch))
+
+
+def _read_records(path: str, record_size: int, buffer_size: int) -> Iterator[bytes]:
+    """
+    Reads the records of the file in blocks of `buffer_size` bytes.
+    """
+
+    with open(path, 'rb', buffering=buffer_size) as f:
+        while block := f.read(buffer_size):
+            yield from (block[i:i+record_size] for i in range(0, len(block), record_size))
+
+
+def _batches(items: Iterable[bytes], batch_length: int) -> Iterator[List[bytes]]:
+    """
+    Splits the stream into lists of (at most) `batch_length` items.
+    """
+
+    it = iter(items)
+    while batch := list(islice(it, batch_length)):
+        yield batch
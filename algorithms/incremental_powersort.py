@@ -0,0 +1,165 @@
+from collections.abc import Sequence
+from typing import List, TypeVar, Callable, Any, Iterable, Iterator
+
+from algorithms.commons import merge, find_next_run, MergeBuffer, Run
+from algorithms.powersort import node_power
+
+# Generic type of elements in the input list
+T = TypeVar('T')
+
+
+class IncrementalPowersort:
+    """
+    Online version of Powersort (powersort.py), sorting a sequence that grows by appends.
+
+    The run stack of Powersort (runs `X` and their node powers `P`) is kept between the calls. `extend()` finds
+    the runs only in the new elements and merges them in according to their node powers, exactly as Powersort would,
+    while `sorted_view()` finishes the remaining merges of the stack lazily, only when the sorted output is needed.
+    This way, sorting the sequence again after a small append costs about the size of the append,
+    instead of the size of the whole sequence.
+
+    The node powers are computed relative to a virtual length (a power of two not smaller than the length
+    of the sequence). When the sequence outgrows it, the virtual length is doubled, which increases all the powers
+    on the stack by exactly one, so that they remain comparable with the newly computed ones.
+
+    Galloping and trimming are enabled by default, as they make merging a long run with a short one cheap.
+    """
+
+    def __init__(self, items: Iterable[T] = (), min_run_length: int | None = None, galloping_enabled: bool = True,
+                 galloping_dynamic_threshold_enabled: bool = False, trimming_enabled: bool = True,
+                 key: Callable[[T], Any] | None = None):
+        """
+        :param items: (optional) Initial elements
+        :param min_run_length: (optional) Minimal length of runs to enforce (see `powersort`)
+        :param galloping_enabled: (optional) Whether entering the galloping mode is enabled or not; Default: true
+        :param galloping_dynamic_threshold_enabled: (optional) Whether dynamic tuning of the galloping threshold
+            is enabled or not (see `powersort`); Default: false
+        :param trimming_enabled: (optional) Whether the runs are trimmed using galloping before each merge
+            (see `merge`); Default: true
+        :param key: (optional) Function extracting the comparison key from an element, called once per element
+        """
+
+        self.min_run_length = min_run_length
+        self.galloping_enabled = galloping_enabled
+        self.galloping_dynamic_threshold_enabled = galloping_dynamic_threshold_enabled
+        self.trimming_enabled = trimming_enabled
+        self.key = key
+        self._keys = []
+        self._values = None if key is None else []
+        self._buffer = MergeBuffer()
+        # Virtual length of the sequence, used to compute the node powers
+        self._virtual_length = 1
+        self._X = []
+        self._P = []
+        # The last (rightmost) run, not pushed on the stack yet, as its power is determined by the next run
+        self._last = None
+        self.extend(items)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def append(self, item: T) -> None:
+        """
+        Adds a single element; See `extend`.
+
+        :param item: Element to add
+        """
+
+        self.extend((item,))
+
+    def extend(self, items: Iterable[T]) -> None:
+        """
+        Adds the elements, finds the runs among them and merges them into the run stack, according to their
+        node powers. The merges still pending on the stack are postponed until `sorted_view` is called.
+
+        :param items: Elements to add
+        """
+
+        start = len(self._keys)
+        if self.key is None:
+            self._keys.extend(items)
+        else:
+            items = list(items)
+            self._values.extend(items)
+            self._keys.extend(self.key(x) for x in items)
+        n = len(self._keys)
+        if n == start:
+            return
+        while self._virtual_length < n:
+            self._virtual_length *= 2
+            self._P = [p + 1 for p in self._P]
+
+        arr = self._keys
+        r1 = self._last
+        if r1 is None:
+            r1 = find_next_run(arr, 0, self.min_run_length, self._values)
+        elif self.min_run_length and r1.end - r1.start + 1 < self.min_run_length:
+            # The last run was cut short by the end of the sequence, so it is found again, along with the new elements
+            r1 = find_next_run(arr, r1.start, self.min_run_length, self._values)
+        else:
+            r2 = find_next_run(arr, start, self.min_run_length, self._values)
+            if arr[start] < arr[start-1]:
+                r1 = self._push(r1, r2)
+            else:
+                # The new elements continue the last run
+                r1 = Run(r1.start, r2.end)
+        while r1.end < n - 1:
+            r1 = self._push(r1, find_next_run(arr, r1.end + 1, self.min_run_length, self._values))
+        self._last = r1
+
+    def sorted_view(self) -> Sequence:
+        """
+        Finishes the pending merges of the run stack and returns the sorted elements.
+
+        :return: Read-only view of the sorted elements (valid until the next `extend`)
+        """
+
+        r1 = self._last
+        while self._X:
+            self._P.pop()
+            r0 = self._X.pop()
+            r1 = self._merge(r0, r1)
+        self._last = r1
+        return SortedView(self._keys if self.key is None else self._values)
+
+    def _push(self, r1: Run, r2: Run) -> Run:
+        """
+        Single step of the merging loop of Powersort: merges the runs on the stack with higher power
+        than the boundary of the runs `r1` and `r2`, then pushes `r1` (along with the power) on the stack.
+
+        :return: The next run, `r2`
+        """
+
+        p = node_power(r1, r2, self._virtual_length)
+        while self._P and self._P[-1] > p:
+            self._P.pop()
+            r0 = self._X.pop()
+            r1 = self._merge(r0, r1)
+        self._X.append(r1)
+        self._P.append(p)
+        return r2
+
+    def _merge(self, r0: Run, r1: Run) -> Run:
+        return merge(self._keys, r0.start, r0.end, r1.end, self.galloping_enabled,
+                     self.galloping_dynamic_threshold_enabled, self._values, self._buffer, self.trimming_enabled)
+
+
+class SortedView(Sequence):
+    """
+    Read-only view of a list.
+    """
+
+    def __init__(self, arr: List[T]):
+        self._arr = arr
+
+    def __len__(self) -> int:
+        return len(self._arr)
+
+    def __getitem__(self, index):
+        return self._arr[index]
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._arr)
+
+    def __repr__(self) -> str:
+        return f"SortedView({self._arr!r})"
@@ -0,0 +1,286 @@
+import os
+import sys
+from functools import wraps
+from typing import List, TypeVar, Callable, Any, Tuple, Dict
+
+from algorithms import commons
+from algorithms.commons import MergeBuffer, REFERENCE_KERNEL, FAST_KERNEL
+
+# Generic type of elements in the input list
+T = TypeVar('T')
+
+
+class Counters:
+    """
+    Counts of the operations performed by a sort, collected by the instrumentation hooks (see `instrumented`).
+    """
+
+    __slots__ = ('comparisons', 'character_comparisons', 'moves', 'merges', 'gallops', 'insertion_steps')
+
+    def __init__(self) -> None:
+        self.comparisons = 0  # comparisons of two keys
+        self.character_comparisons = 0  # comparisons of two characters (only counted by the LCP-aware merges)
+        self.moves = 0  # writes of an element into the sorted list, or copies of an element into the merge buffer
+        self.merges = 0  # merges of two (or more) runs
+        self.gallops = 0  # searches by galloping (including the trimming of the runs)
+        self.insertion_steps = 0  # elements inserted by binary insertion sort, extending the runs to MIN_RUN
+
+    def as_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+# Counters of the innermost active instrumentation (None if not active)
+_active: Counters | None = None
+
+
+class CountingKey:
+    """
+    Wrapper of a key counting its comparisons into the active counters (see `instrumented`).
+    """
+
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __lt__(self, other: 'CountingKey') -> bool:
+        _active.comparisons += 1
+        return self.value < other.value
+
+    def __le__(self, other: 'CountingKey') -> bool:
+        _active.comparisons += 1
+        return self.value <= other.value
+
+    def __gt__(self, other: 'CountingKey') -> bool:
+        _active.comparisons += 1
+        return self.value > other.value
+
+    def __ge__(self, other: 'CountingKey') -> bool:
+        _active.comparisons += 1
+        return self.value >= other.value
+
+    def __eq__(self, other: 'CountingKey') -> bool:
+        _active.comparisons += 1
+        return self.value == other.value
+
+    def __ne__(self, other: 'CountingKey') -> bool:
+        _active.comparisons += 1
+        return self.value != other.value
+
+
+class CharCountingKey(CountingKey):
+    """
+    Wrapper of a string key, which also counts the character comparisons into the active counters:
+    a comparison of two strings compares their characters one by one, up to the first differing one
+    (LCP + 1 characters, or LCP if one is a prefix of the other).
+    """
+
+    __slots__ = ()
+
+    def _count_characters(self, other: 'CharCountingKey') -> None:
+        lcp = len(os.path.commonprefix((self.value, other.value)))
+        _active.character_comparisons += lcp + (lcp < min(len(self.value), len(other.value)))
+
+    def __lt__(self, other: 'CharCountingKey') -> bool:
+        self._count_characters(other)
+        return super().__lt__(other)
+
+    def __le__(self, other: 'CharCountingKey') -> bool:
+        self._count_characters(other)
+        return super().__le__(other)
+
+    def __gt__(self, other: 'CharCountingKey') -> bool:
+        self._count_characters(other)
+        return super().__gt__(other)
+
+    def __ge__(self, other: 'CharCountingKey') -> bool:
+        self._count_characters(other)
+        return super().__ge__(other)
+
+    def __eq__(self, other: 'CharCountingKey') -> bool:
+        self._count_characters(other)
+        return super().__eq__(other)
+
+    def __ne__(self, other: 'CharCountingKey') -> bool:
+        self._count_characters(other)
+        return super().__ne__(other)
+
+
+class CountingList(list):
+    """
+    List counting the writes of its elements (one per element, including slice assignments)
+    into the active counters (see `instrumented`).
+    """
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        if isinstance(index, slice):
+            _active.moves += len(range(*index.indices(len(self))))
+        else:
+            _active.moves += 1
+        super().__setitem__(index, value)
+
+
+class instrumented:
+    """
+    Context manager collecting the counts of the operations performed by the sorts (see `Counters`)
+    while it is active, using the same implementation as in production (algorithms/*).
+
+    The hooks are installed only on entering the context, by rebinding the hooked functions (see `_hook_points`)
+    in all the imported modules of the algorithms package to their counting wrappers, and they are removed
+    on exiting it. Therefore, a disabled hook costs nothing: outside the context, the algorithms run exactly
+    the original functions. The comparisons and the element writes happen inline in the merge loops, so they
+    are counted by the elements themselves, which need to be wrapped in `CountingKey` (passed as the key,
+    or wrapping the elements) and stored in a `CountingList` (see `count_operations`).
+
+    Note that the instrumentation is process-wide, not per thread: the active counters are a module global,
+    and the hooks are rebound in the modules themselves. While the context is active, the sorts running
+    in other threads are counted as well (into the same counters), and the contexts must not be entered
+    concurrently from several threads, as they would restore the hooked functions in the wrong order.
+    """
+
+    def __init__(self) -> None:
+        self.counters = Counters()
+        self._outer = None
+        self._patches = []
+
+    def __enter__(self) -> Counters:
+        global _active
+        self._outer = _active
+        _active = self.counters
+        for owner, name, wrapper in _hook_points():
+            original = getattr(owner, name)
+            self._patches.extend(_rebind(owner, name, original, wrapper(original)))
+        return self.counters
+
+    def __exit__(self, *_: Any) -> None:
+        global _active
+        for owner, name, original in reversed(self._patches):
+            setattr(owner, name, original)
+        self._patches = []
+        _active = self._outer
+
+
+def count_operations(sort: Callable[..., Any], arr: List[T], counting_key: type = CountingKey,
+                     **kwargs: Any) -> Tuple[List[T], Counters]:
+    """
+    Sorts the input list by the given (production) sorting function, counting the performed operations.
+
+    Note that the wrapped elements are not numeric, so the vectorized run detection (see `iter_runs`) is never used
+    here: the runs of numeric inputs are found by element-by-element comparisons, which are counted, while
+    the uninstrumented sort of the same input finds them by NumPy (the run decomposition is the same).
+
+    :param sort: Sorting function (e.g., `powersort`), taking the list to sort as its first argument
+    :param arr: Input sequence to sort (not modified)
+    :param counting_key: (optional) Wrapper of the elements counting their comparisons, `CountingKey`
+        or `CharCountingKey`; Default: `CountingKey`
+    :param kwargs: Other arguments of the sorting function (without the key)
+    :return: Sorted sequence (or whatever the function returns, e.g., the first k elements of it),
+        along with the counts of the performed operations
+    """
+
+    wrapped = CountingList(counting_key(x) for x in arr)
+    with instrumented() as counters:
+        result = sort(wrapped, **kwargs)
+    return [x.value for x in result], counters
+
+
+def _count_merges(func: Callable) -> Callable:
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        _active.merges += 1
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def _count_multiway_merges(func: Callable) -> Callable:
+    @wraps(func)
+    def wrapper(arr: List, runs: List, *args: Any, **kwargs: Any) -> Any:
+        # A single run is not merged, and two runs are handed over to `merge`, which counts the merge itself
+        if len(runs) > 2:
+            _active.merges += 1
+        return func(arr, runs, *args, **kwargs)
+    return wrapper
+
+
+def _count_gallops(func: Callable) -> Callable:
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        _active.gallops += 1
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def _count_insertion_steps(func: Callable) -> Callable:
+    @wraps(func)
+    def wrapper(arr: List, left: int, right: int, m: int, values: List | None = None) -> None:
+        # The elements after the natural run (ending at m) are inserted one by one
+        _active.insertion_steps += right - m
+        return func(arr, left, right, m, values)
+    return wrapper
+
+
+def _count_buffer_moves(func: Callable) -> Callable:
+    @wraps(func)
+    def wrapper(self: MergeBuffer, arr: List, start: int, end: int, values: List | None = None,
+                offset: int = 0) -> None:
+        _active.moves += end - start + 1
+        return func(self, arr, start, end, values, offset)
+    return wrapper
+
+
+def _count_string_comparisons(func: Callable) -> Callable:
+    @wraps(func)
+    def wrapper(a: Any, b: Any, h: int) -> Tuple[bool, int]:
+        le, lcp = func(a, b, h)
+        _active.comparisons += 1
+        # Characters from the position h on, up to the first differing one (if any)
+        _active.character_comparisons += lcp - h + (lcp < min(len(a), len(b)))
+        return le, lcp
+    return wrapper
+
+
+def _hook_points() -> List[Tuple[Any, str, Callable[[Callable], Callable]]]:
+    """
+    Returns the hook surface: the hooked functions (owner object, attribute name), along with their counting wrappers.
+    """
+
+    hooks = [
+        (commons, 'merge', _count_merges),
+        (commons, 'multiway_merge', _count_multiway_merges),
+        (MergeBuffer, 'fill', _count_buffer_moves),
+        # Duplicate-heavy mode (see `merge_plateaus`)
+        (commons, 'merge_plateaus', _count_merges),
+        (commons, '_gallop_plateaus', _count_gallops),
+    ]
+    for kernel in (REFERENCE_KERNEL, FAST_KERNEL):
+        hooks += [
+            (kernel, 'gallop', _count_gallops),
+            (kernel, 'gallop_reversed', _count_gallops),
+            (kernel, 'binary_insertion_sort', _count_insertion_steps),
+        ]
+    string_sort = sys.modules.get('algorithms.string_sort')
+    if string_sort is not None:
+        hooks += [
+            (string_sort, '_lcp_merge', _count_merges),
+            (string_sort, '_le', _count_string_comparisons),
+        ]
+    return hooks
+
+
+def _rebind(owner: Any, name: str, original: Callable, replacement: Callable) -> List[Tuple[Any, str, Callable]]:
+    """
+    Replaces the function on its owner, and in all the imported modules of the algorithms package
+    which imported it by name (e.g., `from algorithms.commons import merge`).
+
+    :return: The replaced bindings (owner, name, original), to restore them later
+    """
+
+    patches = [(owner, name, original)]
+    setattr(owner, name, replacement)
+    for module_name, module in list(sys.modules.items()):
+        if module_name.startswith('algorithms.') and module is not owner:
+            for attribute, value in list(vars(module).items()):
+                if value is original:
+                    patches.append((module, attribute, original))
+                    setattr(module, attribute, replacement)
+    return patches
@@ -0,0 +1,183 @@
+from typing import List, TypeVar, Callable, Any, Iterable, Iterator
+
+from algorithms.commons import merge, MergeBuffer, Run
+from algorithms.powersort import node_power
+
+# Generic type of elements in the input list
+T = TypeVar('T')
+
+
+class _Shard:
+    """
+    Sorted shard (or the result of merging several adjacent shards) in the merge order of `merge_sorted`.
+    """
+
+    __slots__ = ('keys', 'values', 'run', 'owned')
+
+    def __init__(self, keys: List, values: List | None, run: Run, owned: bool) -> None:
+        self.keys = keys
+        self.values = values  # elements belonging to the keys (if a key function is used)
+        self.run = run  # position of the shard in the merged output
+        self.owned = owned  # whether the lists were created by the merge (otherwise they belong to the caller)
+
+
+def merge_sorted(shards: Iterable[Iterable[T]], key: Callable[[T], Any] | None = None, reverse: bool = False,
+                 galloping_enabled: bool = True, trimming_enabled: bool = True) -> List[T]:
+    """
+    Merges the sorted shards into a single sorted list, stably (elements with equal keys are taken from the earlier
+    shard first), without concatenating them and finding their runs again first.
+
+    The shards are merged pairwise in the merge order of Powersort (see `powersort`), the shards being its runs:
+    the node power of the boundary between two adjacent shards is computed from their lengths (see `node_power`),
+    so that short shards are merged together first and long shards are merged late. This is a nearly-optimal
+    alphabetic merge tree, the number of comparisons is at most N * (H + 2), where H is the entropy
+    of the shard lengths (same as the entropy-optimal Huffman order, which merges non-adjacent shards,
+    and therefore cannot keep the order of equal elements from different shards).
+    Each pair is merged using `merge` (with galloping and trimming enabled by default, so that shards
+    with disjoint or rarely interleaving ranges are merged in much fewer comparisons).
+
+    The shards are not modified, a shard is copied only when it is first merged, into the list it is merged into;
+    The merged lists are then extended in-place.
+
+    :param shards: Sorted sequences (lists, or other iterables, which are materialized one by one)
+    :param key: (optional) Function extracting the comparison key from an element, called once per element
+    :param reverse: (optional) Whether the shards are sorted in decreasing order (the output is decreasing as well);
+        Default: false
+    :param galloping_enabled: (optional) Whether entering the galloping mode is enabled or not; Default: true
+    :param trimming_enabled: (optional) Whether the shards are trimmed using galloping before each merge
+        (see `merge`); Default: true
+    :return: Merged sorted list (a new one)
+    """
+
+    # Same as in `sort_by_key`, the decreasing order is merged stably as the increasing order of the reversed input
+    shards = [shard if isinstance(shard, list) else list(shard) for shard in shards]
+    if reverse:
+        shards = [shard[::-1] for shard in reversed(shards)]
+    parts = []
+    n = 0
+    for shard in shards:
+        if shard:
+            keys = shard if key is None else [key(x) for x in shard]
+            values = None if key is None else shard
+            parts.append(_Shard(keys, values, Run(n, n + len(shard) - 1), reverse and key is None))
+            n += len(shard)
+    if not parts:
+        return []
+
+    buffer = MergeBuffer()
+    X = []
+    P = []
+    s1 = parts[0]
+    for s2 in parts[1:]:
+        p = node_power(s1.run, s2.run, n)
+        while P and P[-1] > p:
+            P.pop()
+            s1 = _merge_shards(X.pop(), s1, buffer, galloping_enabled, trimming_enabled)
+        X.append(s1)
+        P.append(p)
+        s1 = s2
+    while X:
+        s1 = _merge_shards(X.pop(), s1, buffer, galloping_enabled, trimming_enabled)
+
+    result = s1.keys if key is None else s1.values
+    if not s1.owned and not reverse:
+        result = result.copy()
+    if reverse:
+        result.reverse()
+    return result
+
+
+def _merge_shards(s1: _Shard, s2: _Shard, buffer: MergeBuffer, galloping_enabled: bool,
+                  trimming_enabled: bool) -> _Shard:
+    """
+    Merges two adjacent shards, appending the second one to the first one (copied first, unless it is owned).
+    """
+
+    if not s1.owned:
+        s1 = _Shard(s1.keys.copy(), None if s1.values is None else s1.values.copy(), s1.run, True)
+    m = len(s1.keys) - 1
+    s1.keys.extend(s2.keys)
+    if s1.values is not None:
+        s1.values.extend(s2.values)
+    merge(s1.keys, 0, m, len(s1.keys) - 1, galloping_enabled, False, s1.values, buffer, trimming_enabled)
+    s1.run = Run(s1.run.start, s2.run.end)
+    return s1
+
+
+def iter_merge_sorted(shards: Iterable[Iterable[T]], key: Callable[[T], Any] | None = None,
+                      reverse: bool = False) -> Iterator[T]:
+    """
+    Merges the sorted shards lazily, yielding the merged output element by element (streaming k-way merge).
+    Unlike `merge_sorted`, only the head of each shard is held in memory, so the shards may be arbitrary iterables
+    (e.g., generators reading files), and they are consumed only as far as the output is consumed.
+
+    The smallest of the heads is picked using a tournament tree (loser tree, see `multiway_merge`), so that each
+    output element costs ceil(log2 k) comparisons for k shards (a binary heap, e.g., `heapq.merge`, needs up to twice
+    as many). Ties are resolved in favour of the earlier shard (stability).
+
+    :param shards: Sorted iterables
+    :param key: (optional) Function extracting the comparison key from an element, called once per element
+    :param reverse: (optional) Whether the shards are sorted in decreasing order (the output is decreasing as well);
+        Default: false
+    :return: Generator yielding the merged elements
+    """
+
+    iterators = [iter(shard) for shard in shards]
+    k = len(iterators)
+    if k == 0:
+        return
+    if k == 1:
+        yield from iterators[0]
+        return
+    heads = [None] * k
+    head_keys = [None] * k
+    alive = [False] * k
+
+    def advance(i: int) -> None:
+        # Reads the next element of the shard i into its head
+        for x in iterators[i]:
+            heads[i] = x
+            head_keys[i] = x if key is None else key(x)
+            return
+        alive[i] = False
+        heads[i] = head_keys[i] = None
+
+    def beats(i: int, j: int) -> bool:
+        # Whether the head of the shard i should be yielded before the head of the shard j
+        if not alive[j]:
+            return True
+        if not alive[i]:
+            return False
+        a, b = (head_keys[j], head_keys[i]) if reverse else (head_keys[i], head_keys[j])
+        if i < j:
+            return a <= b
+        return a < b
+
+    for i in range(k):
+        alive[i] = True
+        advance(i)
+
+    # Loser tree: leaves (shards) are on positions k..2k-1, tree[pos] is the loser of the match in the node pos
+    tree = [0] * k
+
+    def play(pos: int) -> int:
+        if pos >= k:
+            return pos - k
+        a = play(2*pos)
+        b = play(2*pos + 1)
+        if beats(a, b):
+            tree[pos] = b
+            return a
+        tree[pos] = a
+        return b
+
+    winner = play(1)
+    while alive[winner]:
+        yield heads[winner]
+        advance(winner)
+        # Replay the matches on the path from the winner's leaf to the root
+        pos = (winner + k) // 2
+        while pos >= 1:
+            if beats(tree[pos], winner):
+                tree[pos], winner = winner, tree[pos]
+            pos //= 2
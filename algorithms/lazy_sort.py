@@ -0,0 +1,139 @@
+from itertools import islice
+from typing import List, TypeVar, Callable, Any, Iterator, Tuple
+
+from algorithms.commons import find_runs, get_kernel, Kernel
+from algorithms.powersort import powersort_merges
+
+# Generic type of elements in the input list
+T = TypeVar('T')
+
+# Stream of blocks of the sorted output, each one being a range [lo, hi) of the (run-decomposed) keys
+TBlocks = Iterator[Tuple[int, int]]
+
+
+class _ReversedKey:
+    """
+    Wrapper of a key inverting its order, so that the decreasing order is produced by the increasing merges.
+    Elements with equal keys stay in their original order (stability), same as with `reverse=True` of `sorted()`.
+    """
+
+    __slots__ = ('key',)
+
+    def __init__(self, key: Any) -> None:
+        self.key = key
+
+    def __lt__(self, other: '_ReversedKey') -> bool:
+        return other.key < self.key
+
+    def __le__(self, other: '_ReversedKey') -> bool:
+        return other.key <= self.key
+
+    def __gt__(self, other: '_ReversedKey') -> bool:
+        return other.key > self.key
+
+    def __ge__(self, other: '_ReversedKey') -> bool:
+        return other.key >= self.key
+
+
+def iter_sorted(arr: List[T], key: Callable[[T], Any] | None = None, reverse: bool = False,
+                kernel: str = 'reference') -> Iterator[T]:
+    """
+    Iterates over the elements of the input sequence in sorted order, lazily: the sorted output is produced only
+    as far as it is consumed. The input sequence is not modified.
+
+    The runs are found first (N-1 comparisons), then the merge tree of Powersort is built over them
+    (the same merges as `powersort` would perform, see `powersort_merges`), but no merge is performed upfront.
+    Each node of the tree is a generator merging the streams of its children (see `_merge_blocks`):
+    the output consists of blocks (contiguous parts of the runs), found by galloping, so that a block of b elements
+    costs O(log b) comparisons, and no element is copied until it is consumed.
+    Consuming the first k elements then costs O(k log K) comparisons for K runs (plus K to start the merges),
+    instead of the O(N log K) of the whole sort; On presorted inputs, the consumed elements come in long blocks.
+
+    :param arr: Input sequence
+    :param key: (optional) Function extracting the comparison key from an element, called once per element
+    :param reverse: (optional) Whether to iterate in decreasing order (stability is preserved); Default: false
+    :param kernel: (optional) Name of the kernel of the primitive operations, 'reference' or 'fast' (see `Kernel`);
+        Default: 'reference'
+    :return: Generator yielding the elements in sorted order
+    """
+
+    if not arr:
+        return
+    primitives = get_kernel(kernel)
+    keys = list(arr) if key is None else [key(x) for x in arr]
+    if reverse:
+        keys = [_ReversedKey(k) for k in keys]
+    values = None if key is None and not reverse else list(arr)
+    runs = find_runs(keys, values=values, kernel=primitives)
+
+    # The stream of each (merged) run, by the start index of the run
+    streams = {run.start: iter([(run.start, run.end + 1)]) for run in runs}
+    for l, m, _ in powersort_merges(runs, len(keys)):
+        streams[l] = _merge_blocks(keys, streams[l], streams.pop(m + 1), primitives)
+
+    output = keys if values is None else values
+    for lo, hi in streams[0]:
+        yield from islice(output, lo, hi)
+
+
+def top_k(arr: List[T], k: int, key: Callable[[T], Any] | None = None, reverse: bool = False,
+          kernel: str = 'reference') -> List[T]:
+    """
+    Finds the k smallest elements of the input sequence (the k largest ones if `reverse`), in sorted order,
+    by consuming only the first k elements of the lazy merge tree (see `iter_sorted`).
+    Same as `sorted(arr, key=key, reverse=reverse)[:k]`, the input sequence is not modified.
+
+    :param arr: Input sequence
+    :param k: Number of the elements to find
+    :param key: (optional) Function extracting the comparison key from an element, called once per element
+    :param reverse: (optional) Whether to find the largest elements (stability is preserved); Default: false
+    :param kernel: (optional) Name of the kernel of the primitive operations, 'reference' or 'fast' (see `Kernel`);
+        Default: 'reference'
+    :return: List of the first k elements of the sorted sequence
+    """
+
+    if k <= 0:
+        return []
+    return list(islice(iter_sorted(arr, key, reverse, kernel), k))
+
+
+def _merge_blocks(keys: List, left: TBlocks, right: TBlocks, kernel: Kernel) -> TBlocks:
+    """
+    Merges two sorted streams of blocks lazily (the left stream comes first in the input, so its elements
+    go before the equal elements of the right one). The elements of the current block of one stream
+    not greater than the head of the other stream are found by galloping (see `_gallop`) and yielded as a block.
+
+    :param keys: Keys (run-decomposed), into which the blocks point
+    :param left: Stream of the blocks of the left child
+    :param right: Stream of the blocks of the right child
+    :param kernel: Kernel of the primitive operations
+    :return: Generator yielding the merged blocks
+    """
+
+    a_lo, a_hi = next(left)
+    b_lo, b_hi = next(right)
+    while True:
+        # Elements of the left block not greater than the head of the right block
+        idx, _ = kernel.gallop(keys, a_lo, keys[b_lo], True, a_hi)
+        if idx > a_lo:
+            yield a_lo, idx
+            a_lo = idx
+            if a_lo == a_hi:
+                block = next(left, None)
+                if block is None:
+                    yield b_lo, b_hi
+                    yield from right
+                    return
+                a_lo, a_hi = block
+        # Elements of the right block less than the head of the left block
+        idx, _ = kernel.gallop(keys, b_lo, keys[a_lo], False, b_hi)
+        if idx > b_lo:
+            yield b_lo, idx
+            b_lo = idx
+            if b_lo == b_hi:
+                block = next(right, None)
+                if block is None:
+                    yield a_lo, a_hi
+                    yield from left
+                    return
+                b_lo, b_hi = block
@@ -0,0 +1,37 @@
+from typing import List, TypeVar, Callable, Any
+
+from algorithms.commons import merge, sort_by_key, MergeBuffer
+
+# Generic type of elements in the input list
+T = TypeVar('T')
+
+
+def merge_sort(arr: List[T], key: Callable[[T], Any] | None = None, reverse: bool = False) -> List[T]:
+    """
+    Sorts the input list using traditional top-down Merge Sort algorithm (not adaptive, used as baseline).
+    The halves are merged in-place, with at most n/2 elements of extra memory (see `MergeBuffer`).
+
+    :param arr: Input sequence to sort
+    :param key: (optional) Function extracting the comparison key from an element, called once per element
+    :param reverse: (optional) Whether to sort in decreasing order (stability is preserved); Default: false
+    :return: Sorted sequence (increasing)
+    """
+
+    if len(arr) <= 1:
+        return arr
+    return sort_by_key(arr, key, reverse, _merge_sort)
+
+
+def _merge_sort(arr: List[T], values: List | None = None) -> None:
+    buffer = MergeBuffer()
+
+    def sort(l: int, r: int) -> None:
+        # Sorts arr[l..r]; Same split as in the benchmark version (the first half is the shorter one)
+        if l >= r:
+            return
+        m = l + (r - l + 1) // 2 - 1
+        sort(l, m)
+        sort(m + 1, r)
+        merge(arr, l, m, r, values=values, buffer=buffer)
+
+    sort(0, len(arr) - 1)
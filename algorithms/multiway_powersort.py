@@ -0,0 +1,85 @@
+from typing import List, TypeVar, Callable, Any
+
+from algorithms.commons import multiway_merge, iter_runs, sort_by_key, MergeBuffer, Run
+from algorithms.powersort import node_power
+
+# Generic type of elements in the input list
+T = TypeVar('T')
+
+# Maximal number of runs merged at once
+WAYS = 4
+
+
+def multiway_powersort(arr: List[T], min_run_length: int | None = None, galloping_enabled: bool = False,
+                       galloping_dynamic_threshold_enabled: bool = False, key: Callable[[T], Any] | None = None,
+                       reverse: bool = False) -> List[T]:
+    """
+    Sorts the input list using 4-way Powersort algorithm.
+
+    Same as Powersort (powersort.py), but the node powers are computed in base 4 instead of base 2,
+    and up to 4 runs with the same power are merged at once using a tournament tree (see `multiway_merge`).
+    Therefore, the merge tree has half the height, and every element is moved about half as many times.
+    See Gelling, Nebel, Smith, Wild: Multiway Powersort (2023).
+
+    :param arr: Input sequence to sort
+    :param min_run_length: (optional) Minimal length of runs to enforce (and use binary insertion sort for shorter runs)
+    :param galloping_enabled: (optional) Whether entering the galloping mode is enabled or not; Default: false
+    :param galloping_dynamic_threshold_enabled: (optional) Whether dynamic tuning of the galloping threshold
+        is enabled or not; If true, the threshold decreases with every successful gallop, and decreases with every
+        unsuccessful one. If false, the threshold stays always the same. Default: false
+    :param key: (optional) Function extracting the comparison key from an element, called once per element
+    :param reverse: (optional) Whether to sort in decreasing order (stability is preserved); Default: false
+    :return: Sorted sequence (increasing)
+    """
+
+    if not arr:
+        return arr
+
+    def sort_func(keys: List, values: List | None) -> None:
+        _multiway_powersort(keys, min_run_length, galloping_enabled, galloping_dynamic_threshold_enabled, values)
+
+    return sort_by_key(arr, key, reverse, sort_func)
+
+
+def _multiway_powersort(arr: List[T], min_run_length: int | None, galloping_enabled: bool,
+                        galloping_dynamic_threshold_enabled: bool, values: List | None) -> None:
+    def merge_top() -> Run:
+        # Merge the current run with all runs on the top of the stack having the same power (at most WAYS-1)
+        power = P[-1]
+        group = [r1]
+        while P and P[-1] == power:
+            P.pop()
+            group.append(X.pop())
+        group.reverse()
+        return multiway_merge(arr, group, galloping_enabled, galloping_dynamic_threshold_enabled, values, buffer)
+
+    n = len(arr)
+    runs = iter_runs(arr, min_run_length, values)
+    buffer = MergeBuffer()
+    X = []
+    P = []
+    r1 = next(runs)  # current run
+    for r2 in runs:  # next run
+        p = node_power_multiway(r1, r2, n)
+        while P and P[-1] > p:
+            r1 = merge_top()
+        X.append(r1)
+        P.append(p)
+        r1 = r2
+    while X:
+        r1 = merge_top()
+
+
+def node_power_multiway(r1: Run, r2: Run, n: int) -> int:
+    """
+    Calculates the power of the run boundary of the two runs in base 4, i.e., the first position (digit)
+    in which the base-4 expansions of the relative midpoints of the runs differ.
+    Since every base-4 digit consists of two bits, it is derived from the binary power.
+
+    :param r1: First run
+    :param r2: Second run
+    :param n: Length of the input array
+    :return: Internal node power of the two runs (in base 4)
+    """
+
+    return (node_power(r1, r2, n) + 1) // 2
@@ -1,32 +1,49 @@
-from typing import List, TypeVar
+from typing import List, TypeVar, Callable, Any
 
-from algorithms.commons import merge, find_runs
+from algorithms.commons import merge, find_runs, sort_by_key, get_kernel, MergeBuffer, Kernel, Run
 
 # Generic type of elements in the input list
 T = TypeVar('T')
 
 
-def natural_merge_sort(arr: List[T]) -> List[T]:
+def natural_merge_sort(arr: List[T], key: Callable[[T], Any] | None = None, reverse: bool = False,
+                       kernel: str = 'reference') -> List[T]:
     """
     Sorts the input list using Natural Merge Sort algorithm.
+    The extra memory used for merging is at most n/2 elements (see `MergeBuffer`).
 
     :param arr: Input sequence to sort
+    :param key: (optional) Function extracting the comparison key from an element, called once per element
+    :param reverse: (optional) Whether to sort in decreasing order (stability is preserved); Default: false
+    :param kernel: (optional) Name of the kernel of the primitive operations, 'reference' or 'fast' (see `Kernel`);
+        Default: 'reference'
     :return: Sorted sequence (increasing)
     """
 
     if len(arr) <= 1:
         return arr
+    primitives = get_kernel(kernel)
 
-    runs = find_runs(arr)
+    def sort_func(keys: List, values: List | None) -> None:
+        _natural_merge_sort(keys, values, primitives)
+
+    return sort_by_key(arr, key, reverse, sort_func)
+
+
+def _natural_merge_sort(arr: List[T], values: List | None = None, kernel: Kernel | None = None,
+                        runs: List[Run] | None = None) -> None:
+    if runs is None:
+        runs = find_runs(arr, values=values, kernel=kernel)
+    buffer = MergeBuffer()
     while len(runs) > 1:
         new_runs = []
         i = 0
         while i < len(runs)-1:
             r1 = runs[i]
             r2 = runs[i+1]
-            new_runs.append(merge(arr, r1.start, r1.end, r2.end))
+            new_runs.append(merge(arr, r1.start, r1.end, r2.end, values=values, buffer=buffer,
+                                  kernel=kernel))
             i += 2
         if i == len(runs)-1:
             new_runs.append(runs[-1])
         runs = new_runs
-    return arr
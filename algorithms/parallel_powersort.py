@@ -0,0 +1,237 @@
+import os
+from multiprocessing import Pool, shared_memory
+from typing import List, TypeVar, Callable, Any, Tuple
+
+import numpy as np
+
+from algorithms.commons import merge, to_numeric_array, co_rank
+from algorithms.powersort import powersort
+
+# Generic type of elements in the input list
+T = TypeVar('T')
+
+# Minimal number of elements per process; Shorter inputs are sorted sequentially,
+# as the cost of starting the processes and copying the data would not pay off.
+MIN_CHUNK_LENGTH = 50_000
+
+# Shared memory buffers of the current process: {(kind, buffer id): array}, kind is 'keys' or 'indices'.
+# Two buffers of each kind are needed, since the merging rounds read from one of them and write into the other.
+_buffers = {}
+# The shared memory blocks backing the buffers (attached by the worker processes)
+_shms = []
+
+
+def parallel_powersort(arr: List[T] | np.ndarray, min_run_length: int | None = None, galloping_enabled: bool = False,
+                       galloping_dynamic_threshold_enabled: bool = False, key: Callable[[T], Any] | None = None,
+                       reverse: bool = False, processes: int | None = None) -> List[T] | np.ndarray:
+    """
+    Sorts the input using Powersort algorithm (powersort.py) in parallel, on a pool of processes.
+
+    1. The input is split into (roughly) equal chunks, one per process, at natural run boundaries (descents).
+    2. Each chunk is sorted by a worker process using Powersort.
+    3. The sorted chunks are merged pairwise in rounds. Each pairwise merge is split into independent parts
+       of equal size using merge path (co-rank) partitioning, so that all processes work in every round.
+
+    The (numeric) keys, along with the original indices of the elements, are placed in shared memory
+    (`multiprocessing.shared_memory`), so that the workers access them directly, without any pickling.
+    Elements with equal keys stay in their original order, therefore, the result is identical to the one
+    of the sequential `powersort` (stability).
+
+    Only numeric keys (see `to_numeric_array`) can be placed in shared memory. Other inputs, as well as short inputs
+    (see `MIN_CHUNK_LENGTH`), are sorted sequentially.
+
+    :param arr: Input sequence to sort (list or one-dimensional ndarray)
+    :param min_run_length: (optional) Minimal length of runs to enforce (and use binary insertion sort for shorter runs)
+    :param galloping_enabled: (optional) Whether entering the galloping mode is enabled or not; Default: false
+    :param galloping_dynamic_threshold_enabled: (optional) Whether dynamic tuning of the galloping threshold
+        is enabled or not; See `powersort`. Default: false
+    :param key: (optional) Function extracting the comparison key from an element, called once per element
+    :param reverse: (optional) Whether to sort in decreasing order (stability is preserved); Default: false
+    :param processes: (optional) Number of worker processes; Default: number of CPUs
+    :return: Sorted sequence (increasing)
+    """
+
+    n = len(arr)
+    processes = min(processes or os.cpu_count() or 1, n // MIN_CHUNK_LENGTH)
+    if processes <= 1:
+        return _sort_sequentially(arr, None if key is None else [key(x) for x in arr], min_run_length,
+                                  galloping_enabled, galloping_dynamic_threshold_enabled, reverse)
+    key_list = arr if key is None else [key(x) for x in arr]
+    keys = to_numeric_array(key_list)
+    if keys is None:
+        return _sort_sequentially(arr, None if key is None else key_list, min_run_length,
+                                  galloping_enabled, galloping_dynamic_threshold_enabled, reverse)
+
+    if reverse:
+        # Same as in `sort_by_key`, reversing the input before and after the sort preserves stability
+        keys = keys[::-1]
+    dtypes = (keys.dtype, keys.dtype, np.dtype(np.int64), np.dtype(np.int64))
+    try:
+        # Created one by one inside the try block, so that the blocks created before a failure are destroyed as well
+        for dtype in dtypes:
+            _shms.append(shared_memory.SharedMemory(create=True, size=max(1, n * dtype.itemsize)))
+        _create_views(keys.dtype.str, n)
+        _buffers['keys', 0][:] = keys
+        _buffers['indices', 0][:] = np.arange(n)
+        names = tuple(shm.name for shm in _shms)
+        with Pool(processes, initializer=_attach, initargs=(names, keys.dtype.str, n)) as pool:
+            src = _parallel_sort(pool, processes, min_run_length, galloping_enabled,
+                                 galloping_dynamic_threshold_enabled)
+        order = _buffers['indices', src].copy()
+    finally:
+        _detach(unlink=True)
+
+    if reverse:
+        order = (n - 1) - order[::-1]
+    if isinstance(arr, np.ndarray):
+        arr[:] = arr[order]
+    else:
+        items = arr.copy()
+        arr[:] = [items[i] for i in order.tolist()]
+    return arr
+
+
+def _sort_sequentially(arr: List[T] | np.ndarray, keys: List | None, min_run_length: int | None,
+                       galloping_enabled: bool, galloping_dynamic_threshold_enabled: bool,
+                       reverse: bool) -> List[T] | np.ndarray:
+    """
+    Sorts the input using the sequential `powersort`, using the already extracted keys (if any).
+    """
+
+    if keys is None and not isinstance(arr, np.ndarray):
+        return powersort(arr, min_run_length, galloping_enabled, galloping_dynamic_threshold_enabled,
+                         reverse=reverse)
+    # Python lists are faster to sort element by element than ndarrays, so the indices are sorted instead
+    keys = arr.tolist() if keys is None else keys
+    order = list(range(len(arr)))
+    powersort(order, min_run_length, galloping_enabled, galloping_dynamic_threshold_enabled,
+              key=keys.__getitem__, reverse=reverse)
+    if isinstance(arr, np.ndarray):
+        arr[:] = arr[order]
+    else:
+        items = arr.copy()
+        arr[:] = [items[i] for i in order]
+    return arr
+
+
+def _parallel_sort(pool: Pool, processes: int, min_run_length: int | None,
+                   galloping_enabled: bool, galloping_dynamic_threshold_enabled: bool) -> int:
+    """
+    Sorts the keys and the indices in the shared buffers with id 0, using the pool of worker processes.
+
+    :return: Id of the shared buffers containing the result
+    """
+
+    keys = _buffers['keys', 0]
+    n = len(keys)
+    # Split the input at the descents closest to the ideal (equal) chunk boundaries
+    descents = np.flatnonzero(keys[1:] < keys[:-1]) + 1
+    bounds = [0]
+    for p in range(1, processes):
+        target = n * p // processes
+        i = np.searchsorted(descents, target)
+        candidates = [descents[j] for j in (i - 1, i) if 0 <= j < len(descents)]
+        bound = int(min(candidates, key=lambda b: abs(b - target))) if candidates else target
+        if bounds[-1] < bound < n:
+            bounds.append(bound)
+    bounds.append(n)
+
+    pool.starmap(_sort_chunk, [(bounds[i], bounds[i+1], min_run_length, galloping_enabled,
+                                galloping_dynamic_threshold_enabled) for i in range(len(bounds) - 1)])
+
+    src = 0
+    while len(bounds) > 2:
+        tasks = []
+        new_bounds = [0]
+        for i in range(0, len(bounds) - 1, 2):
+            lo = bounds[i]
+            mid = bounds[i+1]
+            hi = bounds[i+2] if i + 2 < len(bounds) else mid
+            # Split the merge into parts of equal size, proportionally to the number of processes
+            parts = max(1, processes * (hi - lo) // n)
+            a = _buffers['keys', src][lo:mid]
+            b = _buffers['keys', src][mid:hi]
+            i0, j0 = 0, 0
+            for part in range(1, parts + 1):
+                t = (hi - lo) * part // parts
+                i1 = co_rank(t, a, b)
+                j1 = t - i1
+                tasks.append((src, lo + i0, lo + i1, mid + j0, mid + j1, lo + i0 + j0, galloping_enabled,
+                              galloping_dynamic_threshold_enabled))
+                i0, j0 = i1, j1
+            new_bounds.append(hi)
+        pool.starmap(_merge_part, tasks)
+        src = 1 - src
+        bounds = new_bounds
+    return src
+
+
+def _create_views(dtype: str, n: int) -> None:
+    """
+    Creates the NumPy views of the shared memory blocks in the current process.
+    """
+
+    dtypes = (dtype, dtype, np.int64, np.int64)
+    kinds = (('keys', 0), ('keys', 1), ('indices', 0), ('indices', 1))
+    for shm, kind, dt in zip(_shms, kinds, dtypes):
+        _buffers[kind] = np.ndarray((n,), dtype=dt, buffer=shm.buf)
+
+
+def _attach(names: Tuple[str, ...], dtype: str, n: int) -> None:
+    """
+    Worker process initializer: attaches the shared memory blocks created by the parent process.
+    The workers share the resource tracker of the parent process, which unlinks the blocks.
+    """
+
+    _detach()
+    for name in names:
+        _shms.append(shared_memory.SharedMemory(name=name))
+    _create_views(dtype, n)
+
+
+def _detach(unlink: bool = False) -> None:
+    """
+    Releases the views and the shared memory blocks of the current process (and optionally destroys the blocks).
+    """
+
+    _buffers.clear()
+    for shm in _shms:
+        shm.close()
+        if unlink:
+            shm.unlink()
+    _shms.clear()
+
+
+def _sort_chunk(lo: int, hi: int, min_run_length: int | None, galloping_enabled: bool,
+                galloping_dynamic_threshold_enabled: bool) -> None:
+    """
+    Worker task: sorts the chunk [lo, hi) of the shared buffers with id 0 (keys along with the indices) in-place.
+    """
+
+    keys = _buffers['keys', 0]
+    indices = _buffers['indices', 0]
+    chunk_keys = keys[lo:hi].tolist()
+    order = list(range(hi - lo))
+    powersort(order, min_run_length, galloping_enabled, galloping_dynamic_threshold_enabled,
+              key=chunk_keys.__getitem__)
+    order = np.array(order, dtype=np.int64)
+    keys[lo:hi] = keys[lo:hi][order]
+    indices[lo:hi] = indices[lo:hi][order]
+
+
+def _merge_part(src: int, a_lo: int, a_hi: int, b_lo: int, b_hi: int, out: int, galloping_enabled: bool,
+                galloping_dynamic_threshold_enabled: bool) -> None:
+    """
+    Worker task: merges the parts [a_lo, a_hi) and [b_lo, b_hi) of the shared buffers with id `src`
+    into the other shared buffers, starting on the index `out`.
+    """
+
+    dst = 1 - src
+    na = a_hi - a_lo
+    nb = b_hi - b_lo
+    keys = _buffers['keys', src][a_lo:a_hi].tolist() + _buffers['keys', src][b_lo:b_hi].tolist()
+    indices = _buffers['indices', src][a_lo:a_hi].tolist() + _buffers['indices', src][b_lo:b_hi].tolist()
+    if na and nb:
+        merge(keys, 0, na - 1, na + nb - 1, galloping_enabled, galloping_dynamic_threshold_enabled, indices)
+    _buffers['keys', dst][out:out+na+nb] = keys
+    _buffers['indices', dst][out:out+na+nb] = indices
@@ -1,18 +1,25 @@
-from typing import List, TypeVar
+from typing import List, TypeVar, Callable, Any, Iterable, Iterator, Tuple
 
-from algorithms.commons import merge, find_next_run, Run
+from algorithms.autotuning import select_parameters
+from algorithms.commons import merge, iter_runs, sort_by_key, get_kernel, MergeBuffer, Run, Kernel, \
+    find_next_plateau_run, merge_plateaus
+from config import INITIAL_GALLOPING_THRESHOLD
 
 # Generic type of elements in the input list
 T = TypeVar('T')
 
 
 def powersort(arr: List[T], min_run_length: int | None = None, galloping_enabled: bool = False,
-              galloping_dynamic_threshold_enabled: bool = False) -> List[T]:
+              galloping_dynamic_threshold_enabled: bool = False, trimming_enabled: bool = False,
+              key: Callable[[T], Any] | None = None, reverse: bool = False, kernel: str = 'reference',
+              galloping_threshold: int = INITIAL_GALLOPING_THRESHOLD, auto_tuned: bool = False,
+              plateaus_enabled: bool = False, max_scratch: int | None = None) -> List[T]:
     """
     Sorts the input list using Powersort algorithm.
 
     This implementation can leverage the same optimization techniques as Timsort (timsort.py):
-    MIN_RUN, binary insertion sort, galloping mode.
+    MIN_RUN, binary insertion sort, galloping mode, merging with a single scratch buffer holding only the shorter run
+    (at most n/2 elements of extra memory), pre-merge trimming of the runs.
     They are implemented as optional, in order to be able to test the performance of Powersort with and without them.
 
     :param arr: Input sequence to sort
@@ -21,33 +28,119 @@ def powersort(arr: List[T], min_run_length: int | None = None, galloping_enabled
     :param galloping_dynamic_threshold_enabled: (optional) Whether dynamic tuning of the galloping threshold
         is enabled or not; If true, the threshold decreases with every successful gallop, and decreases with every
         unsuccessful one. If false, the threshold stays always the same. Default: false
+    :param trimming_enabled: (optional) Whether the runs are trimmed using galloping before each merge, skipping
+        the elements already in their final place (see `merge`); Default: false
+    :param key: (optional) Function extracting the comparison key from an element, called once per element
+    :param reverse: (optional) Whether to sort in decreasing order (stability is preserved); Default: false
+    :param kernel: (optional) Name of the kernel of the primitive operations, 'reference' or 'fast' (see `Kernel`);
+        Default: 'reference'
+    :param galloping_threshold: (optional) Initial threshold to trigger the galloping mode;
+        Default: INITIAL_GALLOPING_THRESHOLD
+    :param auto_tuned: (optional) Whether `min_run_length` and `galloping_threshold` are selected automatically
+        from the tuned profile (see `select_parameters`), based on N and the presortedness of the input;
+        Default: false
+    :param plateaus_enabled: (optional) Duplicate-heavy mode: whether the groups of adjacent equal elements
+        are treated as single units, both when finding the runs and when merging them (see `_powersort_plateaus`);
+        Pays off for inputs with few unique keys (up to about a hundred, see `benchmark_duplicates`), otherwise
+        the equality tests cost more than they save. The other optimizations do not apply in this mode. Default: false
+    :param max_scratch: (optional) Maximal number of elements of the merge buffer; The merges of longer runs
+        switch to in-place merging by rotations (see `_sym_merge`), trading time for memory. Default: unlimited
     :return: Sorted sequence (increasing)
     """
 
+    if not arr:
+        return arr
+    primitives = get_kernel(kernel)
+
+    def sort_func(keys: List, values: List | None) -> None:
+        if plateaus_enabled:
+            _powersort_plateaus(keys, values)
+            return
+        if auto_tuned:
+            tuned_min_run_length, tuned_galloping_threshold = select_parameters(keys, 'powersort', min_run_length,
+                                                                                galloping_threshold)
+        else:
+            tuned_min_run_length, tuned_galloping_threshold = min_run_length, galloping_threshold
+        _powersort(keys, tuned_min_run_length, galloping_enabled, galloping_dynamic_threshold_enabled,
+                   trimming_enabled, values, primitives, tuned_galloping_threshold, max_scratch=max_scratch)
+
+    return sort_by_key(arr, key, reverse, sort_func)
+
+
+def _powersort(arr: List[T], min_run_length: int | None, galloping_enabled: bool,
+               galloping_dynamic_threshold_enabled: bool, trimming_enabled: bool, values: List | None,
+               kernel: Kernel | None = None, galloping_threshold: int = INITIAL_GALLOPING_THRESHOLD,
+               runs: Iterable[Run] | None = None, max_scratch: int | None = None) -> None:
     n = len(arr)
+    # The runs are discovered lazily, so that only the O(log n) runs on the stack are held at once,
+    # unless they have already been found by the caller
+    runs = iter_runs(arr, min_run_length, values, kernel, max_scratch) if runs is None else iter(runs)
+    buffer = MergeBuffer()
     X = []
     P = []
-    r1 = find_next_run(arr, 0, min_run_length)  # current run
-    while r1.end < n - 1:
-        r2 = find_next_run(arr, r1.end + 1, min_run_length)  # next run
+    r1 = next(runs)  # current run
+    for r2 in runs:  # next run
         p = node_power(r1, r2, n)
         while P and P[-1] > p:
             P.pop()
             r0 = X.pop()  # previous run on the stack
-            r1 = merge(arr, r0.start, r0.end, r1.end, galloping_enabled, galloping_dynamic_threshold_enabled)
+            r1 = merge(arr, r0.start, r0.end, r1.end, galloping_enabled, galloping_dynamic_threshold_enabled,
+                       values, buffer, trimming_enabled, kernel, galloping_threshold, max_scratch)
         X.append(r1)
         P.append(p)
         r1 = r2
     while X:
         r0 = X.pop()
-        r1 = merge(arr, r0.start, r0.end, r1.end, galloping_enabled, galloping_dynamic_threshold_enabled)
-    return arr
+        r1 = merge(arr, r0.start, r0.end, r1.end, galloping_enabled, galloping_dynamic_threshold_enabled,
+                   values, buffer, trimming_enabled, kernel, galloping_threshold, max_scratch)
+
+
+def _powersort_plateaus(arr: List[T], values: List | None) -> None:
+    """
+    Duplicate-heavy mode of Powersort: the runs consist of plateaus of equal elements (see `find_next_plateau_run`),
+    which are merged as single units using three-way comparisons (see `merge_plateaus`), in the same merge order
+    as in `powersort`. The elements are moved to their final positions only once, after all merges.
+    """
+
+    n = len(arr)
+    X = []
+    P = []
+    r1, plateaus1 = find_next_plateau_run(arr, 0)  # current run
+    while r1.end + 1 < n:
+        r2, plateaus2 = find_next_plateau_run(arr, r1.end + 1)  # next run
+        p = node_power(r1, r2, n)
+        while P and P[-1] > p:
+            P.pop()
+            r0, plateaus0 = X.pop()  # previous run on the stack
+            plateaus1 = merge_plateaus(plateaus0, plateaus1)
+            r1 = Run(r0.start, r1.end)
+        X.append((r1, plateaus1))
+        P.append(p)
+        r1, plateaus1 = r2, plateaus2
+    while X:
+        r0, plateaus0 = X.pop()
+        plateaus1 = merge_plateaus(plateaus0, plateaus1)
+        r1 = Run(r0.start, r1.end)
+
+    for seq in (arr, values):
+        if seq is not None:
+            output = []
+            for plateau in plateaus1:
+                for lo, hi in plateau.segments:
+                    output.extend(seq[lo:hi])
+            seq[:] = output
 
 
 def node_power(r1: Run, r2: Run, n: int) -> int:
     """
     Calculates the power of the run boundary of the two runs.
 
+    The power is the first position (bit) in which the binary expansions of the relative midpoints of the runs,
+    a = (r1.start + n1/2 - 1) / n and b = (r2.start + n2/2 - 1) / n, differ. Both midpoints are scaled by 2^L
+    to integers, where L is large enough for the first differing bit to be preserved (b - a >= 1/n),
+    so that the power is computed exactly in O(1) using integer operations only.
+    The powers are the same as those of the loop comparing the (truncated) scaled midpoints bit by bit.
+
     :param r1: First run
     :param r2: Second run
     :param n: Length of the input array
@@ -56,9 +149,37 @@ def node_power(r1: Run, r2: Run, n: int) -> int:
 
     n1 = r1.end - r1.start + 1
     n2 = r2.end - r2.start + 1
-    l = 0
-    a = (r1.start + n1 / 2 - 1) / n
-    b = (r2.start + n2 / 2 - 1) / n
-    while int(a * 2**l) == int(b * 2**l):
-        l += 1
-    return l
+    # Midpoints multiplied by 2n, in order to be integers; The midpoint of a single-element run at index 0
+    # is negative (-1/2n), its binary expansion is truncated towards zero (the same as 0) in the definition
+    a = max(2*r1.start + n1 - 2, 0)
+    b = 2*r2.start + n2 - 2
+    bits = (2*n).bit_length()
+    a = (a << bits) // (2*n)
+    b = (b << bits) // (2*n)
+    return bits - (a ^ b).bit_length() + 1
+
+
+def powersort_merges(runs: List[Run], n: int) -> Iterator[Tuple[int, int, int]]:
+    """
+    Schedules the merges of the runs by the merge policy of Powersort (see `powersort`).
+
+    :return: Generator yielding the merges (left, middle, right) in the order they are performed (see `merge`)
+    """
+
+    X = []
+    P = []
+    r1 = runs[0]
+    for r2 in runs[1:]:
+        p = node_power(r1, r2, n)
+        while P and P[-1] > p:
+            P.pop()
+            r0 = X.pop()
+            yield (r0.start, r0.end, r1.end)
+            r1 = Run(r0.start, r1.end)
+        X.append(r1)
+        P.append(p)
+        r1 = r2
+    while X:
+        r0 = X.pop()
+        yield (r0.start, r0.end, r1.end)
+        r1 = Run(r0.start, r1.end)
@@ -0,0 +1,398 @@
+import math
+import random
+from bisect import bisect_left, bisect_right
+from statistics import NormalDist, fmean, stdev
+from typing import List, TypeVar, NamedTuple, Tuple
+
+import numpy as np
+
+from algorithms.commons import iter_runs
+from config import PRESORTEDNESS_SAMPLES, PRESORTEDNESS_SCAN_LENGTH
+
+# Generic type of elements in the input list
+T = TypeVar('T')
+
+# Number of pairs of consecutive elements checked at each probe of the galloping (see `_gallop`);
+# A probe in a region of short runs passes (falsely) with probability of about 2^-PROBE_WIDTH
+PROBE_WIDTH = 4
+
+"""
+Measures of presortedness of an input sequence, i.e., how far the sequence is from being sorted.
+All measures are zero for a sorted sequence. The input is never modified, the measures work on copies if needed.
+"""
+
+
+class Estimate(NamedTuple):
+    """
+    Estimated value along with its confidence bounds.
+    """
+
+    value: float
+    low: float
+    high: float
+
+
+class PresortednessEstimate(NamedTuple):
+    """
+    Result of the sampling estimator (see `estimate_presortedness`).
+    """
+
+    # Number of natural runs
+    runs: Estimate
+    # Mean length of the natural runs (N / number of runs)
+    mean_run_length: Estimate
+    # Normalized entropy of the run profile (see `run_entropy`)
+    entropy: Estimate
+    # Number of element comparisons performed by the estimator
+    comparisons: int
+
+
+def run_profile(arr: List[T]) -> List[int]:
+    """
+    Finds the run profile of the input: the lengths of its natural runs (maximal non-decreasing or strictly
+    descending subsequences of consecutive elements), exactly as they are found by the sorting algorithms.
+
+    :param arr: Input sequence
+    :return: Lengths of the natural runs, in the order of the input (sum of the run profile is N)
+    """
+
+    # Run detection reverses the strictly descending runs in-place, so it works on a copy
+    return [len(run) for run in iter_runs(arr.copy())] if len(arr) else []
+
+
+def count_runs(arr: List[T]) -> int:
+    """
+    Counts the natural runs of the input (see `run_profile`); Runs(X) = number of runs - 1.
+
+    :param arr: Input sequence
+    :return: Number of natural runs (0 for an empty sequence)
+    """
+
+    return len(run_profile(arr))
+
+
+def run_entropy(arr: List[T]) -> float:
+    """
+    Calculates the normalized entropy of the run profile of the input (see `run_profile`), the same way
+    as it is used by the input generator (see `generate_random_list`): the relative position of the entropy
+    (see `profile_entropy`) in the interval bounded by the minimal and the maximal possible entropy of run profiles
+    with the same K and N (see `entropy_bounds`).
+
+    :param arr: Input sequence
+    :return: Normalized entropy of the run profile, 0 for a sorted sequence
+    """
+
+    profile = run_profile(arr)
+    if len(profile) <= 1:
+        return 0.
+    min_entropy, max_entropy = entropy_bounds(len(profile), len(arr))
+    if max_entropy <= min_entropy:
+        # All the profiles with the same K and N are (almost) balanced
+        return 1.
+    # The last run may be shorter than 2, so the entropy may slightly exceed the bounds
+    return min(1., max(0., (profile_entropy(profile) - min_entropy) / (max_entropy - min_entropy)))
+
+
+def profile_entropy(run_profile: List[int]) -> float:
+    """
+    Calculates the entropy of the run profile: H = -sum(L/N * log2(L/N)) over the run lengths L.
+
+    :param run_profile: Run profile
+    :return: Entropy of the run profile
+    """
+
+    arr = np.array(run_profile) / sum(run_profile)
+    return -np.sum(arr * np.log2(arr))
+
+
+def entropy_bounds(k: int, n: int) -> Tuple[float, float]:
+    """
+    Calculates minimal and maximal possible entropy for run profiles of the specified length and sum.
+
+    :param k: Number of runs (length of the run profile)
+    :param n: Total number of input elements (sum of the run profile)
+    :return: Minimal and maximal possible entropy
+    """
+
+    # max entropy is log(k) by definition, where k is number of runs
+    max_entropy = np.log2(k)
+    # min entropy is when the profile is most skewed, like this [2,2,...,2,2,X] where X is the remainder
+    # note that min run size is 2
+    x = n - 2 * (k - 1)  # value of X (remainder)
+    n2 = 2 / n  # normalized value of 2
+    nx = x / n  # normalized value of X
+    e2 = -n2 * np.log2(n2)  # entropy "contribution" of a single 2
+    ex = -nx * np.log2(nx)  # entropy "contribution" of X
+    min_entropy = ex + e2*(k - 1)
+    return min_entropy, max_entropy
+
+
+def inversions(arr: List[T]) -> int:
+    """
+    Counts the inversions of the input: pairs of elements (i, j), such that i < j and arr[i] > arr[j].
+    Each element is replaced by its rank in the sorted input and the ranks of the elements seen so far are
+    counted in a Fenwick (binary indexed) tree, in O(n log n) time.
+
+    :param arr: Input sequence
+    :return: Number of inversions, between 0 and N(N-1)/2
+    """
+
+    n = len(arr)
+    sorted_arr = sorted(arr)
+    tree = [0] * (n + 1)
+    count = 0
+    for i, x in enumerate(arr):
+        # Equal elements share the rank, so that they do not form inversions
+        rank = bisect_right(sorted_arr, x)
+        # Elements seen so far not greater than x
+        j = rank
+        not_greater = 0
+        while j:
+            not_greater += tree[j]
+            j &= j - 1
+        count += i - not_greater
+        j = rank
+        while j <= n:
+            tree[j] += 1
+            j += j & -j
+    return count
+
+
+def rem(arr: List[T]) -> int:
+    """
+    Calculates Rem of the input: the minimal number of elements that need to be removed to leave a sorted sequence,
+    i.e., N minus the length of the longest non-decreasing subsequence (found by patience sorting in O(n log n)).
+
+    :param arr: Input sequence
+    :return: Rem of the input, between 0 and N-1
+    """
+
+    # Smallest possible last element of a non-decreasing subsequence of each length
+    tails = []
+    for x in arr:
+        i = bisect_right(tails, x)
+        if i == len(tails):
+            tails.append(x)
+        else:
+            tails[i] = x
+    return len(arr) - len(tails)
+
+
+def osc(arr: List[T]) -> int:
+    """
+    Calculates Osc of the input (oscillation): for each pair of consecutive elements, the number of elements
+    lying strictly between them, summed up. Osc is small for the inputs whose consecutive elements are close
+    in value (e.g., a few interleaved sorted sequences). Computed using binary search in O(n log n).
+
+    :param arr: Input sequence
+    :return: Osc of the input
+    """
+
+    sorted_arr = sorted(arr)
+    count = 0
+    for i in range(len(arr) - 1):
+        lo, hi = (arr[i], arr[i+1]) if arr[i] < arr[i+1] else (arr[i+1], arr[i])
+        if lo < hi:
+            count += bisect_left(sorted_arr, hi) - bisect_right(sorted_arr, lo)
+    return count
+
+
+def estimate_presortedness(arr: List[T], n_samples: int = PRESORTEDNESS_SAMPLES,
+                           scan_length: int = PRESORTEDNESS_SCAN_LENGTH, confidence: float = .95,
+                           seed: int | None = None) -> PresortednessEstimate:
+    """
+    Estimates the number of natural runs, their mean length and the normalized entropy of the run profile
+    of the input (see `count_runs`, `run_entropy`), reading only a small part of it.
+
+    The runs containing `n_samples` random positions are measured (see `_measure_run`). Denoting L(i) the length
+    of the run containing the i-th element, the number of runs is the sum of 1/L(i) over all elements and the entropy
+    of the run profile is log2(N) - mean(log2 L(i)), so both are estimated by the means over the sampled positions.
+    The confidence bounds combine the sampling error (normal approximation) and the uncertainty of the runs longer
+    than `scan_length`, which are not read entirely: the length of such a run is at least its scanned part
+    and at most the length found by the galloping (see `_measure_run`), the bounds use the former on one side
+    and the latter on the other. The bounds of the normalized entropy are the extremes over the bounds of the number
+    of runs, which the normalization depends on.
+    The bounds are approximate: the normal approximation is poor for the heavy-tailed distributions of the run
+    lengths of skewed profiles, so they may contain the exact values less often than the confidence level says.
+    Note that the point estimates are biased on profiles with adjacent long runs (e.g., partially uniform or skewed
+    profiles with runs of thousands of elements): a galloping probe landing in the next long run passes whenever
+    its value is not smaller than the previous probe, which happens for about half of the boundaries of runs
+    of random values, so the neighbouring long runs are often measured as one. Their lengths are overestimated,
+    so the entropy is underestimated (e.g., normalized entropy of about 0.68 instead of 0.88 on average for N=100k;
+    The number of runs much less, as it is dominated by the short runs).
+    The coverage of the bounds and the bias are reported by `benchmark_presortedness_estimation`.
+
+    Short inputs (up to 4 elements per sample) are measured exactly, as it is cheaper than the sampling.
+
+    :param arr: Input sequence
+    :param n_samples: (optional) Number of sampled positions; Default: PRESORTEDNESS_SAMPLES
+    :param scan_length: (optional) Number of elements scanned one by one in each direction from a sampled position,
+        longer runs are measured by galloping; Default: PRESORTEDNESS_SCAN_LENGTH
+    :param confidence: (optional) Confidence level of the bounds; Default: 95%
+    :param seed: (optional) Seed of the random generator choosing the positions
+    :return: Estimated measures along with their confidence bounds
+    """
+
+    n = len(arr)
+    if n <= 4 * n_samples:
+        k = count_runs(arr)
+        h = run_entropy(arr)
+        mean_run_length = n / k if k else 0.
+        return PresortednessEstimate(Estimate(k, k, k), Estimate(mean_run_length, mean_run_length, mean_run_length),
+                                     Estimate(h, h, h), max(0, n - 1))
+
+    rng = random.Random(seed)
+    comparisons = 0
+
+    def ordered(a: int, b: int, descending: bool) -> bool:
+        # Whether arr[a] and arr[b] (a < b) may belong to the same run of the given direction
+        nonlocal comparisons
+        comparisons += 1
+        return arr[b] < arr[a] if descending else not arr[b] < arr[a]
+
+    lengths = [_measure_run(arr, rng.randrange(n), scan_length, ordered) for _ in range(n_samples)]
+    z = NormalDist().inv_cdf(.5 + confidence / 2)
+
+    def mean_and_error(values: List[float]) -> Tuple[float, float]:
+        return fmean(values), z * stdev(values) / math.sqrt(len(values))
+
+    # Runs longer than the scan are assumed to end where the galloping found their ends (the longest possible)
+    # for the estimate, while the bounds also allow them to end anywhere in the part not read;
+    # Each bound uses the sampling error of the lengths it is computed from
+    inverse, inverse_error = mean_and_error([1 / length for _, length in lengths])
+    inverse_high, inverse_high_error = mean_and_error([1 / low for low, _ in lengths])
+    k = Estimate(n * inverse, max(1., n * (inverse - inverse_error)),
+                 min(n, n * (inverse_high + inverse_high_error)))
+    mean_run_length = Estimate(n / k.value, n / k.high, n / k.low)
+
+    log_length, log_length_error = mean_and_error([math.log2(length) for _, length in lengths])
+    log_length_low, log_length_low_error = mean_and_error([math.log2(low) for low, _ in lengths])
+    h = Estimate(math.log2(n) - log_length,
+                 max(0., math.log2(n) - log_length - log_length_error),
+                 min(math.log2(n), math.log2(n) - log_length_low + log_length_low_error))
+    # The normalization depends on the number of runs, so the bounds of the normalized entropy are the extremes
+    # over the bounds of the number of runs
+    k_range = (k.low, k.value, k.high)
+    entropy = Estimate(_normalized_entropy(h.value, k.value, n),
+                       min(_normalized_entropy(h.low, runs, n) for runs in k_range),
+                       max(_normalized_entropy(h.high, runs, n) for runs in k_range))
+    return PresortednessEstimate(k, mean_run_length, entropy, comparisons)
+
+
+def _normalized_entropy(h: float, runs: float, n: int) -> float:
+    """
+    Normalizes the entropy of a run profile of the (estimated) number of runs, the same way as `run_entropy`.
+    """
+
+    runs = min(round(runs), (n + 1) // 2)
+    if runs <= 1:
+        return 0.
+    min_entropy, max_entropy = entropy_bounds(runs, n)
+    if max_entropy <= min_entropy:
+        return 1.
+    return float(min(1., max(0., (h - min_entropy) / (max_entropy - min_entropy))))
+
+
+def _measure_run(arr: List[T], i: int, scan_length: int, ordered) -> Tuple[int, int]:
+    """
+    Measures the natural run containing the i-th element, as found by the run detection from the start of the input.
+
+    1. A run start is found by scanning back from i: if the pairs of consecutive elements (c-2, c-1) and (c-1, c)
+       are both ascending (non-decreasing), or both descending, and the pair (c, c+1) is not, the element c
+       ends a run (the pair (c-1, c) cannot be the one skipped between two runs), so c+1 starts a new run.
+    2. The runs are found from there, the same way as by the run detection, up to the run containing i.
+    3. If the run is longer than the scan in either direction, its end is found by galloping:
+       elements in exponentially growing distances are compared, until two of them (or the element
+       and one of its `PROBE_WIDTH` neighbors) are out of order, so there is a run boundary between them.
+       Then the boundary is narrowed down by binary search.
+
+    Galloping misses the boundaries that keep the values in order (e.g., an equal pair of elements in the middle
+    of a descending sequence splits it into two strictly descending runs), only the bounds account for them.
+
+    :return: Lower bound and estimate of the length of the run; The estimate is exact if the run is not longer
+        than the scan, otherwise it assumes there are no other boundaries in the parts not read,
+        so it is an upper bound of the length
+    """
+
+    n = len(arr)
+    # Directions of the pairs of consecutive elements read so far: {j: whether arr[j] > arr[j+1]}
+    descents = {}
+
+    def descent(j: int) -> bool:
+        if j not in descents:
+            descents[j] = ordered(j, j + 1, True)
+        return descents[j]
+
+    start = None
+    for c in range(i - 1, max(1, i - scan_length - 1), -1):
+        # (c-2, c-1), (c-1, c) of the same direction, (c, c+1) of the other one
+        if descent(c - 2) == descent(c - 1) != descent(c):
+            start = c + 1
+            break
+    start_known = True
+    if start is None:
+        # No run start found by the scan, unless the scan reached the start of the input
+        start_known = i - scan_length <= 1
+        start = 0 if start_known else i - scan_length
+
+    while True:
+        if start == n - 1:
+            return 1, 1
+        descending = descent(start)
+        end = start + 1
+        end_known = True
+        while end < n - 1 and descent(end) == descending:
+            end += 1
+            if end - i >= scan_length:
+                end_known = end == n - 1
+                break
+        if end >= i:
+            break
+        start = end + 1
+        start_known = True
+
+    low = end - start + 1
+    if not start_known:
+        start = _gallop(arr, start, -1, scan_length, descending, ordered)
+    if not end_known:
+        end = _gallop(arr, end, 1, scan_length, descending, ordered)
+    return low, end - start + 1
+
+
+def _gallop(arr: List[T], p: int, step: int, scan_length: int, descending: bool, ordered) -> int:
+    """
+    Finds the boundary of the run containing the element p in the given direction (step 1 for the end,
+    step -1 for the start) by galloping and binary search (see `_measure_run`).
+
+    :return: Index of the last element of the run in the given direction
+    """
+
+    limit = len(arr) - 1 if step > 0 else 0
+
+    def in_order(a: int, b: int) -> bool:
+        return ordered(a, b, descending) if step > 0 else ordered(b, a, descending)
+
+    def in_run(a: int, b: int) -> bool:
+        # Whether b may belong to the run containing a: no boundary between them, nor next to b
+        return in_order(a, b) and all(in_order(b - (j+1) * step, b - j * step) for j in range(PROBE_WIDTH))
+
+    prev = p
+    distance = scan_length
+    while True:
+        q = min(p + distance, limit) if step > 0 else max(p - distance, limit)
+        if not in_run(prev, q):
+            break
+        if q == limit:
+            return limit
+        prev = q
+        distance *= 2
+    # There is a run boundary between prev and q
+    while abs(q - prev) > scan_length:
+        m = (prev + q) // 2
+        if in_run(prev, m):
+            prev = m
+        else:
+            q = m
+    while in_order(prev, prev + step):
+        prev += step
+    return prev
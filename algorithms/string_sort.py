@@ -0,0 +1,193 @@
+from typing import List, TypeVar, Callable, Tuple, AnyStr
+
+from algorithms.commons import sort_by_key, Run
+from algorithms.powersort import node_power
+from config import LCP_INITIAL_STEP
+
+# Generic type of elements in the input list
+T = TypeVar('T')
+
+
+def string_powersort(arr: List[T], key: Callable[[T], AnyStr] | None = None, reverse: bool = False) -> List[T]:
+    """
+    Sorts the input list of strings (str or bytes) using Powersort algorithm with LCP-aware merging.
+
+    Keys with long shared prefixes (e.g., URLs, paths) make each comparison rescan the prefix.
+    Here, the longest common prefix (LCP) of each key with its predecessor in its run is kept alongside the runs,
+    and the runs are merged using the LCPs (LCP-merge, Ng & Kakehi, 2008): the LCPs of both heads
+    with the last merged key decide most of the comparisons alone, and the keys themselves are compared
+    only from the position of the shared LCP on (see `_lcp_merge`). Therefore, no character of a shared prefix
+    is compared twice in a merge. The runs are found and merged in the same order as in `powersort`
+    (without MIN_RUN, galloping and trimming).
+    Note that in CPython, the native comparison of two strings rescans the prefix at memcmp speed, so the saved
+    character comparisons pay off in time only for long prefixes or keys with costly character comparisons
+    (see `benchmark_string_sort`).
+
+    :param arr: Input sequence to sort
+    :param key: (optional) Function extracting the comparison key (a string) from an element,
+        called once per element
+    :param reverse: (optional) Whether to sort in decreasing order (stability is preserved); Default: false
+    :return: Sorted sequence (increasing)
+    """
+
+    if not arr:
+        return arr
+    return sort_by_key(arr, key, reverse, _string_powersort)
+
+
+def _string_powersort(arr: List[AnyStr], values: List | None) -> None:
+    """
+    Sorts the list of strings in-place using Powersort's merge policy (see `string_powersort`).
+    """
+
+    n = len(arr)
+    lcps = [0] * n  # lcps[i] is the LCP of arr[i-1] and arr[i], if both are in the same run
+    X = []
+    P = []
+    r1 = _find_next_run(arr, 0, lcps, values)  # current run
+    while r1.end < n - 1:
+        r2 = _find_next_run(arr, r1.end + 1, lcps, values)  # next run
+        p = node_power(r1, r2, n)
+        while P and P[-1] > p:
+            P.pop()
+            r0 = X.pop()  # previous run on the stack
+            r1 = _lcp_merge(arr, lcps, r0.start, r0.end, r1.end, values)
+        X.append(r1)
+        P.append(p)
+        r1 = r2
+    while X:
+        r0 = X.pop()
+        r1 = _lcp_merge(arr, lcps, r0.start, r0.end, r1.end, values)
+
+
+def _find_next_run(arr: List[AnyStr], start: int, lcps: List[int], values: List | None) -> Run:
+    """
+    Finds the run (non-decreasing, or strictly decreasing and then reversed) starting on the specified index,
+    filling in the LCPs of its adjacent keys.
+    """
+
+    n = len(arr)
+    if start == n - 1:
+        return Run(start, start)
+    le, lcps[start+1] = _le(arr[start], arr[start+1], 0)
+    i = start + 1
+    while i < n - 1:
+        next_le, lcp = _le(arr[i], arr[i+1], 0)
+        if next_le != le:
+            break
+        lcps[i+1] = lcp
+        i += 1
+    if not le:
+        arr[start:i+1] = arr[start:i+1][::-1]
+        lcps[start+1:i+1] = lcps[start+1:i+1][::-1]
+        if values is not None:
+            values[start:i+1] = values[start:i+1][::-1]
+    return Run(start, i)
+
+
+def _lcp_merge(arr: List[AnyStr], lcps: List[int], l: int, m: int, r: int, values: List | None) -> Run:
+    """
+    Merges two adjacent runs in-place, using the LCPs of their adjacent keys (see `string_powersort`),
+    and updates the LCPs of the merged run. The first run is copied out, the runs are merged from left to right.
+
+    Let `ha` and `hb` be the LCPs of the heads of the runs with the last merged key (which is not greater than both).
+    If `ha > hb`, the head of the first run shares more characters with the last merged key, so it is smaller
+    (and vice versa), without comparing any characters. Only if `ha == hb`, the heads are compared,
+    starting from the position `ha`; The LCP found by the comparison becomes the LCP of the other head.
+
+    :param arr: Input sequence
+    :param lcps: LCPs of the adjacent keys of the runs
+    :param l: (left) Starting index of the first run (inclusive)
+    :param m: (middle) Ending index of the first run (inclusive), starting index of the second run (exclusive)
+    :param r: (right) Ending index of the second run (inclusive)
+    :param values: (optional) Sequence permuted alongside `arr`
+    :return: New merged run: [left, right]
+    """
+
+    na = m - l + 1
+    left = arr[l:m+1]
+    left_lcps = lcps[l:m+1]
+    left_values = values[l:m+1] if values is not None else None
+    k = l      # index in the original array
+    i = 0      # index in the first run (copied out)
+    j = m + 1  # index of the second run (in the original array)
+    ha = hb = 0  # LCPs of the heads of the runs with the last merged key
+    while i < na and j <= r:
+        if ha == hb:
+            le, lcp = _le(left[i], arr[j], ha)
+            if le:
+                hb = lcp
+            else:
+                ha = lcp
+        else:
+            le = ha > hb
+        if le:
+            arr[k] = left[i]
+            lcps[k] = ha
+            if values is not None:
+                values[k] = left_values[i]
+            i += 1
+            if i < na:
+                ha = left_lcps[i]
+        else:
+            arr[k] = arr[j]
+            lcps[k] = hb
+            if values is not None:
+                values[k] = values[j]
+            j += 1
+            if j <= r:
+                hb = lcps[j]
+        k += 1
+
+    if i < na:
+        arr[k:r+1] = left[i:]
+        lcps[k:r+1] = left_lcps[i:]
+        lcps[k] = ha
+        if values is not None:
+            values[k:r+1] = left_values[i:]
+    elif j <= r:
+        # The rest of the second run is already in place
+        lcps[j] = hb
+    return Run(l, r)
+
+
+def _le(a: AnyStr, b: AnyStr, h: int) -> Tuple[bool, int]:
+    """
+    Compares two strings sharing (at least) the first h characters, from the position h on.
+
+    :return: Whether a <= b, along with the LCP of a and b
+    """
+
+    n = min(len(a), len(b))
+    # Most often, the strings differ right after the shared prefix
+    if h < n and a[h] != b[h]:
+        return a[h] < b[h], h
+    lcp = _lcp(a, b, h, n)
+    if lcp < n:
+        return a[lcp] < b[lcp], lcp
+    return len(a) <= len(b), lcp
+
+
+def _lcp(a: AnyStr, b: AnyStr, h: int, n: int) -> int:
+    """
+    Finds the LCP of two strings sharing (at least) the first h characters, n being the length of the shorter one.
+    Slices of doubling length are compared (by the native string comparison) until one of them differs,
+    then the first differing position is found in it by binary search, so that the cost is O(LCP - h)
+    character comparisons, but only O(log(LCP - h)) comparisons of slices.
+    """
+
+    step = LCP_INITIAL_STEP
+    while h < n:
+        end = min(h + step, n)
+        if a[h:end] != b[h:end]:
+            # The first differing position is in [h, end)
+            while end - h > 1:
+                mid = (h + end) // 2
+                if a[h:mid] == b[h:mid]:
+                    h = mid
+                else:
+                    end = mid
+            return h
+        h = end
+        step *= 2
+    return n
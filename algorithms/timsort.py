@@ -1,38 +1,75 @@
-from typing import TypeVar, List
+from typing import TypeVar, List, Callable, Any, Iterator, Tuple
 
-from algorithms.commons import merge, find_runs
-from config import MIN_RUN
+from algorithms.autotuning import select_parameters
+from algorithms.commons import merge, iter_runs, sort_by_key, get_kernel, MergeBuffer, Kernel, Run
+from config import MIN_RUN, INITIAL_GALLOPING_THRESHOLD
 
 # Generic type of elements in the input list
 T = TypeVar('T')
 
 
-def timsort(arr: List[T]) -> List[T]:
+def timsort(arr: List[T], key: Callable[[T], Any] | None = None, reverse: bool = False,
+            kernel: str = 'reference', min_run_length: int | None = MIN_RUN,
+            galloping_threshold: int = INITIAL_GALLOPING_THRESHOLD, auto_tuned: bool = False,
+            max_scratch: int | None = None) -> List[T]:
     """
     Sorts the input list using Timsort algorithm.
 
     Note that this implementation of Timsort does not include *all* performance
     optimizations proposed by Tim Peters.
     See https://svn.python.org/projects/python/trunk/Objects/listsort.txt
-    The implemented optimizations: MIN_RUN, binary insertion sort, galloping mode
+    The implemented optimizations: MIN_RUN, binary insertion sort, galloping mode,
+    merging with a single scratch buffer holding only the shorter run (at most n/2 elements of extra memory)
 
     :param arr: Input sequence to sort
+    :param key: (optional) Function extracting the comparison key from an element, called once per element
+    :param reverse: (optional) Whether to sort in decreasing order (stability is preserved); Default: false
+    :param kernel: (optional) Name of the kernel of the primitive operations, 'reference' or 'fast' (see `Kernel`);
+        Default: 'reference'
+    :param min_run_length: (optional) Minimal length of runs to enforce; Default: MIN_RUN
+    :param galloping_threshold: (optional) Initial threshold to trigger the galloping mode;
+        Default: INITIAL_GALLOPING_THRESHOLD
+    :param auto_tuned: (optional) Whether `min_run_length` and `galloping_threshold` are selected automatically
+        from the tuned profile (see `select_parameters`), based on N and the presortedness of the input;
+        Default: false
+    :param max_scratch: (optional) Maximal number of elements of the merge buffer; The merges of longer runs
+        switch to in-place merging by rotations (see `_sym_merge`), trading time for memory. Default: unlimited
     :return: Sorted sequence (increasing)
     """
+
+    primitives = get_kernel(kernel)
+
+    def sort_func(keys: List, values: List | None) -> None:
+        if auto_tuned:
+            tuned_min_run_length, tuned_galloping_threshold = select_parameters(keys, 'timsort', min_run_length,
+                                                                                galloping_threshold)
+        else:
+            tuned_min_run_length, tuned_galloping_threshold = min_run_length, galloping_threshold
+        _timsort(keys, values, primitives, tuned_min_run_length, tuned_galloping_threshold, max_scratch)
+
+    return sort_by_key(arr, key, reverse, sort_func)
+
+
+def _timsort(arr: List[T], values: List | None = None, kernel: Kernel | None = None,
+             min_run_length: int | None = MIN_RUN, galloping_threshold: int = INITIAL_GALLOPING_THRESHOLD,
+             max_scratch: int | None = None) -> None:
     def merge12():
         # Merge r1 and r2
         S.pop(), S.pop()
-        S.append(merge(arr, r2.start, r2.end, r1.end, galloping_enabled=True))
+        S.append(merge(arr, r2.start, r2.end, r1.end, galloping_enabled=True, values=values,
+                       buffer=buffer, kernel=kernel, galloping_threshold=galloping_threshold, max_scratch=max_scratch))
 
     def merge23():
         # Merge r2 and r3
         S.pop(), S.pop(), S.pop()
-        S.append(merge(arr, r3.start, r3.end, r2.end, galloping_enabled=True))
+        S.append(merge(arr, r3.start, r3.end, r2.end, galloping_enabled=True, values=values,
+                       buffer=buffer, kernel=kernel, galloping_threshold=galloping_threshold, max_scratch=max_scratch))
         S.append(r1)
 
-    runs = find_runs(arr, min_run_length=MIN_RUN)
+    buffer = MergeBuffer()
     S = []
-    for run in runs:
+    # The runs are discovered lazily, so that only the O(log n) runs on the stack are held at once
+    for run in iter_runs(arr, min_run_length=min_run_length, values=values, kernel=kernel, max_scratch=max_scratch):
         S.append(run)
         while True:
             h = len(S)
@@ -55,5 +92,33 @@ def timsort(arr: List[T]) -> List[T]:
 
     while len(S) > 1:
         r1, r2 = S.pop(), S.pop()
-        S.append(merge(arr, r2.start, r2.end, r1.end, galloping_enabled=True))
-    return arr
+        S.append(merge(arr, r2.start, r2.end, r1.end, galloping_enabled=True, values=values,
+                       buffer=buffer, kernel=kernel, galloping_threshold=galloping_threshold, max_scratch=max_scratch))
+
+
+def timsort_merges(runs: List[Run]) -> Iterator[Tuple[int, int, int]]:
+    """
+    Schedules the merges of the runs by the merge policy of Timsort (see `timsort`).
+
+    :return: Generator yielding the merges (left, middle, right) in the order they are performed (see `merge`)
+    """
+
+    S = []
+    for run in runs:
+        S.append(run)
+        while True:
+            h = len(S)
+            if h >= 3 and len(S[-1]) >= len(S[-3]):
+                # Merge r2 and r3
+                yield (S[-3].start, S[-3].end, S[-2].end)
+                S[-3:] = [Run(S[-3].start, S[-2].end), S[-1]]
+            elif (h >= 2 and len(S[-1]) >= len(S[-2]) or h >= 3 and len(S[-1]) + len(S[-2]) >= len(S[-3])
+                  or h >= 4 and len(S[-2]) + len(S[-3]) >= len(S[-4])):
+                # Merge r1 and r2
+                yield (S[-2].start, S[-2].end, S[-1].end)
+                S[-2:] = [Run(S[-2].start, S[-1].end)]
+            else:
+                break
+    while len(S) > 1:
+        yield (S[-2].start, S[-2].end, S[-1].end)
+        S[-2:] = [Run(S[-2].start, S[-1].end)]
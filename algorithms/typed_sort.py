@@ -0,0 +1,312 @@
+from array import array
+from bisect import bisect_left
+from typing import List, Callable
+
+import numpy as np
+
+from algorithms.commons import Run
+from algorithms.powersort import node_power
+from config import MIN_RUN, INITIAL_GALLOPING_THRESHOLD
+
+# Typed buffer: array.array (of a numeric type) or a one-dimensional numeric ndarray
+TypedBuffer = array | np.ndarray
+
+
+def typed_powersort(buf: TypedBuffer, min_run_length: int | None = None, reverse: bool = False) -> TypedBuffer:
+    """
+    Sorts the typed buffer (array.array or ndarray) in-place using Powersort algorithm (see powersort.py).
+
+    Unlike the algorithms working on lists of Python objects, the typed engine works directly on the machine values,
+    (no element is ever boxed into a Python object): the runs are found in a vectorized way, the merges gallop using
+    `np.searchsorted` and move whole blocks of elements at once (see `_merge`).
+    The merge policy (which runs are merged in which order) is exactly the same as in `powersort`.
+
+    :param buf: Buffer to sort
+    :param min_run_length: (optional) Minimal length of runs to enforce
+    :param reverse: (optional) Whether to sort in decreasing order (stability is preserved); Default: false
+    :return: Sorted buffer (the same object)
+    """
+
+    return _sort_typed(buf, reverse, lambda a: _typed_powersort(a, min_run_length))
+
+
+def typed_timsort(buf: TypedBuffer, reverse: bool = False) -> TypedBuffer:
+    """
+    Sorts the typed buffer (array.array or ndarray) in-place using Timsort algorithm (see timsort.py).
+    The merge policy (the run stack invariants) is exactly the same as in `timsort`; See `typed_powersort`.
+
+    :param buf: Buffer to sort
+    :param reverse: (optional) Whether to sort in decreasing order (stability is preserved); Default: false
+    :return: Sorted buffer (the same object)
+    """
+
+    def sort_func(a: np.ndarray) -> None:
+        S = []
+        for run in _find_runs(a, MIN_RUN):
+            S.append(run)
+            while True:
+                h = len(S)
+                r1 = S[-1]
+                r2 = S[-2] if h >= 2 else None
+                r3 = S[-3] if h >= 3 else None
+                r4 = S[-4] if h >= 4 else None
+
+                if h >= 3 and len(r1) >= len(r3):
+                    # Merge r2 and r3
+                    S.pop(), S.pop(), S.pop()
+                    S.append(_merge(a, r3.start, r3.end, r2.end))
+                    S.append(r1)
+                elif (h >= 2 and len(r1) >= len(r2) or h >= 3 and len(r1) + len(r2) >= len(r3)
+                      or h >= 4 and len(r2) + len(r3) >= len(r4)):
+                    # Merge r1 and r2
+                    S.pop(), S.pop()
+                    S.append(_merge(a, r2.start, r2.end, r1.end))
+                else:
+                    break
+        while len(S) > 1:
+            r1, r2 = S.pop(), S.pop()
+            S.append(_merge(a, r2.start, r2.end, r1.end))
+
+    return _sort_typed(buf, reverse, sort_func)
+
+
+def _typed_powersort(a: np.ndarray, min_run_length: int | None, indices: np.ndarray | None = None) -> None:
+    """
+    Sorts the NumPy array in-place using Powersort's merge policy (see `typed_powersort`).
+    If `indices` are given, they are permuted along with the array (used by the argsort, see argsort.py).
+    """
+
+    n = len(a)
+    runs = _find_runs(a, min_run_length, indices)
+    X = []
+    P = []
+    r1 = runs[0]
+    for r2 in runs[1:]:
+        p = node_power(r1, r2, n)
+        while P and P[-1] > p:
+            P.pop()
+            r0 = X.pop()
+            r1 = _merge(a, r0.start, r0.end, r1.end, indices)
+        X.append(r1)
+        P.append(p)
+        r1 = r2
+    while X:
+        r0 = X.pop()
+        r1 = _merge(a, r0.start, r0.end, r1.end, indices)
+
+
+def _sort_typed(buf: TypedBuffer, reverse: bool, sort_func: Callable[[np.ndarray], None]) -> TypedBuffer:
+    """
+    Creates a NumPy view of the buffer and sorts it in-place using the given function.
+    Same as `sort_by_key`, reversing the buffer before and after the sort implements the decreasing order stably.
+    """
+
+    if isinstance(buf, array):
+        if buf.typecode not in 'bBhHiIlLqQfd':
+            raise TypeError(f"Unsupported array typecode: '{buf.typecode}'")
+        a = np.frombuffer(buf, dtype=buf.typecode) if len(buf) else np.empty(0, dtype=buf.typecode)
+    elif isinstance(buf, np.ndarray) and buf.ndim == 1 and buf.dtype.kind in 'biuf':
+        a = buf
+    else:
+        raise TypeError("Expected an array.array or a one-dimensional numeric ndarray")
+    if len(a) < 2:
+        return buf
+    if reverse:
+        a[:] = a[::-1].copy()
+    sort_func(a)
+    if reverse:
+        a[:] = a[::-1].copy()
+    return buf
+
+
+def _find_runs(a: np.ndarray, min_run_length: int | None, indices: np.ndarray | None = None) -> List[Run]:
+    """
+    Finds the run decomposition of the buffer in a vectorized way (see `_find_descents` in commons.py),
+    reversing the strictly descending runs in-place. The natural runs shorter than `min_run_length` are extended
+    by binary insertion sort (see `_insertion_sort`).
+    NaNs are ordered after all other values, as in NumPy. The `indices` (if any) are permuted along with the buffer.
+    """
+
+    n = len(a)
+    descending = a[1:] < a[:-1]
+    if a.dtype.kind == 'f':
+        descending |= np.isnan(a[:-1]) & ~np.isnan(a[1:])
+    descents = np.flatnonzero(descending)
+    if not len(descents):
+        # Already sorted
+        return [Run(0, n-1)]
+    streak_ends = np.flatnonzero(np.append(np.diff(descents) != 1, True))
+    last_descents = descents[streak_ends][np.searchsorted(streak_ends, np.arange(len(descents)))]
+    descents = array('q', np.append(descents, n-1).astype(np.int64).tobytes())
+    last_descents = array('q', last_descents.astype(np.int64).tobytes())
+
+    runs = []
+    start = 0
+    while start < n:
+        p = bisect_left(descents, start)
+        if descents[p] == start < n-1:
+            # Descending run
+            end = last_descents[p] + 1
+            a[start:end+1] = a[start:end+1][::-1].copy()
+            if indices is not None:
+                indices[start:end+1] = indices[start:end+1][::-1].copy()
+        else:
+            end = descents[p]
+        if min_run_length and end - start + 1 < min_run_length:
+            m = end + 1
+            end = min(start + min_run_length - 1, n-1)
+            _insertion_sort(a, start, m, end + 1, indices)
+        runs.append(Run(start, end))
+        start = end + 1
+    return runs
+
+
+def _merge(a: np.ndarray, l: int, m: int, r: int, indices: np.ndarray | None = None) -> Run:
+    """
+    Merges the two adjacent sorted runs a[l..m] and a[m+1..r] in-place (stably).
+
+    1. Trimming: The elements of the left run not greater than the first element of the right run, and the elements
+       of the right run not smaller than the last element of the left run, are already in their final place.
+       They are found by galloping (binary search) with `np.searchsorted`, and are never touched.
+    2. The shorter of the remaining parts is copied into a scratch array, and the parts are merged from its side
+       (see `_merge_lo` and `_merge_hi`), same as in `merge` (commons.py): the head of each part is located
+       in the other part by `np.searchsorted`, and the whole block of elements before it is moved at once
+       by a slice assignment. Therefore, the Python overhead is per block, not per element.
+       If the parts interleave finely (`INITIAL_GALLOPING_THRESHOLD` consecutive blocks of a single element,
+       mirroring Timsort leaving the galloping mode), the rest of them is merged at once by ranks (see `_rank_merge`).
+       If `indices` are given, they are moved along with the array.
+
+    :return: Representation of the merged run
+    """
+
+    lo = l + int(np.searchsorted(a[l:m+1], a[m+1], 'right'))
+    hi = m + 1 + int(np.searchsorted(a[m+1:r+1], a[m], 'left'))
+    if lo <= m < hi - 1:
+        if m + 1 - lo <= hi - m - 1:
+            _merge_lo(a, lo, m + 1, hi, indices)
+        else:
+            _merge_hi(a, lo, m + 1, hi, indices)
+    return Run(l, r)
+
+
+def _merge_lo(a: np.ndarray, lo: int, mid: int, hi: int, indices: np.ndarray | None) -> None:
+    """
+    Merges a[lo:mid] and a[mid:hi] from left to right, copying only the first part into the scratch array.
+    """
+
+    left = a[lo:mid].copy()
+    left_indices = indices[lo:mid].copy() if indices is not None else None
+    na = mid - lo
+    k = lo   # index in the original array
+    i = 0    # index in the first part (in the scratch array)
+    j = mid  # index of the second part (in the original array)
+    short_blocks = 0  # number of consecutive blocks of a single element
+    while True:
+        # Elements of the first part not greater than the head of the second part
+        count = int(np.searchsorted(left[i:], a[j], 'right'))
+        a[k:k+count] = left[i:i+count]
+        if indices is not None:
+            indices[k:k+count] = left_indices[i:i+count]
+        k += count
+        i += count
+        if i == na:
+            # The rest of the second part is already in place
+            return
+        short_blocks = short_blocks + 1 if count <= 1 else 0
+        # Elements of the second part less than the head of the first part (moved left, overlapping)
+        count = int(np.searchsorted(a[j:hi], left[i], 'left'))
+        a[k:k+count] = a[j:j+count]
+        if indices is not None:
+            indices[k:k+count] = indices[j:j+count]
+        k += count
+        j += count
+        if j == hi:
+            a[k:hi] = left[i:]
+            if indices is not None:
+                indices[k:hi] = left_indices[i:]
+            return
+        short_blocks = short_blocks + 1 if count <= 1 else 0
+        if short_blocks >= INITIAL_GALLOPING_THRESHOLD:
+            _rank_merge(a, k, left[i:], a[j:hi].copy(), indices,
+                        left_indices[i:] if indices is not None else None,
+                        indices[j:hi].copy() if indices is not None else None)
+            return
+
+
+def _merge_hi(a: np.ndarray, lo: int, mid: int, hi: int, indices: np.ndarray | None) -> None:
+    """
+    Merges a[lo:mid] and a[mid:hi] from right to left, copying only the second part into the scratch array.
+    """
+
+    right = a[mid:hi].copy()
+    right_indices = indices[mid:hi].copy() if indices is not None else None
+    k = hi          # end of the unmerged part of the original array (exclusive)
+    i = hi - mid    # end of the unmerged part of the second part (in the scratch array, exclusive)
+    j = mid         # end of the unmerged part of the first part (in the original array, exclusive)
+    short_blocks = 0  # number of consecutive blocks of a single element
+    while True:
+        # Elements of the second part not smaller than the tail of the first part
+        start = int(np.searchsorted(right[:i], a[j-1], 'left'))
+        a[k-i+start:k] = right[start:i]
+        if indices is not None:
+            indices[k-i+start:k] = right_indices[start:i]
+        short_blocks = short_blocks + 1 if i - start <= 1 else 0
+        k -= i - start
+        i = start
+        if i == 0:
+            # The rest of the first part is already in place
+            return
+        # Elements of the first part greater than the tail of the second part (moved right, overlapping)
+        start = lo + int(np.searchsorted(a[lo:j], right[i-1], 'right'))
+        a[k-j+start:k] = a[start:j]
+        if indices is not None:
+            indices[k-j+start:k] = indices[start:j]
+        short_blocks = short_blocks + 1 if j - start <= 1 else 0
+        k -= j - start
+        j = start
+        if j == lo:
+            a[lo:k] = right[:i]
+            if indices is not None:
+                indices[lo:k] = right_indices[:i]
+            return
+        if short_blocks >= INITIAL_GALLOPING_THRESHOLD:
+            _rank_merge(a, lo, a[lo:j].copy(), right[:i], indices,
+                        indices[lo:j].copy() if indices is not None else None,
+                        right_indices[:i] if indices is not None else None)
+            return
+
+
+def _rank_merge(a: np.ndarray, start: int, left: np.ndarray, right: np.ndarray, indices: np.ndarray | None,
+                left_indices: np.ndarray | None, right_indices: np.ndarray | None) -> None:
+    """
+    Merges the sorted arrays `left` and `right` (stably) into a[start:start+len(left)+len(right)]: the final position
+    of each element is its index plus the number of elements of the other array preceding it (its rank there),
+    found by a vectorized `np.searchsorted`. The `left_indices` and `right_indices` are moved into `indices` alike.
+    """
+
+    left_positions = start + np.arange(len(left)) + np.searchsorted(right, left, 'left')
+    right_positions = start + np.arange(len(right)) + np.searchsorted(left, right, 'right')
+    a[left_positions] = left
+    a[right_positions] = right
+    if indices is not None:
+        indices[left_positions] = left_indices
+        indices[right_positions] = right_indices
+
+
+def _insertion_sort(a: np.ndarray, lo: int, m: int, hi: int, indices: np.ndarray | None) -> None:
+    """
+    Extends the sorted part a[lo:m] to a[lo:hi] by binary insertion sort (same as `binary_insertion_sort`
+    in commons.py): the position of each element is found by `np.searchsorted`, and the greater elements
+    are shifted right by one slice assignment. The `indices` (if any) are moved along with the array.
+    """
+
+    for i in range(m, hi):
+        pos = lo + int(np.searchsorted(a[lo:i], a[i], 'right'))
+        if pos < i:
+            x = a[i]
+            a[pos+1:i+1] = a[pos:i]
+            a[pos] = x
+            if indices is not None:
+                idx = indices[i]
+                indices[pos+1:i+1] = indices[pos:i]
+                indices[pos] = idx
@@ -1,14 +1,57 @@
+import asyncio
+import bisect
+import gc
+import heapq
+import os
+import random
+import sys
+import threading
 import time
+import tracemalloc
+from collections import Counter
+from itertools import chain, accumulate
 from typing import Callable, Any, List, Tuple, TypeVar
 
-from benchmark_versions.merge_sort import merge_sort
-from benchmark_versions.natural_merge_sort import natural_merge_sort
-from benchmark_versions.timsort import timsort
-from benchmark_versions.powersort import powersort
-from config import SIZE_CONFIGURATIONS, N_SAMPLES, RUNS_CONFIGURATIONS, ENTROPY_CONFIGURATIONS, MIN_RUN
-
-from output_generation import plot_results, plot_minrun_results, save_to_csv, plot_galloping_results
-from random_input_generators import generate_random_list
+import numpy as np
+
+from algorithms.adaptive_sort import adaptive_sort, choose_algorithm
+from algorithms.argsort import powersort_argsort, powersort_lexsort
+from algorithms.batch_insert import insert_sorted
+from algorithms.async_sort import powersort_async, timsort_async
+from algorithms.autotuning import resolve_min_run_length, measure_average_run_length, save_profile
+from algorithms.commons import Kernel, REFERENCE_KERNEL, FAST_KERNEL
+from algorithms.instrumentation import instrumented, count_operations, CountingKey, CharCountingKey
+from algorithms.lazy_sort import top_k
+from algorithms.k_way_merge import merge_sorted, iter_merge_sorted
+from algorithms.merge_sort import merge_sort as tunable_merge_sort
+from algorithms.multiway_powersort import multiway_powersort
+from algorithms.natural_merge_sort import natural_merge_sort as tunable_natural_merge_sort
+from algorithms.powersort import powersort as tunable_powersort
+from algorithms.presortedness import run_profile, count_runs, run_entropy, estimate_presortedness
+from algorithms.string_sort import string_powersort
+from algorithms.timsort import timsort as tunable_timsort
+from config import SIZE_CONFIGURATIONS, N_SAMPLES, RUNS_CONFIGURATIONS, ENTROPY_CONFIGURATIONS, MIN_RUN, \
+    AUTOTUNING_MIN_RUN_CANDIDATES, AUTOTUNING_GALLOPING_THRESHOLD_CANDIDATES, AUTOTUNING_SIZES, \
+    ADAPTIVE_SORT_BENCHMARK_SIZE, PRESORTEDNESS_ESTIMATION_BENCHMARK_SIZE, PRESORTEDNESS_ESTIMATION_REPEATS, \
+    ARGSORT_BENCHMARK_SIZE, SHARD_MERGE_BENCHMARK_SIZE, SHARD_MERGE_SHARDS, BATCH_INSERT_BENCHMARK_SIZE, \
+    BATCH_INSERT_BATCH_SIZES, \
+    ASYNC_SORT_BENCHMARK_SIZE, ASYNC_SORT_BENCHMARK_MOVES, ASYNC_SORT_TICK_INTERVAL, TOP_K_BENCHMARK_SIZE, \
+    TOP_K_VALUES, DUPLICATES_BENCHMARK_SIZE, DUPLICATES_DISTINCT_VALUES, MAX_SCRATCH_BENCHMARK_SIZE, \
+    MAX_SCRATCH_VALUES, STRING_SORT_BENCHMARK_SIZE, STRING_SORT_PREFIX_LENGTHS, TIMING_WARMUP_RUNS, \
+    TIMING_REPETITIONS, TIMING_GC_DISABLED, MEMORY_BENCHMARK_SIZES, MEMORY_N_SAMPLES, MEMORY_RSS_MIN_SIZE, \
+    MEMORY_SAMPLING_INTERVAL
+
+from output_generation import plot_results, plot_minrun_results, save_to_csv, plot_galloping_results, \
+    plot_trimming_results, save_kernel_results_to_csv, plot_kernel_results, save_autotuning_results_to_csv, \
+    save_adaptive_sort_results_to_csv, plot_adaptive_sort_results, save_presortedness_estimation_results_to_csv, \
+    plot_presortedness_estimation_results, save_argsort_results_to_csv, plot_argsort_results, \
+    save_shard_merge_results_to_csv, save_batch_insert_results_to_csv, plot_batch_insert_results, \
+    save_async_sort_results_to_csv, plot_async_sort_results, \
+    save_top_k_results_to_csv, plot_top_k_results, save_duplicates_results_to_csv, plot_duplicates_results, \
+    save_max_scratch_results_to_csv, plot_max_scratch_results, save_string_sort_results_to_csv, \
+    plot_string_sort_results, save_timing_results_to_csv, plot_timing_results, save_memory_results_to_csv, \
+    plot_memory_results
+from random_input_generators import generate_random_list, generate_few_unique_list, generate_prefix_heavy_strings
 
 
 # Generic type of elements in the input list
@@ -22,6 +65,7 @@ def timeit(func: Callable[..., TResult]) -> Callable[..., Tuple[TResult, float]]
     Decorator function that measures the CPU execution time of the decorated function.
 
     Note: This was not used in benchmarks, but is left here for reference and potential use.
+    For robust wall-clock measurements (warmup, repetitions, median/IQR), see `time_sort`.
 
     :param func: Function whose execution time should be measured
     :return: Wrapper function that returns the original result and the execution time [ms]
@@ -34,80 +78,81 @@ def timeit(func: Callable[..., TResult]) -> Callable[..., Tuple[TResult, float]]
     return wrapper
 
 
-class Comparable:
-    """
-    Wrapper class that represents a comparable object.
-    It overrides/decorates the object's comparison magic methods to keep the global count
-    of comparisons performed on *all* Comparable instances.
+@timeit
+def run_python_sort_for_comparisons(arr: List[T]) -> Tuple[TResult, float]:
     """
+    Runs the Python reference sorting function (sorted()), extracting the number
+    of element comparisons performed during its execution and measuring its CPU execution time.
+    The comparisons are counted by the wrapped elements (see `count_operations`).
 
-    # Static variable to track the number of comparisons
-    comparison_count = 0
-
-    def __init__(self, value: Any) -> None:
-        self.value = value
-
-    def __lt__(self, other: Any) -> bool:
-        Comparable.comparison_count += 1
-        return self.value < other.value
+    :param arr: Input sequence to sort
+    :return: The number of performed comparisons, along with the execution time [ms]
+    """
 
-    def __le__(self, other: Any) -> bool:
-        Comparable.comparison_count += 1
-        return self.value <= other.value
+    sorted_arr, counters = count_operations(sorted, arr)
+    return sorted_arr, counters.comparisons
 
-    def __gt__(self, other: Any) -> bool:
-        Comparable.comparison_count += 1
-        return self.value > other.value
 
-    def __ge__(self, other: Any) -> bool:
-        Comparable.comparison_count += 1
-        return self.value >= other.value
+def run_instrumented(sort: Callable[..., List[T]], arr: List[T], **kwargs: Any) -> Tuple[TResult, float]:
+    """
+    Runs the (production) sorting function twice: once on a copy of the plain input to measure its CPU execution time,
+    and once with the instrumentation hooks enabled to count its element comparisons (see `count_operations`).
+    Therefore, the measured time does not include the overhead of counting.
 
-    def __eq__(self, other: Any) -> bool:
-        Comparable.comparison_count += 1
-        return self.value == other.value
+    :param sort: Sorting function from the algorithms directory
+    :param arr: Input sequence to sort
+    :param kwargs: Other arguments of the sorting function
+    :return: Sorted input along with the number of performed comparisons, along with the execution time [ms]
+    """
 
-    def __ne__(self, other: Any) -> bool:
-        Comparable.comparison_count += 1
-        return self.value != other.value
+    # The counted run does not use the vectorized run detection of numeric inputs (see `count_operations`),
+    # so its comparisons include the element-by-element run detection, unlike the timed one
+    arr_copy = arr.copy()
+    start_time = time.process_time()
+    sort(arr_copy, **kwargs)
+    time_taken = time.process_time() - start_time
+    sorted_arr, counters = count_operations(sort, arr, **kwargs)
+    return (sorted_arr, counters.comparisons), time_taken * 1000
 
 
-@timeit
-def run_python_sort_for_comparisons(arr: List[T]) -> Tuple[TResult, float]:
+def run_timsort(arr: List[T]) -> Tuple[TResult, float]:
     """
-    Runs the Python reference sorting function (sorted()), extracting the number
-    of element comparisons performed during its execution and measuring its CPU execution time.
-    It achieves so by wrapping the array's elements in a Comparable class, which
-    enables keeping the global comparison counter.
+    Runs Timsort, counting its comparisons and measuring its CPU execution time (see `run_instrumented`).
 
     :param arr: Input sequence to sort
-    :return: The number of performed comparisons, along with the execution time [ms]
+    :return: Sorted input along with the number of performed comparisons, along with the execution time [ms]
     """
 
-    Comparable.comparison_count = 0
-    wrapped_arr = [Comparable(x) for x in arr]
-    sorted_arr = sorted(wrapped_arr)
-    return sorted_arr, Comparable.comparison_count
+    return run_instrumented(tunable_timsort, arr)
 
 
-@timeit
-def run_timsort(arr: List[T]) -> Tuple[TResult, float]:
+def run_powersort(arr: List, min_run_length: int | None = MIN_RUN,
+                  galloping_enabled: bool = True,
+                  galloping_dynamic_threshold_enabled: bool = True,
+                  trimming_enabled: bool = False) -> Tuple[TResult, float]:
     """
-    Runs the benchmark version of Timsort and measures its CPU execution time.
+    Runs Powersort, counting its comparisons and measuring its CPU execution time (see `run_instrumented`).
 
     :param arr: Input sequence to sort
+    :param min_run_length: (optional) Minimal length of runs to enforce; Default: 32
+    :param galloping_enabled: (optional) Whether galloping mode is enabled or not; Default: true
+    :param galloping_dynamic_threshold_enabled: (optional) Whether dynamic tuning of the galloping threshold
+        is enabled or not; Default: true
+    :param trimming_enabled: (optional) Whether the runs are trimmed before merging; Default: false
     :return: Sorted input along with the number of performed comparisons, along with the execution time [ms]
     """
 
-    return timsort(arr)
+    return run_instrumented(tunable_powersort, arr, min_run_length=min_run_length,
+                            galloping_enabled=galloping_enabled,
+                            galloping_dynamic_threshold_enabled=galloping_dynamic_threshold_enabled,
+                            trimming_enabled=trimming_enabled)
 
 
-@timeit
-def run_powersort(arr: List, min_run_length: int | None = MIN_RUN,
-                  galloping_enabled: bool = True,
-                  galloping_dynamic_threshold_enabled: bool = True) -> Tuple[TResult, float]:
+def run_multiway_powersort(arr: List, min_run_length: int | None = MIN_RUN,
+                           galloping_enabled: bool = True,
+                           galloping_dynamic_threshold_enabled: bool = True) -> Tuple[TResult, float]:
     """
-    Runs the benchmark version of Powersort and measures its CPU execution time.
+    Runs 4-way Powersort, counting its comparisons and measuring its CPU execution time (see `run_instrumented`).
 
     :param arr: Input sequence to sort
     :param min_run_length: (optional) Minimal length of runs to enforce; Default: 32
@@ -117,31 +162,301 @@ def run_powersort(arr: List, min_run_length: int | None = MIN_RUN,
     :return: Sorted input along with the number of performed comparisons, along with the execution time [ms]
     """
 
-    return powersort(arr, min_run_length, galloping_enabled, galloping_dynamic_threshold_enabled)
+    return run_instrumented(multiway_powersort, arr, min_run_length=min_run_length,
+                            galloping_enabled=galloping_enabled,
+                            galloping_dynamic_threshold_enabled=galloping_dynamic_threshold_enabled)
 
 
-@timeit
 def run_natural_merge_sort(arr: List) -> Tuple[TResult, float]:
     """
-    Runs the benchmark version of Natural Merge Sort and measures its CPU execution time.
+    Runs Natural Merge Sort, counting its comparisons and measuring its CPU execution time (see `run_instrumented`).
 
     :param arr: Input sequence to sort
     :return: Sorted input along with the number of performed comparisons, along with the execution time [ms]
     """
 
-    return natural_merge_sort(arr)
+    return run_instrumented(tunable_natural_merge_sort, arr)
 
 
-@timeit
 def run_merge_sort(arr: List) -> Tuple[TResult, float]:
     """
-    Runs the benchmark version of Merge Sort and measures its CPU execution time.
+    Runs Merge Sort, counting its comparisons and measuring its CPU execution time (see `run_instrumented`).
 
     :param arr: Input sequence to sort
     :return: Sorted input along with the number of performed comparisons, along with the execution time [ms]
     """
 
-    return merge_sort(arr)
+    return run_instrumented(tunable_merge_sort, arr)
+
+
+def time_sort(sort: Callable[[List[T]], Any], arr: List[T], warmup: int = TIMING_WARMUP_RUNS,
+              repetitions: int = TIMING_REPETITIONS, gc_disabled: bool = TIMING_GC_DISABLED) -> List[int]:
+    """
+    Measures the wall-clock time of sorting the input by the given function, using `time.perf_counter_ns`.
+    Each run sorts a fresh copy of the input (copied before the timer starts).
+
+    :param sort: Sorting function
+    :param arr: Input sequence to sort (not modified)
+    :param warmup: (optional) Number of untimed runs before the timed ones (warming up the caches and the allocator);
+        Default: TIMING_WARMUP_RUNS
+    :param repetitions: (optional) Number of timed runs; Default: TIMING_REPETITIONS
+    :param gc_disabled: (optional) Whether the garbage collector is disabled during the timed runs, so that
+        its pauses do not add noise; Default: TIMING_GC_DISABLED
+    :return: Wall-clock times of the timed runs [ns]
+    """
+
+    for _ in range(warmup):
+        sort(arr.copy())
+    times = []
+    gc_was_enabled = gc.isenabled()
+    for _ in range(repetitions):
+        arr_copy = arr.copy()
+        if gc_disabled:
+            gc.disable()
+        try:
+            start_time = time.perf_counter_ns()
+            sort(arr_copy)
+            times.append(time.perf_counter_ns() - start_time)
+        finally:
+            if gc_disabled and gc_was_enabled:
+                gc.enable()
+    return times
+
+
+def timing_statistics(times: List[int], n: int) -> Tuple[float, float, float]:
+    """
+    Summarizes the wall-clock times of sorting inputs of the same length using statistics robust to outliers.
+
+    :param times: Wall-clock times [ns]
+    :param n: Length of the sorted inputs
+    :return: Median time [ms], interquartile range of the times [ms], throughput at the median time [elements/s]
+    """
+
+    q1, median, q3 = np.percentile(times, [25, 50, 75])
+    return median / 1e6, (q3 - q1) / 1e6, n / (median / 1e9)
+
+
+def benchmark_timing() -> None:
+    """
+    Runs the wall-clock timing benchmark of the sorting algorithms (the production implementations, without
+    any instrumentation), on the same kinds of inputs as the comparison benchmarks: random inputs, inputs with
+    the number of runs from `RUNS_CONFIGURATIONS`, and inputs with the run profile entropy from
+    `ENTROPY_CONFIGURATIONS`, for each size in `SIZE_CONFIGURATIONS`.
+    Each of the `N_SAMPLES` inputs is sorted `TIMING_REPETITIONS` times after `TIMING_WARMUP_RUNS` warmup runs
+    (see `time_sort`); The times of all the runs of the same size are summarized by `timing_statistics`.
+
+    Saves the results in `output/raw_data/timing_<workload>.csv` and plots them in `output/graphs/timing_<workload>.png`
+    """
+
+    algorithms = {
+        'Merge Sort': tunable_merge_sort,
+        'Natural Merge Sort': tunable_natural_merge_sort,
+        'Timsort': tunable_timsort,
+        'Powersort': lambda arr: tunable_powersort(arr, MIN_RUN, True, True),
+        '4-way Powersort': lambda arr: multiway_powersort(arr, MIN_RUN, True, True),
+        'Python .sort()': list.sort,
+    }
+    workloads = {'random': {}}
+    workloads.update({f'runs_{config_name}': {'number_of_runs': factor}
+                      for config_name, factor in RUNS_CONFIGURATIONS.items()})
+    workloads.update({f'entropy_{config_name}': {'entropy_range': entropy_interval}
+                      for config_name, entropy_interval in ENTROPY_CONFIGURATIONS.items()})
+    for workload, options in workloads.items():
+        results = {}
+        for arr_sizes in SIZE_CONFIGURATIONS:
+            for arr_size in arr_sizes:
+                print(f"Running TIMING benchmark ({workload}) for N={arr_size}")
+                bounds = (0, arr_size * 100)
+                if 'number_of_runs' in options:
+                    n_runs = arr_size // options['number_of_runs']
+                    if not n_runs:
+                        continue
+                    inputs = [generate_random_list(arr_size, bounds, number_of_runs=n_runs) for _ in range(N_SAMPLES)]
+                else:
+                    inputs = [generate_random_list(arr_size, bounds, **options) for _ in range(N_SAMPLES)]
+                results[arr_size] = {
+                    name: timing_statistics([t for arr in inputs for t in time_sort(sort, arr)], arr_size)
+                    for name, sort in algorithms.items()
+                }
+        save_timing_results_to_csv(results, f"timing_{workload}")
+        plot_timing_results(results, f"Wall-clock time ({workload})", f"timing_{workload}")
+
+
+class MemorySampler(threading.Thread):
+    """
+    Background thread sampling the resident set size (RSS) of the process, keeping the peak value above
+    the baseline (the value at the start of the sampling); None if the RSS cannot be read.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(daemon=True)
+        self.stopped = threading.Event()
+        self.baseline_rss = _resident_set_size()
+        self.peak_rss = 0 if self.baseline_rss is not None else None
+
+    def run(self) -> None:
+        while self.peak_rss is not None:
+            self.peak_rss = max(self.peak_rss, _resident_set_size() - self.baseline_rss)
+            if self.stopped.wait(MEMORY_SAMPLING_INTERVAL):
+                break
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.join()
+
+
+class BlockProfiler:
+    """
+    Profile function (see `sys.setprofile`) reading the number of memory blocks currently allocated
+    by the interpreter (`sys.getallocatedblocks`) at every function call and return of the profiled thread,
+    i.e., around every merge (and every other function called by the sort), deterministically.
+    Keeps the peak number of blocks above the baseline (the number at the start of the profiling), and the number
+    of allocated blocks: the sum of the increases between the consecutive calls and returns. It is a lower bound
+    of the number of allocations, since a block allocated and freed in between two of them is not seen.
+    """
+
+    def __init__(self) -> None:
+        self.baseline_blocks = sys.getallocatedblocks()
+        self.last_blocks = self.baseline_blocks
+        self.peak_blocks = 0
+        self.allocated_blocks = 0
+
+    def __call__(self, frame: Any, event: str, arg: Any) -> None:
+        blocks = sys.getallocatedblocks()
+        if blocks > self.last_blocks:
+            self.allocated_blocks += blocks - self.last_blocks
+            self.peak_blocks = max(self.peak_blocks, blocks - self.baseline_blocks)
+        self.last_blocks = blocks
+
+
+def _resident_set_size() -> int | None:
+    """
+    Returns the current resident set size of the process [B], or None if it cannot be read (non-Linux systems).
+    """
+
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+
+def measure_memory(sort: Callable[[List[T]], Any], arr: List[T]) -> Tuple[int, int, int, int, int, int | None]:
+    """
+    Measures the extra memory allocated by sorting the input by the given function (on top of the input itself,
+    which is copied before the measurement).
+
+    The sort is run twice:
+    1. Traced by `tracemalloc`: the exact peak of the traced memory during the sort, and the blocks (and bytes)
+       still allocated after it, found by comparing the snapshots taken before and after the sort
+       (`Snapshot.compare_to`, after collecting the garbage; e.g., caches or leaks).
+    2. Untraced (tracemalloc's own bookkeeping would distort these values), profiled by `BlockProfiler`:
+       the peak number of extra allocated blocks and the number of blocks allocated by the sort, read around
+       every function call. Neither tracemalloc nor the interpreter counts the allocations themselves, so the latter
+       is a lower bound: the blocks allocated and freed within a single function call without calling any other
+       function are not seen (e.g., the temporary slices of a merge loop, or all the allocations of the builtin
+       sort, which calls no Python functions). Along with it, the peak extra RSS is sampled by `MemorySampler`
+       for inputs of at least `MEMORY_RSS_MIN_SIZE` elements. The sampled RSS may miss short-lived peaks, and it
+       only grows when the interpreter requests new memory from the system (memory freed by earlier sorts
+       is reused first).
+
+    :param sort: Sorting function
+    :param arr: Input sequence to sort (not modified)
+    :return: Peak extra traced memory [B], retained blocks, retained memory [B], peak extra allocated blocks,
+        allocated blocks (a lower bound of the allocations), peak extra RSS [B] (or None if not sampled)
+    """
+
+    arr_copy = arr.copy()
+    gc.collect()
+    tracemalloc.start()
+    # The snapshots themselves are not part of the sort
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    before = tracemalloc.take_snapshot().filter_traces(filters)
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    sort(arr_copy)
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    # Garbage in reference cycles (e.g., of the merge generators) is not retained
+    gc.collect()
+    after = tracemalloc.take_snapshot().filter_traces(filters)
+    tracemalloc.stop()
+    differences = after.compare_to(before, 'filename')
+    retained_blocks = sum(stat.count_diff for stat in differences)
+    retained_bytes = sum(stat.size_diff for stat in differences)
+
+    arr_copy = arr.copy()
+    gc.collect()
+    switch_interval = sys.getswitchinterval()
+    sampler = MemorySampler() if len(arr) >= MEMORY_RSS_MIN_SIZE else None
+    if sampler is not None:
+        # The sampling thread gets the GIL more often, so that it does not miss the peaks
+        sys.setswitchinterval(MEMORY_SAMPLING_INTERVAL / 10)
+        sampler.start()
+    # Created after the sampler, whose own blocks are not part of the sort; Only the current thread is profiled
+    profiler = BlockProfiler()
+    sys.setprofile(profiler)
+    try:
+        sort(arr_copy)
+    finally:
+        sys.setprofile(None)
+        if sampler is not None:
+            sampler.stop()
+            sys.setswitchinterval(switch_interval)
+    return (peak, retained_blocks, retained_bytes, profiler.peak_blocks, profiler.allocated_blocks,
+            None if sampler is None else sampler.peak_rss)
+
+
+def benchmark_memory() -> None:
+    """
+    Runs the memory benchmark of the sorting algorithms (the production implementations): measures the peak extra
+    memory, the blocks and bytes retained after the sort, the peak number of extra allocated blocks, the number
+    of allocated blocks (a lower bound of the allocations) and the peak extra RSS (see `measure_memory`)
+    of each algorithm,
+    for each size in `MEMORY_BENCHMARK_SIZES` and each presortedness in `RUNS_CONFIGURATIONS`,
+    averaged over `MEMORY_N_SAMPLES` inputs.
+
+    Saves the results in `output/raw_data/memory.csv` and plots the peak extra memory per element
+    in `output/graphs/memory.png`
+    """
+
+    algorithms = {
+        'Merge Sort': tunable_merge_sort,
+        'Natural Merge Sort': tunable_natural_merge_sort,
+        'Timsort': tunable_timsort,
+        'Powersort': lambda arr: tunable_powersort(arr, MIN_RUN, True, True),
+        '4-way Powersort': lambda arr: multiway_powersort(arr, MIN_RUN, True, True),
+        'Python .sort()': list.sort,
+    }
+    results = {}
+    for config_name, factor in RUNS_CONFIGURATIONS.items():
+        results[config_name] = {}
+        for arr_size in MEMORY_BENCHMARK_SIZES:
+            print(f"Running MEMORY benchmark ({config_name}) for N={arr_size}")
+            bounds = (0, arr_size * 100)
+            sums = {name: [0, 0, 0, 0, 0, 0] for name in algorithms}
+            sample_rss = True
+            for _ in range(MEMORY_N_SAMPLES):
+                arr = generate_random_list(arr_size, bounds, arr_size // factor)
+                for name, sort in algorithms.items():
+                    *measures, rss = measure_memory(sort, arr)
+                    for i, value in enumerate(measures):
+                        sums[name][i] += value
+                    if rss is None:
+                        sample_rss = False
+                    else:
+                        sums[name][5] += rss
+            results[config_name][arr_size] = {
+                name: (*(total / MEMORY_N_SAMPLES for total in totals[:5]),
+                       totals[5] / MEMORY_N_SAMPLES if sample_rss else None)
+                for name, totals in sums.items()
+            }
+            for name, (peak, retained_blocks, _, peak_blocks, allocated_blocks, _) \
+                    in results[config_name][arr_size].items():
+                print(f"{name}: {peak / arr_size:.1f} B/element, {peak_blocks:.0f} peak allocated blocks, "
+                      f"{allocated_blocks:.0f} allocated blocks, {retained_blocks:.0f} retained blocks")
+
+    save_memory_results_to_csv(results, "memory")
+    plot_memory_results(results, "Peak extra memory per element", "memory")
 
 
 def benchmark_minrun_impact() -> None:
@@ -207,6 +522,649 @@ def benchmark_galloping_impact() -> None:
                            "galloping_impact_comparisons", xlog=True)
 
 
+def benchmark_trimming_impact() -> None:
+    """
+    Runs the benchmark for the impact of pre-merge trimming (using galloping) in Powersort.
+    Measures the difference in the number of comparisons and in the number of element moves (see `Counters`) between
+    the Powersort version that trims the runs before merging them and the one that does not.
+
+    Plots the results in `output/graphs/trimming_impact.png`
+    """
+
+    results = {}
+    n_runs = 200
+    for arr_sizes in SIZE_CONFIGURATIONS:
+        for arr_size in arr_sizes:
+            print(f"Running TRIMMING benchmark for N={arr_size}")
+            # Set the value range to (0, N*100)
+            # Not really important as long as the "high" value is reasonably large (=> not too many equal values).
+            bounds = (0, arr_size*100)
+            sum_comparisons = 0
+            sum_writes = 0
+            for _ in range(N_SAMPLES):
+                arr = generate_random_list(arr_size, bounds, number_of_runs=arr_size//n_runs)
+                _, without = count_operations(tunable_powersort, arr, min_run_length=MIN_RUN, galloping_enabled=True,
+                                              galloping_dynamic_threshold_enabled=True, trimming_enabled=False)
+                _, with_trimming = count_operations(tunable_powersort, arr, min_run_length=MIN_RUN,
+                                                    galloping_enabled=True, galloping_dynamic_threshold_enabled=True,
+                                                    trimming_enabled=True)
+                sum_comparisons += (with_trimming.comparisons-without.comparisons)/without.comparisons
+                sum_writes += (with_trimming.moves-without.moves)/without.moves
+            results[arr_size] = (0, sum_comparisons/N_SAMPLES, sum_writes/N_SAMPLES)
+
+    plot_trimming_results(results, "Array size", "# of key comparisons / element moves [% diff]",
+                          f"Performance impact of pre-merge trimming (number of runs is N/{n_runs})",
+                          "trimming_impact", xlog=True)
+
+
+def benchmark_kernels() -> None:
+    """
+    Runs the benchmark of the kernels of the primitive operations (see `Kernel` in algorithms/commons.py).
+    Measures the CPU time of each primitive operation in the 'reference' kernel and in the 'fast' kernel,
+    performed on the same random inputs (the largest array size from `SIZE_CONFIGURATIONS`).
+
+    Saves the results in `output/raw_data/kernel_speedup.csv` and plots them in `output/graphs/kernel_speedup.png`
+    """
+
+    arr_size = SIZE_CONFIGURATIONS[-1][-1]
+    n_operations = 10_000
+    print(f"Running KERNELS benchmark for N={arr_size}")
+    arr = sorted(random.randint(0, arr_size*100) for _ in range(arr_size))
+    # Gallops (and descending runs) typically span a few elements, so the distances are distributed exponentially
+    starts = [random.randrange(arr_size) for _ in range(n_operations)]
+    distances = [int(2 ** random.uniform(0, 12)) for _ in range(n_operations)]
+    chunks = [[random.randint(0, arr_size*100) for _ in range(MIN_RUN)] for _ in range(n_operations)]
+
+    def binary_search(kernel: Kernel) -> None:
+        for start in starts:
+            kernel.binary_search(arr, arr[start], 0, arr_size)
+
+    def binary_insertion_sort(kernel: Kernel) -> None:
+        for chunk in [chunk.copy() for chunk in chunks]:
+            kernel.binary_insertion_sort(chunk, 0, MIN_RUN-1, 0)
+
+    def gallop(kernel: Kernel) -> None:
+        for start, distance in zip(starts, distances):
+            kernel.gallop(arr, start, arr[min(start+distance, arr_size-1)], True)
+
+    def gallop_reversed(kernel: Kernel) -> None:
+        for start, distance in zip(starts, distances):
+            kernel.gallop_reversed(arr, 0, start, arr[max(start-distance, 0)], True)
+
+    def reverse(kernel: Kernel) -> None:
+        # Reversed twice, so that the array stays sorted
+        for start, distance in zip(starts, distances):
+            kernel.reverse(arr, start, min(start+distance, arr_size-1))
+            kernel.reverse(arr, start, min(start+distance, arr_size-1))
+
+    results = {}
+    for primitive in (binary_search, binary_insertion_sort, gallop, gallop_reversed, reverse):
+        times = []
+        for kernel in (REFERENCE_KERNEL, FAST_KERNEL):
+            time_taken = 0
+            for _ in range(N_SAMPLES):
+                start_time = time.process_time()
+                primitive(kernel)
+                time_taken += time.process_time() - start_time
+            times.append(time_taken / N_SAMPLES * 1000)
+        results[primitive.__name__] = (times[0], times[1])
+        print(f"{primitive.__name__}: {times[0]:.2f} ms -> {times[1]:.2f} ms ({times[0]/times[1]:.2f}x)")
+
+    save_kernel_results_to_csv(results, "kernel_speedup")
+    plot_kernel_results(results, f"Speedup of the 'fast' kernel over the 'reference' kernel (N={arr_size})",
+                        "kernel_speedup")
+
+
+def benchmark_autotuning(objective: str = 'time') -> None:
+    """
+    Runs the autotuning benchmark, searching for the best `min_run_length` and initial galloping threshold
+    of Powersort (with galloping and its dynamic threshold enabled) and Timsort for each workload.
+    All pairs of the candidate values (see `AUTOTUNING_MIN_RUN_CANDIDATES`, `AUTOTUNING_GALLOPING_THRESHOLD_CANDIDATES`)
+    are measured on random inputs of each size in `AUTOTUNING_SIZES` and each presortedness in `RUNS_CONFIGURATIONS`,
+    both by the number of comparisons and by the wall time.
+
+    Saves the best parameters for each workload as the tuned profile in `AUTOTUNING_PROFILE_PATH`
+    (used by `powersort`/`timsort` called with `auto_tuned=True`), and the results of all candidates
+    in `output/raw_data/autotuning_sweep.csv`
+
+    :param objective: (optional) What the best parameters minimize, 'time' or 'comparisons'; Default: 'time'
+    """
+
+    algorithms = {
+        'powersort': lambda arr, min_run_length, threshold: tunable_powersort(
+            arr, min_run_length, galloping_enabled=True, galloping_dynamic_threshold_enabled=True,
+            galloping_threshold=threshold),
+        'timsort': lambda arr, min_run_length, threshold: tunable_timsort(
+            arr, min_run_length=min_run_length, galloping_threshold=threshold),
+    }
+    profile = {}
+    rows = []
+    for name, sort in algorithms.items():
+        profile[name] = []
+        for arr_size in AUTOTUNING_SIZES:
+            for config_name, factor in RUNS_CONFIGURATIONS.items():
+                print(f"Running AUTOTUNING benchmark for {name}, N={arr_size}, runs={config_name}")
+                bounds = (0, arr_size*100)
+                arrs = [generate_random_list(arr_size, bounds, number_of_runs=arr_size//factor)
+                        for _ in range(N_SAMPLES)]
+                avg_run_length = sum(map(measure_average_run_length, arrs)) / N_SAMPLES
+                entries = []
+                for min_run_length in AUTOTUNING_MIN_RUN_CANDIDATES:
+                    for threshold in AUTOTUNING_GALLOPING_THRESHOLD_CANDIDATES:
+                        sum_comparisons = 0
+                        sum_time = 0
+                        for arr in arrs:
+                            resolved_min_run_length = resolve_min_run_length(min_run_length, arr_size)
+                            start_time = time.perf_counter()
+                            sort(arr.copy(), resolved_min_run_length, threshold)
+                            sum_time += time.perf_counter() - start_time
+                            _, counters = count_operations(sort, arr, min_run_length=resolved_min_run_length,
+                                                           threshold=threshold)
+                            sum_comparisons += counters.comparisons
+                        entries.append({'n': arr_size, 'avg_run_length': avg_run_length,
+                                        'min_run_length': min_run_length, 'galloping_threshold': threshold,
+                                        'comparisons': sum_comparisons / N_SAMPLES,
+                                        'time_ms': sum_time / N_SAMPLES * 1000})
+                rows.extend((name, *entry.values()) for entry in entries)
+                best = min(entries, key=lambda entry: entry['time_ms' if objective == 'time' else 'comparisons'])
+                profile[name].append(best)
+                print(f"Best: min_run_length={best['min_run_length']}, "
+                      f"galloping_threshold={best['galloping_threshold']}")
+
+    save_profile(profile)
+    save_autotuning_results_to_csv(rows, "autotuning_sweep")
+
+
+def benchmark_adaptive_sort() -> None:
+    """
+    Runs the benchmark of the algorithm dispatcher (see `adaptive_sort` in algorithms/adaptive_sort.py).
+    Compares the number of comparisons of the dispatcher, including the comparisons spent on measuring the input,
+    with the number of comparisons of each of the algorithms it chooses from, used for all inputs.
+    The inputs of each presortedness in `RUNS_CONFIGURATIONS` and `ENTROPY_CONFIGURATIONS` are of length
+    `ADAPTIVE_SORT_BENCHMARK_SIZE`; The last workload ('total') sums up all the others.
+
+    Saves the results in `output/raw_data/adaptive_sort.csv` and plots them in `output/graphs/adaptive_sort.png`
+    """
+
+    algorithms = {
+        'Merge Sort': tunable_merge_sort,
+        'Natural Merge Sort': tunable_natural_merge_sort,
+        'Timsort': tunable_timsort,
+        'Powersort': tunable_powersort,
+        'Python .sort()': sorted,
+        'Adaptive sort': adaptive_sort,
+    }
+    arr_size = ADAPTIVE_SORT_BENCHMARK_SIZE
+    bounds = (0, arr_size * 100)
+    workloads = {config_name: {'number_of_runs': arr_size // factor}
+                 for config_name, factor in RUNS_CONFIGURATIONS.items()}
+    workloads.update({config_name: {'entropy_range': entropy_range}
+                      for config_name, entropy_range in ENTROPY_CONFIGURATIONS.items()})
+    results = {}
+    choices = {}
+    for config_name, properties in workloads.items():
+        print(f"Running ADAPTIVE SORT benchmark ({config_name}) for N={arr_size}")
+        sums = dict.fromkeys(algorithms, 0)
+        chosen = Counter()
+        for _ in range(N_SAMPLES):
+            arr = generate_random_list(arr_size, bounds, **properties)
+            chosen[choose_algorithm(run_profile(arr))] += 1
+            for name, sort in algorithms.items():
+                _, counters = count_operations(sort, arr)
+                sums[name] += counters.comparisons
+        results[config_name] = {name: total / N_SAMPLES for name, total in sums.items()}
+        choices[config_name] = chosen.most_common(1)[0][0]
+        print(f"Chosen: {choices[config_name]}")
+    results['total'] = {name: sum(data[name] for data in results.values()) for name in algorithms}
+    choices['total'] = '-'
+
+    save_adaptive_sort_results_to_csv(results, choices, "adaptive_sort")
+    plot_adaptive_sort_results(results, 'Adaptive sort',
+                               f"Comparisons of the fixed algorithms relative to the dispatcher (N={arr_size})",
+                               "adaptive_sort")
+
+
+def benchmark_presortedness_estimation() -> None:
+    """
+    Validates the sampling estimator of presortedness (see `estimate_presortedness` in algorithms/presortedness.py)
+    against the exact measures, on inputs of length `PRESORTEDNESS_ESTIMATION_BENCHMARK_SIZE` of each presortedness
+    in `RUNS_CONFIGURATIONS` and `ENTROPY_CONFIGURATIONS`. Each input is estimated `PRESORTEDNESS_ESTIMATION_REPEATS`
+    times (with different random positions). Measures how often the confidence bounds contain the exact value
+    (the coverage, which should be close to the confidence level of the bounds), the bias of the estimates
+    (see `estimate_presortedness`) and the number of comparisons of the estimator. The number of comparisons
+    does not grow with N, so the estimator reads a much smaller part of longer inputs.
+
+    Saves the results in `output/raw_data/presortedness_estimation.csv`
+    and plots them in `output/graphs/presortedness_estimation.png`
+    """
+
+    arr_size = PRESORTEDNESS_ESTIMATION_BENCHMARK_SIZE
+    bounds = (0, arr_size * 100)
+    workloads = {config_name: {'number_of_runs': arr_size // factor}
+                 for config_name, factor in RUNS_CONFIGURATIONS.items()}
+    workloads.update({config_name: {'entropy_range': entropy_range}
+                      for config_name, entropy_range in ENTROPY_CONFIGURATIONS.items()})
+    results = {}
+    for config_name, properties in workloads.items():
+        print(f"Running PRESORTEDNESS ESTIMATION benchmark ({config_name}) for N={arr_size}")
+        sums = [0.] * 11
+        for _ in range(N_SAMPLES):
+            arr = generate_random_list(arr_size, bounds, **properties)
+            runs = count_runs(arr)
+            entropy = run_entropy(arr)
+            for _ in range(PRESORTEDNESS_ESTIMATION_REPEATS):
+                estimate = estimate_presortedness(arr)
+                row = (runs, *estimate.runs, (estimate.runs.low <= runs <= estimate.runs.high) * 100,
+                       entropy, *estimate.entropy, (estimate.entropy.low <= entropy <= estimate.entropy.high) * 100,
+                       estimate.comparisons / arr_size * 100)
+                sums = [total + value for total, value in zip(sums, row)]
+        results[config_name] = tuple(total / (N_SAMPLES * PRESORTEDNESS_ESTIMATION_REPEATS) for total in sums)
+        print(f"Runs: {results[config_name][0]:.0f}, estimated {results[config_name][1]:.0f} "
+              f"(coverage {results[config_name][4]:.0f}%); "
+              f"Entropy: {results[config_name][5]:.3f}, estimated {results[config_name][6]:.3f} "
+              f"(bias {results[config_name][6] - results[config_name][5]:+.3f}, "
+              f"coverage {results[config_name][9]:.0f}%)")
+
+    save_presortedness_estimation_results_to_csv(results, "presortedness_estimation")
+    plot_presortedness_estimation_results(results, f"Sampling estimator of presortedness (N={arr_size})",
+                                          "presortedness_estimation")
+
+
+def benchmark_argsort() -> None:
+    """
+    Runs the benchmark of the argsort and the multi-column lexsort (see algorithms/argsort.py).
+    Compares the CPU time of `powersort_argsort` with `np.argsort(kind='stable')` and of `powersort_lexsort`
+    with `np.lexsort` on inputs of length `ARGSORT_BENCHMARK_SIZE` of each presortedness in `RUNS_CONFIGURATIONS`:
+    - int: integer keys (packed with the index)
+    - float: the same keys as floats (sorted along with the array of indices)
+    - lexsort (int): two integer columns, the key split into its quotient and remainder by 1000 (packed)
+    - lexsort (int, float): the same columns, the second one as floats (groups of ties sorted one by one)
+    The order of the rows by the columns is the same as the order of the keys, so the tables are equally presorted.
+
+    Saves the results in `output/raw_data/argsort.csv` and plots them in `output/graphs/argsort.png`
+    """
+
+    arr_size = ARGSORT_BENCHMARK_SIZE
+    bounds = (0, arr_size * 100)
+    cases = {
+        'int': (lambda keys: powersort_argsort(keys), lambda keys: np.argsort(keys, kind='stable')),
+        'float': (lambda keys: powersort_argsort(keys / 7), lambda keys: np.argsort(keys / 7, kind='stable')),
+        'lexsort (int)': (lambda keys: powersort_lexsort([keys // 1000, keys % 1000]),
+                          lambda keys: np.lexsort([keys % 1000, keys // 1000])),
+        'lexsort (int, float)': (lambda keys: powersort_lexsort([keys // 1000, keys % 1000 / 7]),
+                                 lambda keys: np.lexsort([keys % 1000 / 7, keys // 1000])),
+    }
+    results = {}
+    for config_name, factor in RUNS_CONFIGURATIONS.items():
+        print(f"Running ARGSORT benchmark ({config_name}) for N={arr_size}")
+        sums = {case: [0., 0.] for case in cases}
+        for _ in range(N_SAMPLES):
+            keys = np.array(generate_random_list(arr_size, bounds, arr_size // factor))
+            for case, sorts in cases.items():
+                for i, sort in enumerate(sorts):
+                    start_time = time.process_time()
+                    sort(keys)
+                    sums[case][i] += time.process_time() - start_time
+        results[config_name] = {case: (powersort_time / N_SAMPLES * 1000, numpy_time / N_SAMPLES * 1000)
+                                for case, (powersort_time, numpy_time) in sums.items()}
+        for case, (powersort_time, numpy_time) in results[config_name].items():
+            print(f"{case}: {powersort_time:.2f} ms (NumPy: {numpy_time:.2f} ms)")
+
+    save_argsort_results_to_csv(results, "argsort")
+    plot_argsort_results(results, f"CPU time of the Powersort argsort relative to NumPy (N={arr_size})", "argsort")
+
+
+def benchmark_shard_merge() -> None:
+    """
+    Runs the benchmark of merging pre-sorted shards (see algorithms/k_way_merge.py).
+    Compares the number of comparisons of `merge_sorted` and `iter_merge_sorted` with concatenating the shards
+    and sorting them by Powersort (with the same galloping and trimming), and with `heapq.merge`.
+    There are `SHARD_MERGE_SHARDS` shards of random values of the total length `SHARD_MERGE_BENCHMARK_SIZE`,
+    their lengths being:
+    - equal: all the same
+    - log-uniform: distributed log-uniformly, i.e., of very different sizes
+    - one large: half of the elements in a single shard, the rest split equally
+
+    Saves the results in `output/raw_data/shard_merge.csv` and plots them in `output/graphs/shard_merge.png`
+    """
+
+    arr_size = SHARD_MERGE_BENCHMARK_SIZE
+    k = SHARD_MERGE_SHARDS
+    bounds = (0, arr_size * 100)
+    algorithms = {
+        'Concatenate + Powersort': lambda shards: tunable_powersort(list(chain.from_iterable(shards)), None, True,
+                                                                    False, True, key=CountingKey),
+        'heapq.merge': lambda shards: list(heapq.merge(*shards, key=CountingKey)),
+        'Streaming merge': lambda shards: list(iter_merge_sorted(shards, key=CountingKey)),
+        'Merge sorted': lambda shards: merge_sorted(shards, key=CountingKey),
+    }
+    weights = {
+        'equal': lambda: [1.] * k,
+        'log-uniform': lambda: [2 ** random.uniform(0, 12) for _ in range(k)],
+        'one large': lambda: [k - 1.] + [1.] * (k - 1),
+    }
+    results = {}
+    for config_name, generate_weights in weights.items():
+        print(f"Running SHARD MERGE benchmark ({config_name}) for N={arr_size}, k={k}")
+        sums = dict.fromkeys(algorithms, 0)
+        for _ in range(N_SAMPLES):
+            shard_weights = generate_weights()
+            total_weight = sum(shard_weights)
+            cuts = [0] + [round(arr_size * w / total_weight) for w in accumulate(shard_weights)]
+            shards = [sorted(random.randint(*bounds) for _ in range(end - start)) for start, end in zip(cuts, cuts[1:])]
+            for name, merge_shards in algorithms.items():
+                with instrumented() as counters:
+                    merge_shards(shards)
+                sums[name] += counters.comparisons
+        results[config_name] = {name: total / N_SAMPLES for name, total in sums.items()}
+        print(", ".join(f"{name}: {comparisons:.0f}" for name, comparisons in results[config_name].items()))
+
+    save_shard_merge_results_to_csv(results, "shard_merge")
+    plot_adaptive_sort_results(results, 'Merge sorted',
+                               f"Comparisons relative to merge_sorted (N={arr_size}, k={k})", "shard_merge")
+
+
+def benchmark_batch_insert() -> None:
+    """
+    Runs the benchmark of inserting batches into a sorted list (see `insert_sorted` in algorithms/batch_insert.py).
+    Compares `insert_sorted` with appending the batch and sorting the list again by Powersort (with galloping),
+    and with inserting the elements one by one by `bisect.insort`, for each of the batch sizes
+    in `BATCH_INSERT_BATCH_SIZES` inserted into a sorted list of `BATCH_INSERT_BENCHMARK_SIZE` random elements.
+    'insert_sorted (delete)' also deletes as many random elements as it inserts, in the same pass.
+    Measures both the number of comparisons and the CPU time (on plain integers, without counting the comparisons).
+
+    Saves the results in `output/raw_data/batch_insert.csv` and plots them in `output/graphs/batch_insert.png`
+    """
+
+    arr_size = BATCH_INSERT_BENCHMARK_SIZE
+    bounds = (0, arr_size * 100)
+
+    def insort(arr: List, batch: List, _: List[bool]) -> None:
+        for x in batch:
+            bisect.insort(arr, x)
+
+    algorithms = {
+        'Append + Powersort': lambda arr, batch, _: tunable_powersort(arr + batch, None, True),
+        'bisect.insort': insort,
+        'insert_sorted': lambda arr, batch, _: insert_sorted(arr, batch),
+        'insert_sorted (delete)': lambda arr, batch, mask: insert_sorted(arr, batch, delete=mask),
+    }
+    results = {}
+    for batch_size in BATCH_INSERT_BATCH_SIZES:
+        print(f"Running BATCH INSERT benchmark for N={arr_size}, batch size={batch_size}")
+        sums = {name: [0., 0.] for name in algorithms}
+        for _ in range(N_SAMPLES):
+            arr = sorted(random.randint(*bounds) for _ in range(arr_size))
+            batch = [random.randint(*bounds) for _ in range(batch_size)]
+            mask = [False] * arr_size
+            for i in random.sample(range(arr_size), batch_size):
+                mask[i] = True
+            counting_arr = [CountingKey(x) for x in arr]
+            counting_batch = [CountingKey(x) for x in batch]
+            for name, insert in algorithms.items():
+                with instrumented() as counters:
+                    insert(counting_arr.copy(), counting_batch, mask)
+                sums[name][0] += counters.comparisons
+                arr_copy = arr.copy()
+                start_time = time.process_time()
+                insert(arr_copy, batch, mask)
+                sums[name][1] += time.process_time() - start_time
+        results[batch_size] = {name: (comparisons / N_SAMPLES, time_taken / N_SAMPLES * 1000)
+                               for name, (comparisons, time_taken) in sums.items()}
+        print(", ".join(f"{name}: {comparisons:.0f} comparisons, {time_taken:.2f} ms"
+                        for name, (comparisons, time_taken) in results[batch_size].items()))
+
+    save_batch_insert_results_to_csv(results, "batch_insert")
+    plot_batch_insert_results(results, f"Inserting a batch into a sorted list (N={arr_size})", "batch_insert")
+
+
+def benchmark_async_sort() -> None:
+    """
+    Runs the benchmark of the asynchronous sorts (see algorithms/async_sort.py), measuring the latency
+    of the other coroutines of the event loop during a long sort. A coroutine sleeping for `ASYNC_SORT_TICK_INTERVAL`
+    in a loop measures how late it wakes up, while a random input of length `ASYNC_SORT_BENCHMARK_SIZE` is sorted by:
+    - Powersort and Timsort called directly from a coroutine (blocking the event loop for the whole sort)
+    - `powersort_async` yielding after each of the numbers of moves in `ASYNC_SORT_BENCHMARK_MOVES`
+    - `timsort_async` yielding after the default number of moves
+
+    Saves the results in `output/raw_data/async_sort.csv` and plots them in `output/graphs/async_sort.png`
+    """
+
+    arr_size = ASYNC_SORT_BENCHMARK_SIZE
+
+    async def blocking_powersort(arr: List) -> None:
+        tunable_powersort(arr)
+
+    async def blocking_timsort(arr: List) -> None:
+        tunable_timsort(arr)
+
+    variants = {'Powersort (blocking)': blocking_powersort}
+    for moves in ASYNC_SORT_BENCHMARK_MOVES:
+        variants[f'powersort_async ({moves} moves)'] = lambda arr, moves=moves: powersort_async(arr,
+                                                                                                moves_per_step=moves)
+    variants['Timsort (blocking)'] = blocking_timsort
+    variants['timsort_async'] = timsort_async
+
+    async def measure(sort: Callable[[List], Any], arr: List) -> Tuple[float, List[float]]:
+        latencies = []
+        sorting = True
+
+        async def tick() -> None:
+            while sorting:
+                expected = time.perf_counter() + ASYNC_SORT_TICK_INTERVAL
+                await asyncio.sleep(ASYNC_SORT_TICK_INTERVAL)
+                latencies.append(max(0., time.perf_counter() - expected) * 1000)
+
+        ticker = asyncio.create_task(tick())
+        await asyncio.sleep(0)
+        start_time = time.perf_counter()
+        await sort(arr)
+        time_taken = time.perf_counter() - start_time
+        sorting = False
+        await ticker
+        return time_taken * 1000, latencies
+
+    results = {}
+    for name, sort in variants.items():
+        print(f"Running ASYNC SORT benchmark ({name}) for N={arr_size}")
+        time_taken = 0.
+        latencies = []
+        for _ in range(N_SAMPLES):
+            arr = [random.randint(0, arr_size * 100) for _ in range(arr_size)]
+            sample_time, sample_latencies = asyncio.run(measure(sort, arr))
+            time_taken += sample_time
+            latencies.extend(sample_latencies)
+        latencies.sort()
+        results[name] = (time_taken / N_SAMPLES, latencies[len(latencies) // 2],
+                         latencies[int(len(latencies) * 0.99)], latencies[-1])
+        print(f"Sort: {results[name][0]:.0f} ms, latency: median {results[name][1]:.2f} ms, "
+              f"p99 {results[name][2]:.2f} ms, max {results[name][3]:.2f} ms")
+
+    save_async_sort_results_to_csv(results, "async_sort")
+    plot_async_sort_results(results, f"Event loop latency during a sort (N={arr_size})", "async_sort")
+
+
+def benchmark_top_k() -> None:
+    """
+    Runs the benchmark of finding the k smallest elements (see `top_k` in algorithms/lazy_sort.py).
+    Compares the number of comparisons of `top_k` (consuming the first k elements of the lazy merge tree)
+    with sorting the whole input by Powersort (with galloping) and taking the first k elements, and with
+    `heapq.nsmallest`, for each k in `TOP_K_VALUES`, on inputs of length `TOP_K_BENCHMARK_SIZE`
+    of each presortedness in `RUNS_CONFIGURATIONS`.
+
+    Saves the results in `output/raw_data/top_k.csv` and plots them in `output/graphs/top_k.png`
+    """
+
+    arr_size = TOP_K_BENCHMARK_SIZE
+    bounds = (0, arr_size * 100)
+    algorithms = {
+        'Powersort + slice': lambda arr, k: tunable_powersort(arr, None, True)[:k],
+        'heapq.nsmallest': lambda arr, k: heapq.nsmallest(k, arr),
+        'top_k': lambda arr, k: top_k(arr, k),
+    }
+    results = {}
+    for config_name, factor in RUNS_CONFIGURATIONS.items():
+        print(f"Running TOP K benchmark ({config_name}) for N={arr_size}")
+        sums = {k: dict.fromkeys(algorithms, 0) for k in TOP_K_VALUES}
+        for _ in range(N_SAMPLES):
+            arr = generate_random_list(arr_size, bounds, arr_size // factor)
+            for k in TOP_K_VALUES:
+                for name, find_top_k in algorithms.items():
+                    _, counters = count_operations(find_top_k, arr, k=k)
+                    sums[k][name] += counters.comparisons
+        results[config_name] = {k: {name: total / N_SAMPLES for name, total in data.items()}
+                                for k, data in sums.items()}
+        for k, data in results[config_name].items():
+            print(f"k={k}: " + ", ".join(f"{name}: {comparisons:.0f}" for name, comparisons in data.items()))
+
+    save_top_k_results_to_csv(results, "top_k")
+    plot_top_k_results(results, f"Comparisons to find the k smallest elements (N={arr_size})", "top_k")
+
+
+def benchmark_duplicates() -> None:
+    """
+    Runs the benchmark of sorting inputs with few unique values (see `generate_few_unique_list`).
+    Compares Powersort in the duplicate-heavy mode (see `_powersort_plateaus` in algorithms/powersort.py)
+    with the default Powersort and Timsort, for each number of distinct values in `DUPLICATES_DISTINCT_VALUES`,
+    on random inputs and on presorted inputs (N/50 sorted segments) of length `DUPLICATES_BENCHMARK_SIZE`.
+    Measures both the number of comparisons and the CPU time (on plain integers, without counting the comparisons).
+
+    Saves the results in `output/raw_data/duplicates.csv` and plots them in `output/graphs/duplicates.png`
+    """
+
+    arr_size = DUPLICATES_BENCHMARK_SIZE
+    workloads = {'random': None, 'presorted': arr_size // RUNS_CONFIGURATIONS['presorted']}
+    algorithms = {
+        'Powersort': lambda arr, key: tunable_powersort(arr, key=key),
+        'Powersort (plateaus)': lambda arr, key: tunable_powersort(arr, key=key, plateaus_enabled=True),
+        'Timsort': lambda arr, key: tunable_timsort(arr, key=key),
+    }
+    results = {}
+    for workload, number_of_runs in workloads.items():
+        results[workload] = {}
+        for distinct in DUPLICATES_DISTINCT_VALUES:
+            print(f"Running DUPLICATES benchmark ({workload}) for N={arr_size}, distinct values={distinct}")
+            sums = {name: [0., 0.] for name in algorithms}
+            for _ in range(N_SAMPLES):
+                arr = generate_few_unique_list(arr_size, distinct, number_of_runs)
+                for name, sort in algorithms.items():
+                    _, counters = count_operations(sort, arr, key=None)
+                    sums[name][0] += counters.comparisons
+                    arr_copy = arr.copy()
+                    start_time = time.process_time()
+                    sort(arr_copy, None)
+                    sums[name][1] += time.process_time() - start_time
+            results[workload][distinct] = {name: (comparisons / N_SAMPLES, time_taken / N_SAMPLES * 1000)
+                                           for name, (comparisons, time_taken) in sums.items()}
+            for name, (comparisons, time_taken) in results[workload][distinct].items():
+                print(f"{name}: {comparisons:.0f} comparisons, {time_taken:.1f} ms")
+
+    save_duplicates_results_to_csv(results, "duplicates")
+    plot_duplicates_results(results, f"Sorting inputs with few unique values (N={arr_size})", "duplicates")
+
+
+def benchmark_max_scratch() -> None:
+    """
+    Runs the benchmark of the bounded-memory merges (see `max_scratch` of `powersort` and `timsort`).
+    Measures the CPU time and the number of comparisons of Powersort and Timsort for each cap of the merge buffer
+    in `MAX_SCRATCH_VALUES`, on inputs of length `MAX_SCRATCH_BENCHMARK_SIZE` of each presortedness
+    in `RUNS_CONFIGURATIONS`, so that the tradeoff between the extra memory and the time can be chosen.
+
+    Saves the results in `output/raw_data/max_scratch.csv` and plots them in `output/graphs/max_scratch.png`
+    """
+
+    arr_size = MAX_SCRATCH_BENCHMARK_SIZE
+    bounds = (0, arr_size * 100)
+    algorithms = {
+        'Powersort': lambda arr, key, max_scratch: tunable_powersort(arr, MIN_RUN, True, key=key,
+                                                                     max_scratch=max_scratch),
+        'Timsort': lambda arr, key, max_scratch: tunable_timsort(arr, key=key, max_scratch=max_scratch),
+    }
+    results = {}
+    for config_name, factor in RUNS_CONFIGURATIONS.items():
+        print(f"Running MAX SCRATCH benchmark ({config_name}) for N={arr_size}")
+        sums = {max_scratch: {name: [0., 0.] for name in algorithms} for max_scratch in MAX_SCRATCH_VALUES}
+        for _ in range(N_SAMPLES):
+            arr = generate_random_list(arr_size, bounds, arr_size // factor)
+            for max_scratch in MAX_SCRATCH_VALUES:
+                for name, sort in algorithms.items():
+                    _, counters = count_operations(sort, arr, key=None, max_scratch=max_scratch)
+                    sums[max_scratch][name][0] += counters.comparisons
+                    arr_copy = arr.copy()
+                    start_time = time.process_time()
+                    sort(arr_copy, None, max_scratch)
+                    sums[max_scratch][name][1] += time.process_time() - start_time
+        results[config_name] = {
+            max_scratch: {name: (comparisons / N_SAMPLES, time_taken / N_SAMPLES * 1000)
+                          for name, (comparisons, time_taken) in data.items()}
+            for max_scratch, data in sums.items()
+        }
+        for max_scratch, data in results[config_name].items():
+            print(f"max_scratch={max_scratch}: " + ", ".join(
+                f"{name}: {comparisons:.0f} comparisons, {time_taken:.1f} ms"
+                for name, (comparisons, time_taken) in data.items()))
+
+    save_max_scratch_results_to_csv(results, "max_scratch")
+    plot_max_scratch_results(results, f"Time vs. the cap of the merge buffer (N={arr_size})", "max_scratch")
+
+
+def benchmark_string_sort() -> None:
+    """
+    Runs the benchmark of sorting strings with long shared prefixes (see `generate_prefix_heavy_strings`).
+    Compares Powersort with LCP-aware merging (see `string_powersort` in algorithms/string_sort.py) with the default
+    Powersort, for each prefix length in `STRING_SORT_PREFIX_LENGTHS`, on random inputs and on presorted inputs
+    (N/50 sorted segments) of length `STRING_SORT_BENCHMARK_SIZE`.
+    Measures the number of element comparisons, the number of character comparisons (counted by the instrumentation
+    hooks, see algorithms/instrumentation.py, and by `CharCountingKey` for the default Powersort) and the CPU time
+    (on plain strings, without counting the comparisons).
+
+    Saves the results in `output/raw_data/string_sort.csv` and plots them in `output/graphs/string_sort.png`
+    """
+
+    arr_size = STRING_SORT_BENCHMARK_SIZE
+    workloads = {'random': None, 'presorted': arr_size // RUNS_CONFIGURATIONS['presorted']}
+
+    def count_powersort(arr: List[str]) -> Tuple[int, int]:
+        _, counters = count_operations(tunable_powersort, arr, counting_key=CharCountingKey)
+        return counters.comparisons, counters.character_comparisons
+
+    def count_string_powersort(arr: List[str]) -> Tuple[int, int]:
+        with instrumented() as counters:
+            string_powersort(arr)
+        return counters.comparisons, counters.character_comparisons
+
+    algorithms = {
+        'Powersort': (count_powersort, tunable_powersort),
+        'Powersort (LCP)': (count_string_powersort, string_powersort),
+    }
+    results = {}
+    for workload, number_of_runs in workloads.items():
+        results[workload] = {}
+        for prefix_length in STRING_SORT_PREFIX_LENGTHS:
+            print(f"Running STRING SORT benchmark ({workload}) for N={arr_size}, prefix length={prefix_length}")
+            sums = {name: [0., 0., 0.] for name in algorithms}
+            for _ in range(N_SAMPLES):
+                arr = generate_prefix_heavy_strings(arr_size, prefix_length, number_of_runs)
+                for name, (count, sort) in algorithms.items():
+                    comparisons, char_comparisons = count(arr.copy())
+                    sums[name][0] += comparisons
+                    sums[name][1] += char_comparisons
+                    arr_copy = arr.copy()
+                    start_time = time.process_time()
+                    sort(arr_copy)
+                    sums[name][2] += time.process_time() - start_time
+            results[workload][prefix_length] = {
+                name: (comparisons / N_SAMPLES, char_comparisons / N_SAMPLES, time_taken / N_SAMPLES * 1000)
+                for name, (comparisons, char_comparisons, time_taken) in sums.items()
+            }
+            for name, (comparisons, char_comparisons, time_taken) in results[workload][prefix_length].items():
+                print(f"{name}: {comparisons:.0f} comparisons, {char_comparisons:.0f} character comparisons, "
+                      f"{time_taken:.1f} ms")
+
+    save_string_sort_results_to_csv(results, "string_sort")
+    plot_string_sort_results(results, f"Sorting strings with shared prefixes (N={arr_size})", "string_sort")
+
+
 def benchmark_random() -> None:
     """
     Runs the benchmark for completely random data (random number of runs, random entropy).
@@ -226,6 +1184,7 @@ def benchmark_random() -> None:
             sum_natural_merge_sort = 0
             sum_timsort = 0
             sum_powersort = 0
+            sum_multiway_powersort = 0
             sum_python_sort = 0
             for _ in range(N_SAMPLES):
                 arr = generate_random_list(arr_size, bounds)
@@ -233,17 +1192,20 @@ def benchmark_random() -> None:
                 (_, n_natural_merge_sort), _ = run_natural_merge_sort(arr.copy())
                 (_, n_timsort), _ = run_timsort(arr.copy())
                 (_, n_powersort), _ = run_powersort(arr.copy())
+                (_, n_multiway_powersort), _ = run_multiway_powersort(arr.copy())
                 (_, n_python_sort), _ = run_python_sort_for_comparisons(arr.copy())
                 delta = lambda n: (n-n_merge_sort)/n_merge_sort
                 sum_merge_sort += delta(n_merge_sort)
                 sum_natural_merge_sort += delta(n_natural_merge_sort)
                 sum_timsort += delta(n_timsort)
                 sum_powersort += delta(n_powersort)
+                sum_multiway_powersort += delta(n_multiway_powersort)
                 sum_python_sort += delta(n_python_sort)
             results[arr_size] = (sum_merge_sort/N_SAMPLES,
                                     sum_natural_merge_sort/N_SAMPLES,
                                     sum_timsort/N_SAMPLES,
                                     sum_powersort/N_SAMPLES,
+                                    sum_multiway_powersort/N_SAMPLES,
                                     sum_python_sort/N_SAMPLES)
     file_name = "benchmark_random"
     save_to_csv(results, file_name)
@@ -280,6 +1242,7 @@ def _benchmark_runs(config_name: str, factor: int) -> None:
             sum_natural_merge_sort = 0
             sum_timsort = 0
             sum_powersort = 0
+            sum_multiway_powersort = 0
             sum_python_sort = 0
             for _ in range(N_SAMPLES):
                 arr = generate_random_list(arr_size, bounds, number_of_runs=n_runs)
@@ -287,17 +1250,20 @@ def _benchmark_runs(config_name: str, factor: int) -> None:
                 (_, n_natural_merge_sort), _ = run_natural_merge_sort(arr.copy())
                 (_, n_timsort), _ = run_timsort(arr.copy())
                 (_, n_powersort), _ = run_powersort(arr.copy())
+                (_, n_multiway_powersort), _ = run_multiway_powersort(arr.copy())
                 (_, n_python_sort), _ = run_python_sort_for_comparisons(arr.copy())
                 delta = lambda n: (n - n_merge_sort) / n_merge_sort
                 sum_merge_sort += delta(n_merge_sort)
                 sum_natural_merge_sort += delta(n_natural_merge_sort)
                 sum_timsort += delta(n_timsort)
                 sum_powersort += delta(n_powersort)
+                sum_multiway_powersort += delta(n_multiway_powersort)
                 sum_python_sort += delta(n_python_sort)
             results[arr_size] = (sum_merge_sort / N_SAMPLES,
                                  sum_natural_merge_sort / N_SAMPLES,
                                  sum_timsort / N_SAMPLES,
                                  sum_powersort / N_SAMPLES,
+                                 sum_multiway_powersort / N_SAMPLES,
                                  sum_python_sort / N_SAMPLES)
     file_name = f"benchmark_runs_{config_name}"
     save_to_csv(results, file_name)
@@ -332,6 +1298,7 @@ def _benchmark_entropy(config_name: str, entropy_interval: Tuple[float, float])
             sum_natural_merge_sort = 0
             sum_timsort = 0
             sum_powersort = 0
+            sum_multiway_powersort = 0
             sum_python_sort = 0
             for _ in range(N_SAMPLES):
                 arr = generate_random_list(arr_size, bounds, entropy_range=(entropy_from, entropy_to))
@@ -339,17 +1306,20 @@ def _benchmark_entropy(config_name: str, entropy_interval: Tuple[float, float])
                 (_, n_natural_merge_sort), _ = run_natural_merge_sort(arr.copy())
                 (_, n_timsort), _ = run_timsort(arr.copy())
                 (_, n_powersort), _ = run_powersort(arr.copy())
+                (_, n_multiway_powersort), _ = run_multiway_powersort(arr.copy())
                 (_, n_python_sort), _ = run_python_sort_for_comparisons(arr.copy())
                 delta = lambda n: (n - n_merge_sort) / n_merge_sort
                 sum_merge_sort += delta(n_merge_sort)
                 sum_natural_merge_sort += delta(n_natural_merge_sort)
                 sum_timsort += delta(n_timsort)
                 sum_powersort += delta(n_powersort)
+                sum_multiway_powersort += delta(n_multiway_powersort)
                 sum_python_sort += delta(n_python_sort)
             results[arr_size] = (sum_merge_sort / N_SAMPLES,
                                  sum_natural_merge_sort / N_SAMPLES,
                                  sum_timsort / N_SAMPLES,
                                  sum_powersort / N_SAMPLES,
+                                 sum_multiway_powersort / N_SAMPLES,
                                  sum_python_sort / N_SAMPLES)
     file_name = f"benchmark_entropy_{config_name}"
     save_to_csv(results, file_name)
@@ -366,6 +1336,21 @@ def run_all_benchmarks() -> None:
     """
     benchmark_minrun_impact()
     benchmark_galloping_impact()
+    benchmark_trimming_impact()
+    benchmark_kernels()
+    benchmark_autotuning()
+    benchmark_adaptive_sort()
+    benchmark_presortedness_estimation()
+    benchmark_argsort()
+    benchmark_shard_merge()
+    benchmark_batch_insert()
+    benchmark_async_sort()
+    benchmark_top_k()
+    benchmark_duplicates()
+    benchmark_max_scratch()
+    benchmark_string_sort()
+    benchmark_timing()
+    benchmark_memory()
     benchmark_random()
     benchmark_runs()
     benchmark_entropy()
@@ -52,3 +52,100 @@ MIN_RUN = 32
 
 # Initial threshold to trigger the galloping mode (7 is standard and used in CPython)
 INITIAL_GALLOPING_THRESHOLD = 7
+
+# Minimal input length for which the runs of numeric inputs are detected in a vectorized way (using NumPy).
+# For shorter inputs, the overhead of NumPy outweighs the benefit.
+VECTORIZED_RUN_DETECTION_THRESHOLD = 512
+# If the average length of the natural runs (approximated by N / number of descents) is lower than this,
+# the vectorized run detection does not pay off, and the element-by-element run detection is used instead.
+VECTORIZED_RUN_DETECTION_MIN_AVG_LENGTH = 8
+
+# Default memory budget (in bytes) of the external sort, covering the in-memory chunks and the I/O buffers
+EXTERNAL_SORT_MEMORY_BUDGET = 64 * 2**20
+
+# Path to the profile with the parameters tuned by the autotuning benchmark (see `benchmark_autotuning`)
+AUTOTUNING_PROFILE_PATH = './output/autotuning_profile.json'
+
+"""
+Configures the candidate parameters and the workloads of the autotuning benchmark (see `benchmark_autotuning`).
+All pairs of the candidate values are measured on inputs of each of the sizes, for each of the presortedness levels
+in `RUNS_CONFIGURATIONS`. The candidate 'cpython' stands for the minimal run length computed from N the same way
+as in CPython (see `cpython_minrun`), None for no minimal run length.
+"""
+AUTOTUNING_MIN_RUN_CANDIDATES = [None, 16, 32, 64, 'cpython']
+AUTOTUNING_GALLOPING_THRESHOLD_CANDIDATES = [3, 5, 7, 10, 15]
+AUTOTUNING_SIZES = [1_000, 10_000, 100_000]
+
+# Inputs shorter than this are sorted by the builtin sort right away by `adaptive_sort`,
+# as measuring their presortedness (to choose the algorithm) would not pay off
+ADAPTIVE_SORT_MIN_LENGTH = 64
+# Input size of the adaptive sort benchmark (see `benchmark_adaptive_sort`)
+ADAPTIVE_SORT_BENCHMARK_SIZE = 10_000
+
+"""
+Configures the sampling estimator of presortedness (see `estimate_presortedness`).
+The estimator measures the runs containing `PRESORTEDNESS_SAMPLES` random positions of the input. Each run is scanned
+element by element up to `PRESORTEDNESS_SCAN_LENGTH` elements in each direction, longer runs are measured by galloping.
+"""
+PRESORTEDNESS_SAMPLES = 1000
+PRESORTEDNESS_SCAN_LENGTH = 32
+# Input size of the benchmark validating the estimator against the exact measures
+PRESORTEDNESS_ESTIMATION_BENCHMARK_SIZE = 100_000
+# Number of estimates (with different random positions) of each input of the benchmark, so that the coverage
+# of the confidence bounds is measured on N_SAMPLES * PRESORTEDNESS_ESTIMATION_REPEATS estimates
+PRESORTEDNESS_ESTIMATION_REPEATS = 20
+
+# Input size of the benchmark comparing the argsort and lexsort with NumPy (see `benchmark_argsort`)
+ARGSORT_BENCHMARK_SIZE = 100_000
+
+# Total length and number of the shards in the benchmark merging pre-sorted shards (see `benchmark_shard_merge`)
+SHARD_MERGE_BENCHMARK_SIZE = 100_000
+SHARD_MERGE_SHARDS = 128
+
+# Length of the sorted list and the sizes of the batches inserted into it (see `benchmark_batch_insert`)
+BATCH_INSERT_BENCHMARK_SIZE = 100_000
+BATCH_INSERT_BATCH_SIZES = [10, 100, 1_000, 10_000]
+
+# Number of element moves (or comparisons) after which the asynchronous sorts yield to the event loop
+# (see `powersort_async`); About 10 ms of work in CPython
+ASYNC_SORT_MOVES_PER_STEP = 10_000
+# Input size and the numbers of moves per step of the event loop latency benchmark (see `benchmark_async_sort`)
+ASYNC_SORT_BENCHMARK_SIZE = 200_000
+ASYNC_SORT_BENCHMARK_MOVES = [1_000, 10_000, 100_000]
+# Interval [s] in which the coroutine measuring the latency of the event loop wakes up
+ASYNC_SORT_TICK_INTERVAL = 0.001
+
+# Input size and the numbers of the smallest elements to find in the top-k benchmark (see `benchmark_top_k`)
+TOP_K_BENCHMARK_SIZE = 100_000
+TOP_K_VALUES = [1, 10, 100, 1_000, 10_000]
+
+# Input size and the numbers of distinct values of the duplicate-heavy benchmark (see `benchmark_duplicates`)
+DUPLICATES_BENCHMARK_SIZE = 100_000
+DUPLICATES_DISTINCT_VALUES = [2, 10, 100, 1_000]
+
+# Input size and the caps of the merge buffer (None: unlimited) of the bounded-memory benchmark
+# (see `benchmark_max_scratch`)
+MAX_SCRATCH_BENCHMARK_SIZE = 100_000
+MAX_SCRATCH_VALUES = [0, 16, 256, 4_096, None]
+
+# Length of the first slice compared when computing the LCP of two strings, doubled with every matching slice
+# (see `_lcp` in algorithms/string_sort.py)
+LCP_INITIAL_STEP = 8
+# Input size and the lengths of the shared prefixes of the string sorting benchmark (see `benchmark_string_sort`)
+STRING_SORT_BENCHMARK_SIZE = 20_000
+STRING_SORT_PREFIX_LENGTHS = [0, 16, 64, 256]
+
+# Number of untimed runs before the timed ones, number of timed runs per input, and whether the garbage collector
+# is disabled during the timed runs, in the wall-clock timing benchmark (see `benchmark_timing`)
+TIMING_WARMUP_RUNS = 1
+TIMING_REPETITIONS = 5
+TIMING_GC_DISABLED = True
+
+# Input sizes and the number of inputs of each size of the memory benchmark (see `benchmark_memory`)
+MEMORY_BENCHMARK_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+MEMORY_N_SAMPLES = 3
+# Minimal input size for which the resident set size (RSS) of the process is sampled as well;
+# Smaller sorts do not move the RSS beyond the noise
+MEMORY_RSS_MIN_SIZE = 100_000
+# Interval [s] between the samples of the RSS (see `measure_memory`)
+MEMORY_SAMPLING_INTERVAL = 0.0005
@@ -1,4 +1,4 @@
-from typing import Dict, Tuple
+from typing import Dict, Tuple, List, Any
 import csv
 
 from matplotlib.ticker import PercentFormatter
@@ -9,10 +9,18 @@ from config import MIN_RUN, INITIAL_GALLOPING_THRESHOLD
 
 """
 Type alias for the benchmark results
-{array size: (results_ms, results_nms, results_timsort, results_powersort, results_python_sort)}
+{array size: (results_ms, results_nms, results_timsort, results_powersort, results_multiway_powersort,
+              results_python_sort)}
 Results values are relative difference [%] from the baseline (mergesort). Therefore, results_ms is always 0.0.
 """
-TResults = Dict[int, Tuple[float, float, float, float, float]]
+TResults = Dict[int, Tuple[float, float, float, float, float, float]]
+
+"""
+Type alias for the memory benchmark results of an algorithm on an input (see `measure_memory` in benchmarks.py)
+(peak extra memory [B], retained blocks, retained memory [B], peak extra allocated blocks,
+allocated blocks (a lower bound of the allocations), peak extra RSS [B] or None)
+"""
+TMemoryResults = Tuple[float, float, float, float, float, float | None]
 
 CSV_DELIMITER = ','
 
@@ -34,12 +42,327 @@ def save_to_csv(results: TResults, file_name: str) -> None:
                          'Natural Merge Sort [%]',
                          'Timsort [%]',
                          'Powersort [%]',
+                         '4-way Powersort [%]',
                          'Python .sort() [%]',
                          ])
         for arr_size, data in results.items():
             writer.writerow([arr_size, *data])
 
 
+def save_kernel_results_to_csv(results: Dict[str, Tuple[float, float]], file_name: str) -> None:
+    """
+    Saves the results of the kernels benchmark as a CSV file in the output directory.
+
+    :param results: Benchmark results - {primitive operation: (CPU time of the reference kernel [ms],
+        CPU time of the fast kernel [ms])}
+    :param file_name: Name of the output CSV file
+    :return: None; Side effect: CSV file with the results
+    """
+
+    with open(f'./output/raw_data/{file_name}.csv', mode='w', newline='') as file:
+        writer = csv.writer(file, delimiter=CSV_DELIMITER)
+        # First line is header
+        writer.writerow(['Primitive',
+                         'Reference kernel [ms]',
+                         'Fast kernel [ms]',
+                         'Speedup [x]',
+                         ])
+        for primitive, (reference_time, fast_time) in results.items():
+            writer.writerow([primitive, reference_time, fast_time, reference_time / fast_time])
+
+
+def save_autotuning_results_to_csv(rows: List[Tuple[Any, ...]], file_name: str) -> None:
+    """
+    Saves the results of all candidates of the autotuning benchmark as a CSV file in the output directory.
+
+    :param rows: Benchmark results - [(algorithm, array size, average run length, min_run_length,
+        galloping threshold, average # of comparisons, average wall time [ms]), ...]
+    :param file_name: Name of the output CSV file
+    :return: None; Side effect: CSV file with the results
+    """
+
+    with open(f'./output/raw_data/{file_name}.csv', mode='w', newline='') as file:
+        writer = csv.writer(file, delimiter=CSV_DELIMITER)
+        # First line is header
+        writer.writerow(['Algorithm',
+                         'Array size [-]',
+                         'Average run length [-]',
+                         'Minimal run length [-]',
+                         'Galloping threshold [-]',
+                         'Comparisons [-]',
+                         'Wall time [ms]',
+                         ])
+        writer.writerows(rows)
+
+
+def save_adaptive_sort_results_to_csv(results: Dict[str, Dict[str, float]], choices: Dict[str, str],
+                                      file_name: str) -> None:
+    """
+    Saves the results of the adaptive sort benchmark as a CSV file in the output directory.
+
+    :param results: Benchmark results - {workload: {algorithm: average # of comparisons}}
+    :param choices: Algorithm chosen by the dispatcher most often for each workload - {workload: algorithm}
+    :param file_name: Name of the output CSV file
+    :return: None; Side effect: CSV file with the results
+    """
+
+    algorithms = list(next(iter(results.values())))
+    with open(f'./output/raw_data/{file_name}.csv', mode='w', newline='') as file:
+        writer = csv.writer(file, delimiter=CSV_DELIMITER)
+        # First line is header
+        writer.writerow(['Workload', 'Chosen algorithm', *(f'{algorithm} [-]' for algorithm in algorithms)])
+        for workload, data in results.items():
+            writer.writerow([workload, choices[workload], *(data[algorithm] for algorithm in algorithms)])
+
+
+def save_presortedness_estimation_results_to_csv(results: Dict[str, Tuple[float, ...]], file_name: str) -> None:
+    """
+    Saves the results of the presortedness estimation benchmark as a CSV file in the output directory.
+
+    :param results: Benchmark results - {workload: (exact # of runs, estimated # of runs, lower bound, upper bound,
+        bounds coverage [%], exact normalized entropy, estimated normalized entropy, lower bound, upper bound,
+        bounds coverage [%], comparisons of the estimator relative to N [%])}, averaged over the inputs;
+        The bias of the estimates (mean estimate minus mean exact value) is added to the CSV file
+    :param file_name: Name of the output CSV file
+    :return: None; Side effect: CSV file with the results
+    """
+
+    with open(f'./output/raw_data/{file_name}.csv', mode='w', newline='') as file:
+        writer = csv.writer(file, delimiter=CSV_DELIMITER)
+        # First line is header
+        writer.writerow(['Workload',
+                         'Runs [-]',
+                         'Estimated runs [-]',
+                         'Runs lower bound [-]',
+                         'Runs upper bound [-]',
+                         'Runs coverage [%]',
+                         'Entropy [-]',
+                         'Estimated entropy [-]',
+                         'Entropy lower bound [-]',
+                         'Entropy upper bound [-]',
+                         'Entropy coverage [%]',
+                         'Comparisons [% of N]',
+                         'Runs bias [%]',
+                         'Entropy bias [-]',
+                         ])
+        for workload, data in results.items():
+            writer.writerow([workload, *data, (data[1] - data[0]) / data[0] * 100, data[6] - data[5]])
+
+
+def save_argsort_results_to_csv(results: Dict[str, Dict[str, Tuple[float, float]]], file_name: str) -> None:
+    """
+    Saves the results of the argsort benchmark as a CSV file in the output directory.
+
+    :param results: Benchmark results - {workload: {case: (CPU time of Powersort [ms], CPU time of NumPy [ms])}}
+    :param file_name: Name of the output CSV file
+    :return: None; Side effect: CSV file with the results
+    """
+
+    with open(f'./output/raw_data/{file_name}.csv', mode='w', newline='') as file:
+        writer = csv.writer(file, delimiter=CSV_DELIMITER)
+        # First line is header
+        writer.writerow(['Workload',
+                         'Case',
+                         'Powersort [ms]',
+                         'NumPy [ms]',
+                         'Slowdown [x]',
+                         ])
+        for workload, data in results.items():
+            for case, (powersort_time, numpy_time) in data.items():
+                writer.writerow([workload, case, powersort_time, numpy_time, powersort_time / numpy_time])
+
+
+def save_shard_merge_results_to_csv(results: Dict[str, Dict[str, float]], file_name: str) -> None:
+    """
+    Saves the results of the shard merge benchmark as a CSV file in the output directory.
+
+    :param results: Benchmark results - {shard lengths: {algorithm: average # of comparisons}}
+    :param file_name: Name of the output CSV file
+    :return: None; Side effect: CSV file with the results
+    """
+
+    algorithms = list(next(iter(results.values())))
+    with open(f'./output/raw_data/{file_name}.csv', mode='w', newline='') as file:
+        writer = csv.writer(file, delimiter=CSV_DELIMITER)
+        # First line is header
+        writer.writerow(['Shard lengths', *(f'{algorithm} [-]' for algorithm in algorithms)])
+        for workload, data in results.items():
+            writer.writerow([workload, *(data[algorithm] for algorithm in algorithms)])
+
+
+def save_batch_insert_results_to_csv(results: Dict[int, Dict[str, Tuple[float, float]]], file_name: str) -> None:
+    """
+    Saves the results of the batch insertion benchmark as a CSV file in the output directory.
+
+    :param results: Benchmark results - {batch size: {algorithm: (average # of comparisons, average CPU time [ms])}}
+    :param file_name: Name of the output CSV file
+    :return: None; Side effect: CSV file with the results
+    """
+
+    algorithms = list(next(iter(results.values())))
+    with open(f'./output/raw_data/{file_name}.csv', mode='w', newline='') as file:
+        writer = csv.writer(file, delimiter=CSV_DELIMITER)
+        # First line is header
+        writer.writerow(['Batch size [-]',
+                         *(f'{algorithm} comparisons [-]' for algorithm in algorithms),
+                         *(f'{algorithm} [ms]' for algorithm in algorithms)])
+        for batch_size, data in results.items():
+            writer.writerow([batch_size, *(data[algorithm][0] for algorithm in algorithms),
+                             *(data[algorithm][1] for algorithm in algorithms)])
+
+
+def save_async_sort_results_to_csv(results: Dict[str, Tuple[float, float, float, float]], file_name: str) -> None:
+    """
+    Saves the results of the asynchronous sort benchmark as a CSV file in the output directory.
+
+    :param results: Benchmark results - {variant: (sort time [ms], median latency [ms], 99th percentile latency [ms],
+        maximal latency [ms])}
+    :param file_name: Name of the output CSV file
+    :return: None; Side effect: CSV file with the results
+    """
+
+    with open(f'./output/raw_data/{file_name}.csv', mode='w', newline='') as file:
+        writer = csv.writer(file, delimiter=CSV_DELIMITER)
+        # First line is header
+        writer.writerow(['Variant',
+                         'Sort time [ms]',
+                         'Median latency [ms]',
+                         '99th percentile latency [ms]',
+                         'Max latency [ms]',
+                         ])
+        for variant, data in results.items():
+            writer.writerow([variant, *data])
+
+
+def save_top_k_results_to_csv(results: Dict[str, Dict[int, Dict[str, float]]], file_name: str) -> None:
+    """
+    Saves the results of the top-k benchmark as a CSV file in the output directory.
+
+    :param results: Benchmark results - {workload: {k: {algorithm: average # of comparisons}}}
+    :param file_name: Name of the output CSV file
+    :return: None; Side effect: CSV file with the results
+    """
+
+    algorithms = list(next(iter(next(iter(results.values())).values())))
+    with open(f'./output/raw_data/{file_name}.csv', mode='w', newline='') as file:
+        writer = csv.writer(file, delimiter=CSV_DELIMITER)
+        # First line is header
+        writer.writerow(['Workload', 'k [-]', *(f'{algorithm} [-]' for algorithm in algorithms)])
+        for workload, workload_data in results.items():
+            for k, data in workload_data.items():
+                writer.writerow([workload, k, *(data[algorithm] for algorithm in algorithms)])
+
+
+def save_duplicates_results_to_csv(results: Dict[str, Dict[int, Dict[str, Tuple[float, float]]]],
+                                   file_name: str) -> None:
+    """
+    Saves the results of the duplicate-heavy benchmark as a CSV file in the output directory.
+
+    :param results: Benchmark results - {workload: {distinct values: {algorithm: (average # of comparisons,
+        average CPU time [ms])}}}
+    :param file_name: Name of the output CSV file
+    :return: None; Side effect: CSV file with the results
+    """
+
+    with open(f'./output/raw_data/{file_name}.csv', mode='w', newline='') as file:
+        writer = csv.writer(file, delimiter=CSV_DELIMITER)
+        # First line is header
+        writer.writerow(['Workload', 'Distinct values [-]', 'Algorithm', 'Comparisons [-]', 'CPU time [ms]'])
+        for workload, workload_data in results.items():
+            for distinct, data in workload_data.items():
+                for algorithm, (comparisons, time_taken) in data.items():
+                    writer.writerow([workload, distinct, algorithm, comparisons, time_taken])
+
+
+def save_max_scratch_results_to_csv(results: Dict[str, Dict[int | None, Dict[str, Tuple[float, float]]]],
+                                    file_name: str) -> None:
+    """
+    Saves the results of the bounded-memory benchmark as a CSV file in the output directory.
+
+    :param results: Benchmark results - {workload: {cap of the merge buffer (None: unlimited): {algorithm:
+        (average # of comparisons, average CPU time [ms])}}}
+    :param file_name: Name of the output CSV file
+    :return: None; Side effect: CSV file with the results
+    """
+
+    with open(f'./output/raw_data/{file_name}.csv', mode='w', newline='') as file:
+        writer = csv.writer(file, delimiter=CSV_DELIMITER)
+        # First line is header
+        writer.writerow(['Workload', 'Max scratch [elements]', 'Algorithm', 'Comparisons [-]', 'CPU time [ms]'])
+        for workload, workload_data in results.items():
+            for max_scratch, data in workload_data.items():
+                for algorithm, (comparisons, time_taken) in data.items():
+                    writer.writerow([workload, 'unlimited' if max_scratch is None else max_scratch, algorithm,
+                                     comparisons, time_taken])
+
+
+def save_string_sort_results_to_csv(results: Dict[str, Dict[int, Dict[str, Tuple[float, float, float]]]],
+                                    file_name: str) -> None:
+    """
+    Saves the results of the string sorting benchmark as a CSV file in the output directory.
+
+    :param results: Benchmark results - {workload: {prefix length: {algorithm: (average # of element comparisons,
+        average # of character comparisons, average CPU time [ms])}}}
+    :param file_name: Name of the output CSV file
+    :return: None; Side effect: CSV file with the results
+    """
+
+    with open(f'./output/raw_data/{file_name}.csv', mode='w', newline='') as file:
+        writer = csv.writer(file, delimiter=CSV_DELIMITER)
+        # First line is header
+        writer.writerow(['Workload', 'Prefix length [-]', 'Algorithm', 'Comparisons [-]',
+                         'Character comparisons [-]', 'CPU time [ms]'])
+        for workload, workload_data in results.items():
+            for prefix_length, data in workload_data.items():
+                for algorithm, values in data.items():
+                    writer.writerow([workload, prefix_length, algorithm, *values])
+
+
+def save_timing_results_to_csv(results: Dict[int, Dict[str, Tuple[float, float, float]]], file_name: str) -> None:
+    """
+    Saves the results of the wall-clock timing benchmark as a CSV file in the output directory.
+
+    :param results: Benchmark results - {array size: {algorithm: (median time [ms], interquartile range [ms],
+        throughput [elements/s])}}
+    :param file_name: Name of the output CSV file
+    :return: None; Side effect: CSV file with the results
+    """
+
+    with open(f'./output/raw_data/{file_name}.csv', mode='w', newline='') as file:
+        writer = csv.writer(file, delimiter=CSV_DELIMITER)
+        # First line is header
+        writer.writerow(['Array size [-]', 'Algorithm', 'Median time [ms]', 'IQR [ms]', 'Throughput [elements/s]'])
+        for arr_size, data in results.items():
+            for algorithm, values in data.items():
+                writer.writerow([arr_size, algorithm, *values])
+
+
+def save_memory_results_to_csv(results: Dict[str, Dict[int, Dict[str, TMemoryResults]]], file_name: str) -> None:
+    """
+    Saves the results of the memory benchmark as a CSV file in the output directory.
+
+    :param results: Benchmark results - {workload: {array size: {algorithm: (peak extra memory [B],
+        retained blocks, retained memory [B], peak extra allocated blocks, allocated blocks (a lower bound
+        of the allocations), peak extra RSS [B] or None if not sampled)}}}
+    :param file_name: Name of the output CSV file
+    :return: None; Side effect: CSV file with the results
+    """
+
+    with open(f'./output/raw_data/{file_name}.csv', mode='w', newline='') as file:
+        writer = csv.writer(file, delimiter=CSV_DELIMITER)
+        # First line is header
+        writer.writerow(['Workload', 'Array size [-]', 'Algorithm', 'Peak extra memory [B]',
+                         'Peak extra memory per element [B]', 'Retained blocks [-]', 'Retained memory [B]',
+                         'Peak extra allocated blocks [-]', 'Allocated blocks (lower bound) [-]',
+                         'Peak extra RSS [B]'])
+        for workload, workload_data in results.items():
+            for arr_size, data in workload_data.items():
+                for algorithm, (peak, retained_blocks, retained_bytes, peak_blocks, allocated_blocks, rss) \
+                        in data.items():
+                    writer.writerow([workload, arr_size, algorithm, peak, peak / arr_size, retained_blocks,
+                                     retained_bytes, peak_blocks, allocated_blocks, '' if rss is None else rss])
+
+
 def plot_minrun_results(data: Dict[int, Tuple[int, float]], x_label: str, y_label: str,
                         title: str, file_name: str, xlog: bool = False, show: bool = False) -> None:
     """
@@ -123,6 +446,50 @@ def plot_galloping_results(data: Dict[int, Tuple[int, float, float]], x_label: s
         plt.show()
 
 
+def plot_trimming_results(data: Dict[int, Tuple[int, float, float]], x_label: str, y_label: str,
+                          title: str, file_name: str, xlog: bool = False, show: bool = False) -> None:
+    """
+    Generates a plot visualization for the pre-merge trimming benchmark and saves it as a PNG file
+    in the output directory.
+
+    :param data: Benchmark results - {array size: (results_without_trimming, results_with_trimming_comparisons,
+        results_with_trimming_writes)}
+        Results values are relative difference [%] from the baseline (results_without_trimming).
+        Therefore, results_without_trimming is always 0.0.
+    :param x_label: Label for the X axis (array size)
+    :param y_label: Label for the Y axis (% diff)
+    :param title: Title of the plot
+    :param file_name: Name of the output PNG file
+    :param xlog: Whether to use logarithmic scale for the X axis. Useful when the experiment is performed in such a way
+        that the datapoints for lower x values are much denser, and the datapoints for higher x values are more sparse.
+    :param show: Whether to show (open) the generated plot; Useful for debugging purposes.
+    :return: None; Side effect: PNG file with the generated plot
+    """
+
+    plt.figure(figsize=(10, 6))
+    x = list(data.keys())
+    data_powersort_without_trimming = [v[0] for v in data.values()]
+    data_powersort_with_trimming_comparisons = [v[1] for v in data.values()]
+    data_powersort_with_trimming_writes = [v[2] for v in data.values()]
+
+    plt.plot(x, data_powersort_without_trimming, label='Powersort without trimming', color='orange', linewidth=3)
+    plt.plot(x, data_powersort_with_trimming_comparisons, label='Powersort with trimming (key comparisons)',
+             color='cyan', linewidth=3)
+    plt.plot(x, data_powersort_with_trimming_writes, label='Powersort with trimming (element moves)',
+             color='green', linewidth=3)
+
+    if xlog:
+        plt.xscale('log')
+    plt.gca().yaxis.set_major_formatter(PercentFormatter(xmax=1))
+    plt.xlabel(x_label)
+    plt.ylabel(y_label)
+    plt.title(title)
+    plt.legend()
+    plt.savefig(f'./output/graphs/{file_name}.png')
+    if show:
+        plt.show()
+
+
 def plot_results(data: TResults, x_label: str, y_label: str, title: str,
                  file_name: str, fit_to_poly: bool = True, show: bool = False) -> None:
     """
@@ -147,13 +514,15 @@ def plot_results(data: TResults, x_label: str, y_label: str, title: str,
     data_natural_merge_sort = [v[1] for v in data.values()]
     data_timsort = [v[2] for v in data.values()]
     data_powersort = [v[3] for v in data.values()]
-    data_python_sort = [v[4] for v in data.values()]
+    data_multiway_powersort = [v[4] for v in data.values()]
+    data_python_sort = [v[5] for v in data.values()]
 
     alpha = 0.15 if fit_to_poly else 1
     plt.plot(x, data_merge_sort, color='cyan', alpha=alpha)
     plt.plot(x, data_natural_merge_sort, color='blue', alpha=alpha)
     plt.plot(x, data_timsort, color='green', alpha=alpha)
     plt.plot(x, data_powersort, color='orange', alpha=alpha)
+    plt.plot(x, data_multiway_powersort, color='purple', alpha=alpha)
     plt.plot(x, data_python_sort, color='red', alpha=alpha-0.1)
 
     if fit_to_poly:
@@ -162,6 +531,7 @@ def plot_results(data: TResults, x_label: str, y_label: str, title: str,
             poly_natural_merge_sort = np.poly1d(np.polyfit(x, data_natural_merge_sort, 5))
             poly_timsort = np.poly1d(np.polyfit(x, data_timsort, 5))
             poly_powersort = np.poly1d(np.polyfit(x, data_powersort, 5))
+            poly_multiway_powersort = np.poly1d(np.polyfit(x, data_multiway_powersort, 5))
             poly_python_sort = np.poly1d(np.polyfit(x, data_python_sort, 5))
         except np.RankWarning:
             pass
@@ -169,6 +539,7 @@ def plot_results(data: TResults, x_label: str, y_label: str, title: str,
         plt.plot(x, poly_natural_merge_sort(x), label='Natural Merge Sort', color='blue', linewidth=3)
         plt.plot(x, poly_timsort(x), label='Timsort', color='green', linewidth=3)
         plt.plot(x, poly_powersort(x), label='Powersort', color='orange', linewidth=3)
+        plt.plot(x, poly_multiway_powersort(x), label='4-way Powersort', color='purple', linewidth=3)
         plt.plot(x, poly_python_sort(x), label='Python .sort()', color='red', linewidth=3)
 
     plt.xscale('log')
@@ -180,3 +551,393 @@ def plot_results(data: TResults, x_label: str, y_label: str, title: str,
     plt.savefig(f'./output/graphs/{file_name}.png')
     if show:
         plt.show()
+
+
+def plot_kernel_results(data: Dict[str, Tuple[float, float]], title: str, file_name: str,
+                        show: bool = False) -> None:
+    """
+    Generates a bar plot visualization for the kernels benchmark and saves it as a PNG file in the output directory.
+
+    :param data: Benchmark results; See `save_kernel_results_to_csv`
+    :param title: Title of the plot
+    :param file_name: Name of the output PNG file
+    :param show: Whether to show (open) the generated plot; Useful for debugging purposes.
+    :return: None; Side effect: PNG file with the generated plot
+    """
+
+    plt.figure(figsize=(10, 6))
+    x = list(data.keys())
+    speedups = [reference_time / fast_time for reference_time, fast_time in data.values()]
+
+    plt.bar(x, speedups, color='orange')
+    plt.axhline(1, color='red', linestyle='--', label='Reference kernel')
+    plt.xlabel("Primitive operation")
+    plt.ylabel("CPU time speedup [x]")
+    plt.title(title)
+    plt.legend()
+    plt.savefig(f'./output/graphs/{file_name}.png')
+    if show:
+        plt.show()
+
+
+def plot_adaptive_sort_results(data: Dict[str, Dict[str, float]], reference: str, title: str, file_name: str,
+                               show: bool = False) -> None:
+    """
+    Generates a grouped bar plot visualization for the adaptive sort benchmark (and the shard merge benchmark)
+    and saves it as a PNG file in the output directory. For each workload, the bars show how many more comparisons [%]
+    the other algorithms need than the reference one (e.g., the dispatcher), so positive values mean that
+    the reference algorithm needs fewer comparisons.
+
+    :param data: Benchmark results; See `save_adaptive_sort_results_to_csv`
+    :param reference: Name of the reference algorithm
+    :param title: Title of the plot
+    :param file_name: Name of the output PNG file
+    :param show: Whether to show (open) the generated plot; Useful for debugging purposes.
+    :return: None; Side effect: PNG file with the generated plot
+    """
+
+    plt.figure(figsize=(12, 6))
+    workloads = list(data.keys())
+    algorithms = [algorithm for algorithm in next(iter(data.values())) if algorithm != reference]
+    x = np.arange(len(workloads))
+    width = 0.8 / len(algorithms)
+    for i, algorithm in enumerate(algorithms):
+        excess = [(data[workload][algorithm] - data[workload][reference]) / data[workload][reference] * 100
+                  for workload in workloads]
+        plt.bar(x + (i - (len(algorithms) - 1) / 2) * width, excess, width, label=algorithm)
+
+    plt.axhline(0, color='red', linestyle='--', label=reference)
+    plt.xticks(x, workloads)
+    plt.gca().yaxis.set_major_formatter(PercentFormatter())
+    plt.xlabel("Workload")
+    plt.ylabel(f"Comparisons relative to {reference}")
+    plt.title(title)
+    plt.legend()
+    plt.savefig(f'./output/graphs/{file_name}.png')
+    if show:
+        plt.show()
+
+
+def plot_presortedness_estimation_results(data: Dict[str, Tuple[float, ...]], title: str, file_name: str,
+                                          show: bool = False) -> None:
+    """
+    Generates a visualization for the presortedness estimation benchmark (the exact and the estimated number of runs
+    and normalized entropy, along with the confidence bounds) and saves it as a PNG file in the output directory.
+
+    :param data: Benchmark results; See `save_presortedness_estimation_results_to_csv`
+    :param title: Title of the plot
+    :param file_name: Name of the output PNG file
+    :param show: Whether to show (open) the generated plot; Useful for debugging purposes.
+    :return: None; Side effect: PNG file with the generated plot
+    """
+
+    fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+    workloads = list(data.keys())
+    x = np.arange(len(workloads))
+    for ax, offset, label in ((axes[0], 0, "Number of runs"), (axes[1], 5, "Normalized entropy")):
+        exact = [v[offset] for v in data.values()]
+        estimate = [v[offset+1] for v in data.values()]
+        errors = [[v[offset+1] - v[offset+2] for v in data.values()],
+                  [v[offset+3] - v[offset+1] for v in data.values()]]
+        ax.bar(x - 0.2, exact, 0.4, label='Exact', color='cyan')
+        ax.bar(x + 0.2, estimate, 0.4, yerr=errors, capsize=4, label='Estimated', color='orange')
+        ax.set_xticks(x, workloads, rotation=30, ha='right')
+        ax.set_ylabel(label)
+        ax.legend()
+    axes[0].set_yscale('log')
+    fig.suptitle(title)
+    fig.tight_layout()
+    plt.savefig(f'./output/graphs/{file_name}.png')
+    if show:
+        plt.show()
+
+
+def plot_argsort_results(data: Dict[str, Dict[str, Tuple[float, float]]], title: str, file_name: str,
+                         show: bool = False) -> None:
+    """
+    Generates a grouped bar plot visualization for the argsort benchmark (the CPU time of Powersort divided by
+    the CPU time of NumPy, for each workload and case) and saves it as a PNG file in the output directory.
+
+    :param data: Benchmark results; See `save_argsort_results_to_csv`
+    :param title: Title of the plot
+    :param file_name: Name of the output PNG file
+    :param show: Whether to show (open) the generated plot; Useful for debugging purposes.
+    :return: None; Side effect: PNG file with the generated plot
+    """
+
+    plt.figure(figsize=(12, 6))
+    workloads = list(data.keys())
+    cases = list(next(iter(data.values())).keys())
+    x = np.arange(len(workloads))
+    width = 0.8 / len(cases)
+    for i, case in enumerate(cases):
+        slowdowns = [data[workload][case][0] / data[workload][case][1] for workload in workloads]
+        plt.bar(x + (i - (len(cases) - 1) / 2) * width, slowdowns, width, label=case)
+
+    plt.axhline(1, color='red', linestyle='--', label='NumPy')
+    plt.xticks(x, workloads)
+    plt.yscale('log')
+    plt.xlabel("Workload")
+    plt.ylabel("CPU time relative to NumPy [x]")
+    plt.title(title)
+    plt.legend()
+    plt.savefig(f'./output/graphs/{file_name}.png')
+    if show:
+        plt.show()
+
+
+def plot_batch_insert_results(data: Dict[int, Dict[str, Tuple[float, float]]], title: str, file_name: str,
+                              show: bool = False) -> None:
+    """
+    Generates a visualization for the batch insertion benchmark (the number of comparisons and the CPU time
+    of each algorithm by the batch size, in log-log scale) and saves it as a PNG file in the output directory.
+
+    :param data: Benchmark results; See `save_batch_insert_results_to_csv`
+    :param title: Title of the plot
+    :param file_name: Name of the output PNG file
+    :param show: Whether to show (open) the generated plot; Useful for debugging purposes.
+    :return: None; Side effect: PNG file with the generated plot
+    """
+
+    fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+    x = list(data.keys())
+    algorithms = list(next(iter(data.values())))
+    for ax, index, label in ((axes[0], 0, "Comparisons"), (axes[1], 1, "CPU time [ms]")):
+        for algorithm in algorithms:
+            ax.plot(x, [data[batch_size][algorithm][index] for batch_size in x], marker='o', label=algorithm)
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.set_xlabel("Batch size")
+        ax.set_ylabel(label)
+        ax.legend()
+    fig.suptitle(title)
+    fig.tight_layout()
+    plt.savefig(f'./output/graphs/{file_name}.png')
+    if show:
+        plt.show()
+
+
+def plot_async_sort_results(data: Dict[str, Tuple[float, float, float, float]], title: str, file_name: str,
+                            show: bool = False) -> None:
+    """
+    Generates a grouped bar plot visualization for the asynchronous sort benchmark (the median, 99th percentile
+    and maximal latency of the event loop for each variant) and saves it as a PNG file in the output directory.
+
+    :param data: Benchmark results; See `save_async_sort_results_to_csv`
+    :param title: Title of the plot
+    :param file_name: Name of the output PNG file
+    :param show: Whether to show (open) the generated plot; Useful for debugging purposes.
+    :return: None; Side effect: PNG file with the generated plot
+    """
+
+    plt.figure(figsize=(12, 6))
+    variants = list(data.keys())
+    x = np.arange(len(variants))
+    for i, label in enumerate(('Median', '99th percentile', 'Max')):
+        plt.bar(x + (i - 1) * 0.25, [data[variant][i + 1] for variant in variants], 0.25, label=label)
+
+    plt.xticks(x, variants, rotation=20, ha='right')
+    plt.yscale('log')
+    plt.ylabel("Latency of the event loop [ms]")
+    plt.title(title)
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(f'./output/graphs/{file_name}.png')
+    if show:
+        plt.show()
+
+
+def plot_top_k_results(data: Dict[str, Dict[int, Dict[str, float]]], title: str, file_name: str,
+                       show: bool = False) -> None:
+    """
+    Generates a visualization for the top-k benchmark (the number of comparisons of each algorithm by k,
+    in log-log scale, one subplot per workload) and saves it as a PNG file in the output directory.
+
+    :param data: Benchmark results; See `save_top_k_results_to_csv`
+    :param title: Title of the plot
+    :param file_name: Name of the output PNG file
+    :param show: Whether to show (open) the generated plot; Useful for debugging purposes.
+    :return: None; Side effect: PNG file with the generated plot
+    """
+
+    fig, axes = plt.subplots(1, len(data), figsize=(6 * len(data), 6), squeeze=False)
+    for ax, (workload, workload_data) in zip(axes[0], data.items()):
+        x = list(workload_data.keys())
+        for algorithm in next(iter(workload_data.values())):
+            ax.plot(x, [workload_data[k][algorithm] for k in x], marker='o', label=algorithm)
+        ax.set_xscale('log')
+        ax.set_yscale('log')
+        ax.set_xlabel("k")
+        ax.set_ylabel("Comparisons")
+        ax.set_title(workload)
+        ax.legend()
+    fig.suptitle(title)
+    fig.tight_layout()
+    plt.savefig(f'./output/graphs/{file_name}.png')
+    if show:
+        plt.show()
+
+
+def plot_duplicates_results(data: Dict[str, Dict[int, Dict[str, Tuple[float, float]]]], title: str, file_name: str,
+                            show: bool = False) -> None:
+    """
+    Generates a visualization for the duplicate-heavy benchmark (the number of comparisons and the CPU time
+    of each algorithm by the number of distinct values, in log-log scale, one row of subplots per workload)
+    and saves it as a PNG file in the output directory.
+
+    :param data: Benchmark results; See `save_duplicates_results_to_csv`
+    :param title: Title of the plot
+    :param file_name: Name of the output PNG file
+    :param show: Whether to show (open) the generated plot; Useful for debugging purposes.
+    :return: None; Side effect: PNG file with the generated plot
+    """
+
+    fig, axes = plt.subplots(len(data), 2, figsize=(14, 6 * len(data)), squeeze=False)
+    for row, (workload, workload_data) in zip(axes, data.items()):
+        x = list(workload_data.keys())
+        algorithms = list(next(iter(workload_data.values())))
+        for ax, index, label in ((row[0], 0, "Comparisons"), (row[1], 1, "CPU time [ms]")):
+            for algorithm in algorithms:
+                ax.plot(x, [workload_data[distinct][algorithm][index] for distinct in x], marker='o', label=algorithm)
+            ax.set_xscale('log')
+            ax.set_yscale('log')
+            ax.set_xlabel("Distinct values")
+            ax.set_ylabel(label)
+            ax.set_title(workload)
+            ax.legend()
+    fig.suptitle(title)
+    fig.tight_layout()
+    plt.savefig(f'./output/graphs/{file_name}.png')
+    if show:
+        plt.show()
+
+
+def plot_max_scratch_results(data: Dict[str, Dict[int | None, Dict[str, Tuple[float, float]]]], title: str,
+                             file_name: str, show: bool = False) -> None:
+    """
+    Generates a visualization for the bounded-memory benchmark (the CPU time of each algorithm by the cap
+    of the merge buffer, one subplot per workload) and saves it as a PNG file in the output directory.
+
+    :param data: Benchmark results; See `save_max_scratch_results_to_csv`
+    :param title: Title of the plot
+    :param file_name: Name of the output PNG file
+    :param show: Whether to show (open) the generated plot; Useful for debugging purposes.
+    :return: None; Side effect: PNG file with the generated plot
+    """
+
+    fig, axes = plt.subplots(1, len(data), figsize=(6 * len(data), 6), squeeze=False)
+    for ax, (workload, workload_data) in zip(axes[0], data.items()):
+        caps = list(workload_data.keys())
+        # The caps are plotted evenly spaced, the unlimited buffer last
+        x = np.arange(len(caps))
+        for algorithm in next(iter(workload_data.values())):
+            ax.plot(x, [workload_data[max_scratch][algorithm][1] for max_scratch in caps], marker='o', label=algorithm)
+        ax.set_xticks(x, ['unlimited' if max_scratch is None else str(max_scratch) for max_scratch in caps])
+        ax.set_xlabel("Max scratch [elements]")
+        ax.set_ylabel("CPU time [ms]")
+        ax.set_title(workload)
+        ax.legend()
+    fig.suptitle(title)
+    fig.tight_layout()
+    plt.savefig(f'./output/graphs/{file_name}.png')
+    if show:
+        plt.show()
+
+
+def plot_string_sort_results(data: Dict[str, Dict[int, Dict[str, Tuple[float, float, float]]]], title: str,
+                             file_name: str, show: bool = False) -> None:
+    """
+    Generates a visualization for the string sorting benchmark (the number of element comparisons, the number
+    of character comparisons and the CPU time of each algorithm by the length of the shared prefix,
+    one row of subplots per workload) and saves it as a PNG file in the output directory.
+
+    :param data: Benchmark results; See `save_string_sort_results_to_csv`
+    :param title: Title of the plot
+    :param file_name: Name of the output PNG file
+    :param show: Whether to show (open) the generated plot; Useful for debugging purposes.
+    :return: None; Side effect: PNG file with the generated plot
+    """
+
+    labels = ("Comparisons", "Character comparisons", "CPU time [ms]")
+    fig, axes = plt.subplots(len(data), len(labels), figsize=(6 * len(labels), 6 * len(data)), squeeze=False)
+    for row, (workload, workload_data) in zip(axes, data.items()):
+        x = list(workload_data.keys())
+        algorithms = list(next(iter(workload_data.values())))
+        for index, (ax, label) in enumerate(zip(row, labels)):
+            for algorithm in algorithms:
+                ax.plot(x, [workload_data[prefix_length][algorithm][index] for prefix_length in x], marker='o',
+                        label=algorithm)
+            ax.set_xlabel("Shared prefix length")
+            ax.set_ylabel(label)
+            ax.set_title(workload)
+            ax.legend()
+    fig.suptitle(title)
+    fig.tight_layout()
+    plt.savefig(f'./output/graphs/{file_name}.png')
+    if show:
+        plt.show()
+
+
+def plot_timing_results(data: Dict[int, Dict[str, Tuple[float, float, float]]], title: str, file_name: str,
+                        show: bool = False) -> None:
+    """
+    Generates a visualization for the wall-clock timing benchmark (the median time of each algorithm by the array size,
+    with the interquartile range as an error bar, and the throughput) and saves it as a PNG file
+    in the output directory.
+
+    :param data: Benchmark results; See `save_timing_results_to_csv`
+    :param title: Title of the plot
+    :param file_name: Name of the output PNG file
+    :param show: Whether to show (open) the generated plot; Useful for debugging purposes.
+    :return: None; Side effect: PNG file with the generated plot
+    """
+
+    fig, axes = plt.subplots(1, 2, figsize=(14, 6))
+    x = list(data.keys())
+    for algorithm in next(iter(data.values())):
+        medians = [data[arr_size][algorithm][0] for arr_size in x]
+        iqrs = [data[arr_size][algorithm][1] for arr_size in x]
+        axes[0].errorbar(x, medians, yerr=[iqr / 2 for iqr in iqrs], marker='o', capsize=3, label=algorithm)
+        axes[1].plot(x, [data[arr_size][algorithm][2] for arr_size in x], marker='o', label=algorithm)
+    axes[0].set_ylabel("Median wall-clock time [ms]")
+    axes[1].set_ylabel("Throughput [elements/s]")
+    for ax in axes:
+        ax.set_xscale('log')
+        ax.set_xlabel("Array size")
+        ax.legend()
+    fig.suptitle(title)
+    fig.tight_layout()
+    plt.savefig(f'./output/graphs/{file_name}.png')
+    if show:
+        plt.show()
+
+
+def plot_memory_results(data: Dict[str, Dict[int, Dict[str, TMemoryResults]]], title: str, file_name: str,
+                        show: bool = False) -> None:
+    """
+    Generates a visualization for the memory benchmark (the peak extra memory per element of each algorithm
+    by the array size, one subplot per workload) and saves it as a PNG file in the output directory.
+
+    :param data: Benchmark results; See `save_memory_results_to_csv`
+    :param title: Title of the plot
+    :param file_name: Name of the output PNG file
+    :param show: Whether to show (open) the generated plot; Useful for debugging purposes.
+    :return: None; Side effect: PNG file with the generated plot
+    """
+
+    fig, axes = plt.subplots(1, len(data), figsize=(6 * len(data), 6), squeeze=False)
+    for ax, (workload, workload_data) in zip(axes[0], data.items()):
+        x = list(workload_data.keys())
+        for algorithm in next(iter(workload_data.values())):
+            ax.plot(x, [workload_data[arr_size][algorithm][0] / arr_size for arr_size in x], marker='o',
+                    label=algorithm)
+        ax.set_xscale('log')
+        ax.set_xlabel("Array size")
+        ax.set_ylabel("Peak extra memory [B/element]")
+        ax.set_title(workload)
+        ax.legend()
+    fig.suptitle(title)
+    fig.tight_layout()
+    plt.savefig(f'./output/graphs/{file_name}.png')
+    if show:
+        plt.show()
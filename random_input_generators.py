@@ -2,6 +2,9 @@ from typing import Tuple, List, Generator
 
 import numpy as np
 import random
+import string
+
+from algorithms.presortedness import profile_entropy, entropy_bounds
 
 
 def generate_random_list(n: int, bounds: Tuple[int, int], number_of_runs: int | None = None,
@@ -29,9 +32,9 @@ def generate_random_list(n: int, bounds: Tuple[int, int], number_of_runs: int |
             # it could happen that we don't find run with desired entropy => try different n_runs
             while not profiles:
                 n_runs = random.randint(2, n // 2)
-                min_entropy, max_entropy = _calc_entropy_bounds(n_runs, n)
+                min_entropy, max_entropy = entropy_bounds(n_runs, n)
                 for profile in _generate_profiles_with_increasing_entropy(n_runs, n):
-                    entropy = round(_calc_entropy(profile), 4)
+                    entropy = round(profile_entropy(profile), 4)
                     normalized_entropy = (entropy - min_entropy) / (max_entropy - min_entropy)
                     if entropy_range[0] <= normalized_entropy <= entropy_range[1]:
                         profiles.append(profile)
@@ -54,38 +57,46 @@ def generate_random_list(n: int, bounds: Tuple[int, int], number_of_runs: int |
     return np.random.randint(bounds[0], bounds[1], n).tolist()
 
 
-def _calc_entropy(run_profile: List[int]) -> float:
+def generate_few_unique_list(n: int, distinct: int, number_of_runs: int | None = None) -> List[int]:
     """
-    Calculates the entropy of the run profile.
+    Generates a random list with few unique values (e.g., status codes or dates), i.e., with many duplicates.
 
-    :param run_profile: Run profile
-    :return: Entropy of the run profile
+    :param n: Length of the list to generate
+    :param distinct: Number of distinct values (0..distinct-1) the list's elements are drawn from
+    :param number_of_runs: (optional) Number of (non-decreasing) sorted segments of the list; Random list if not given
+    :return: Randomly generated list with the given properties
     """
 
-    arr = np.array(run_profile) / sum(run_profile)
-    return -np.sum(arr * np.log2(arr))
+    if not number_of_runs:
+        return np.random.randint(0, distinct, n).tolist()
+    arr = []
+    for length in _generate_random_run_profile(number_of_runs, n):
+        arr.extend(sorted(np.random.randint(0, distinct, length).tolist()))
+    return arr
 
 
-def _calc_entropy_bounds(k: int, n: int) -> Tuple[float, float]:
+def generate_prefix_heavy_strings(n: int, prefix_length: int, number_of_runs: int | None = None) -> List[str]:
     """
-    Calculates minimal and maximal possible entropy for run profiles of the specified length and sum.
+    Generates a random list of strings with long shared prefixes, resembling URLs or keys of a key-value store:
+    each string consists of a common stem of the specified length, one of a few path segments and a random suffix,
+    e.g., '<stem>/qwer/kgjdnsut'.
 
-    :param k: Number of runs (length of the run profile)
-    :param n: Total number of input elements (sum of the run profile)
-    :return: Minimal and maximal possible entropy
+    :param n: Length of the list to generate
+    :param prefix_length: Length of the stem shared by all the strings
+    :param number_of_runs: (optional) Number of (non-decreasing) sorted segments of the list; Random list if not given
+    :return: Randomly generated list with the given properties
     """
 
-    # max entropy is log(k) by definition, where k is number of runs
-    max_entropy = np.log2(k)
-    # min entropy is when the profile is most skewed, like this [2,2,...,2,2,X] where X is the remainder
-    # note that min run size is 2
-    x = n - 2 * (k - 1)  # value of X (remainder)
-    n2 = 2 / n  # normalized value of 2
-    nx = x / n  # normalized value of X
-    e2 = -n2 * np.log2(n2)  # entropy "contribution" of a single 2
-    ex = -nx * np.log2(nx)  # entropy "contribution" of X
-    min_entropy = ex + e2*(k - 1)
-    return min_entropy, max_entropy
+    stem = ''.join(random.choices(string.ascii_lowercase, k=prefix_length))
+    segments = [''.join(random.choices(string.ascii_lowercase, k=4)) for _ in range(16)]
+    arr = [f"{stem}/{random.choice(segments)}/{''.join(random.choices(string.ascii_lowercase, k=8))}"
+           for _ in range(n)]
+    if number_of_runs:
+        start = 0
+        for length in _generate_random_run_profile(number_of_runs, n):
+            arr[start:start+length] = sorted(arr[start:start+length])
+            start += length
+    return arr
 
 
 def _generate_random_run_profile(k: int, n: int) -> List[int]: